@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import threading
+from ODS_COMMON.ods_sinks import ODS_Finding_Sink
+
+# Severities of the findings yielded by ODS_Validator.validate_file_async
+ERROR = "error"
+WARNING = "warning"
+
+# Put on the queue once the validation thread is done
+_DONE = object()
+
+
+class ODS_Validation_Cancelled(Exception):
+    """
+    Raised in the validation thread when the async validation of the file was cancelled, timed
+    out or its findings are no longer read.
+    """
+
+
+class ODS_Async_Sink(ODS_Finding_Sink):
+    """
+    Collects the findings of a validation running in another thread and hands them to the event
+    loop in one batch per sheet, as (severity, findings) on queue. Raises ODS_Validation_Cancelled
+    once cancelled is set, which stops the validation at the next finding.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, severity: str, cancelled: threading.Event):
+        super().__init__()
+        self.loop = loop
+        self.queue = queue
+        self.severity = severity
+        self.cancelled = cancelled
+        self._batch = []
+        self._sheet_name = None
+
+    def append(self, finding):
+        if self.cancelled.is_set():
+            raise ODS_Validation_Cancelled()
+        self.count += 1
+        sheet_name = finding['sheet_name']
+        if sheet_name != self._sheet_name:
+            self.flush()
+            self._sheet_name = sheet_name
+        self._batch.append(finding)
+
+    def flush(self):
+        if self._batch:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, (self.severity, self._batch))
+            self._batch = []
+
+    def close(self):
+        self.flush()
+
+
+def cancellable_rows(ods_file_rows, cancelled: threading.Event):
+    # The rows of ods_file_rows until cancelled is set, so a sheet without findings stops as well
+    for row in ods_file_rows:
+        if cancelled.is_set():
+            raise ODS_Validation_Cancelled()
+        yield row
+
+
+async def iter_findings_async(validator, ods_file, workers: int = 1, cache=None, limits=None, timeout: float = None, executor=None,
+                              limiter: asyncio.Semaphore = None, chunk_rows: int = None):
+    """
+    Run validator._validate_file in executor (the default executor of the loop if None) and yield
+    (severity, finding) as the findings of each sheet come in, see ODS_Validator.validate_file_async.
+    """
+    loop = asyncio.get_running_loop()
+    async with (limiter if limiter is not None else contextlib.nullcontext()):
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+        error_sink = ODS_Async_Sink(loop, queue, ERROR, cancelled)
+        warning_sink = ODS_Async_Sink(loop, queue, WARNING, cancelled)
+
+        def validate():
+            try:
+                validator._validate_file(ods_file, workers, cache, error_sink, warning_sink, limits, cancelled=cancelled, chunk_rows=chunk_rows)
+            finally:
+                error_sink.close()
+                warning_sink.close()
+                loop.call_soon_threadsafe(queue.put_nowait, (_DONE, None))
+
+        # The timeout counts from the start of the validation, not the wait for the limiter
+        deadline = None if timeout is None else loop.time() + timeout
+        future = loop.run_in_executor(executor, validate)
+        try:
+            while True:
+                if deadline is None:
+                    severity, findings = await queue.get()
+                else:
+                    try:
+                        severity, findings = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                    except asyncio.TimeoutError:
+                        raise asyncio.TimeoutError(f"ERROR: The validation of {ods_file.file_name} took longer than {timeout} seconds!") from None
+                if severity is _DONE:
+                    break
+                for finding in findings:
+                    yield severity, finding
+            # Raises what the validation raised
+            await future
+        finally:
+            # Cancelled, timed out or not read to the end: stop the thread before the limiter lets the next file in
+            cancelled.set()
+            if not future.done():
+                await asyncio.wait([future])
+            if not future.cancelled():
+                # Retrieved so it is not logged as never retrieved, ODS_Validation_Cancelled is expected here
+                future.exception()
+
+
+async def validate_files_async(validator, ods_files, max_concurrency: int = 4, timeout: float = None, **kwargs) -> list:
+    """
+    Validate ods_files concurrently, at most max_concurrency at a time, each with its own timeout.
+    The findings are added to ods_file.error_strings and ods_file.warning_strings like
+    ODS_Validator.validate_file does. Returns, per file, None or the exception its validation raised.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"ERROR: max_concurrency must be at least 1, but is {max_concurrency}!")
+    limiter = asyncio.Semaphore(max_concurrency)
+
+    async def validate(ods_file):
+        async for severity, finding in validator.validate_file_async(ods_file, timeout=timeout, limiter=limiter, **kwargs):
+            (ods_file.error_strings if severity == ERROR else ods_file.warning_strings).append(finding)
+
+    return await asyncio.gather(*(validate(ods_file) for ods_file in ods_files), return_exceptions=True)
@@ -0,0 +1,190 @@
+import hashlib
+import itertools
+import os
+import pickle
+import tempfile
+import typing
+from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
+
+# Bump when the checks change in a way the rules fingerprint can not see (e.g. ods_plan.py),
+# so the results stored by older versions are not used any more
+# 2: the findings are stored as ODS_Finding instead of dicts
+RESULT_CACHE_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+# Rows of a sheet held in memory until the sheet ends, so it is looked up in the cache before it
+# is validated. Longer sheets are spooled to a temporary file until then, see ODS_Row_Spool
+SHEET_HOLD_ROWS = 10000
+_ENTRY_SUFFIX = ".pickle"
+
+
+def file_content_hash(source) -> str:
+    # source is a path, the bytes of the file or a seekable file object, the same as ODS_File.content
+    content_hash = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        content_hash.update(source)
+    elif hasattr(source, 'getbuffer'):
+        with source.getbuffer() as buffer:
+            content_hash.update(buffer)
+    elif hasattr(source, 'read'):
+        position = source.tell()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+        source.seek(position)
+    else:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+def _validator_fingerprint(special_validator) -> str:
+    # The name and the byte code of the validator, so editing a validator invalidates the results
+    function = getattr(special_validator, '__func__', special_validator)
+    code = function.__code__
+    return f"{function.__qualname__}:{hashlib.sha256(code.co_code + repr(code.co_consts).encode('utf-8')).hexdigest()}"
+
+def rules_fingerprint(required_sheets: list, required_columns: dict, column_title_index: int) -> str:
+    """
+    A hash of the rule set of a validator: the sheets, the column titles, types and flags
+    and the special validators of every column.
+    """
+    rules = [RESULT_CACHE_VERSION, column_title_index, list(required_sheets)]
+    for sheet_name in sorted(required_columns):
+        for column_index, col_validator_data in sorted(required_columns[sheet_name].items()):
+            special_validator = col_validator_data.get(RCKeys.SPECIAL_VALIDATOR)
+            rules.append((sheet_name, column_index, col_validator_data[RCKeys.COLUMN_NAME], col_validator_data[RCKeys.REQUIRED],
+                          col_validator_data[RCKeys.DATA_TYPE].name, col_validator_data[RCKeys.WARN_IF_BLANK],
+                          _validator_fingerprint(special_validator) if special_validator is not None else None))
+    return hashlib.sha256(repr(rules).encode('utf-8')).hexdigest()
+
+
+class ODS_Sheet_Fingerprint():
+    """
+    A hash of the (row_index, row_data) of a sheet, added to while the rows stream past, so the
+    rows do not have to be kept for it. repr keeps the types apart, e.g. 1, 1.0 and '1'.
+
+        fingerprint = ODS_Sheet_Fingerprint()
+        validate(fingerprint.hashed(sheet_rows))
+        cache.sheet_key(sheet_name, fingerprint.hexdigest(), ...)
+    """
+    def __init__(self):
+        self._hash = hashlib.sha256()
+
+    def hashed(self, sheet_rows):
+        # Yields the rows of sheet_rows, each one added to the hash when it is taken
+        update = self._hash.update
+        for row in sheet_rows:
+            update(repr(row).encode('utf-8'))
+            update(b'\n')
+            yield row
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class ODS_Row_Spool():
+    """
+    The rows of a sheet too long to be held in memory, pickled to a temporary file in blocks of
+    block_rows while they are read. So the sheet can be looked up in the cache once it ended, and
+    the rows read back to be validated only if it was not there:
+
+        spool = ODS_Row_Spool(fingerprint.hashed(sheet_rows))
+        ... cache.get(...), then spool.close() or validate(spool.rows())
+    """
+    def __init__(self, sheet_rows, block_rows: int = SHEET_HOLD_ROWS):
+        self._file = tempfile.TemporaryFile()
+        try:
+            for block in iter(lambda: list(itertools.islice(sheet_rows, block_rows)), []):
+                pickle.dump(block, self._file, pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            self.close()
+            raise
+
+    def rows(self):
+        # Yields the rows once, the file is closed when they were all read (or the generator is closed)
+        try:
+            self._file.seek(0)
+            while True:
+                try:
+                    block = pickle.load(self._file)
+                except EOFError:
+                    break
+                yield from block
+        finally:
+            self.close()
+
+    def close(self):
+        self._file.close()
+
+
+class ODS_Result_Cache():
+    """
+    On disk store of the (error_strings, warning_strings) of validated files, keyed by the hash of
+    the file content and the rules fingerprint of the validator, and of the single sheets, keyed by
+    the hash of their rows. Once the entries take more than max_bytes the least recently used ones
+    are removed.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, source, fingerprint: str) -> str:
+        # source is anything file_content_hash takes
+        return hashlib.sha256(f"{file_content_hash(source)}:{fingerprint}".encode('utf-8')).hexdigest()
+
+    def sheet_key(self, sheet_name: str, fingerprint_of_rows: str, fingerprint: str) -> str:
+        # The results of a single sheet, so an unchanged sheet of an edited file is not validated again
+        return hashlib.sha256(f"sheet:{sheet_name}:{fingerprint_of_rows}:{fingerprint}".encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{_ENTRY_SUFFIX}")
+
+    def get(self, key: str) -> typing.Optional[typing.Tuple[list, list]]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                error_strings, warning_strings = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"WARNING: Ignoring the unreadable cache entry {entry_path}. {e}")
+            return None
+        # The modification time is the last use for the eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return error_strings, warning_strings
+
+    def put(self, key: str, error_strings: list, warning_strings: list):
+        # Write to a temporary file first, so other processes never read a partial entry
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                pickle.dump((error_strings, warning_strings), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(_ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
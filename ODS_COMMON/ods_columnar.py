@@ -0,0 +1,251 @@
+import itertools
+import operator
+import typing
+from datetime import datetime
+from ODS_COMMON.ods_constants import ODS_Char_Data_Types, ODS_Check_Result, ODS_Data_Types, ODS_Float_Data_Types, ODS_Integer_Data_Types
+from ODS_COMMON.ods_plan import ODS_Sheet_Plan, WARNING_RESULTS, compile_type_checker
+from ODS_COMMON.ods_finding import ODS_Finding
+
+# numpy is only needed for this engine, so it is not a requirement of the package.
+# It is imported when the engine is created, see _import_numpy
+np = None
+
+# Rows per call of validate_rows, so a sheet is never held in memory as a whole and its
+# validation can stop at an error limit
+BLOCK_ROWS = 1024
+
+# Code of the cells the vectorised checks leave to the scalar type checker (e.g. strings in a date column)
+_NEEDS_SCALAR = -1
+
+_TYPE_STR = 1
+_TYPE_INT = 2
+_TYPE_FLOAT = 3
+_TYPE_BOOL = 4
+_TYPE_DATETIME = 5
+_TYPE_OTHER = 0
+_TYPE_IDS = {str: _TYPE_STR, int: _TYPE_INT, float: _TYPE_FLOAT, bool: _TYPE_BOOL, datetime: _TYPE_DATETIME}
+
+_SORT_KEY = operator.itemgetter(0)
+
+# For the digits of the integer part of a cell, set with numpy in _import_numpy
+_POWERS_OF_TEN = None
+# str() of a float is positional from 1e-4 on, the margin keeps the values near the limit out
+_MIN_POSITIONAL = 1e-3
+# Below this every value scaled by 10**digits is rounded to the closest integer exactly
+_MAX_EXACT_INTEGER = 2.0 ** 52
+
+
+def _import_numpy():
+    global np, _POWERS_OF_TEN
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The columnar engine needs numpy, install it with \"pip install numpy\"")
+        _POWERS_OF_TEN = numpy.array([10 ** exponent for exponent in range(19)], dtype=numpy.int64)
+        np = numpy
+
+
+class ODS_Columnar_Engine():
+    """
+    Validates the data rows of a sheet column by column. The type, length and decimal precision
+    checks of the columns without a special validator are done with numpy on the whole column,
+    only the flagged cells are passed to the scalar message builders. The findings are the same,
+    and in the same order, as validating row by row with ODS_Validator._validate_row.
+    """
+    def __init__(self, column_title_index: int):
+        _import_numpy()
+        self.column_title_index = column_title_index
+
+    def validate_rows(self, plan: ODS_Sheet_Plan, data_rows: list, validate_row: typing.Callable, error_msg_list: list, warn_msg_list: list):
+        """
+        data_rows is a list of (row_index, row_data), counting from the first row after the column titles.
+        validate_row(plan, row_index, row_data, error_msg_list, warn_msg_list) is the scalar fallback,
+        used for rows where a special validator raised.
+        """
+        sheet_name = plan.sheet_name
+        # (sort key, finding) pairs, sorted at the end into the row by row order
+        errors = []
+        warnings = []
+
+        full_rows = []
+        full_row_indexes = []
+        for row_index, row_data in data_rows:
+            if len(row_data) == 0:
+                continue
+            if len(row_data) != plan.column_count:
+                # Check to see if an extra column was added or one was removed
+                errors.append(((row_index, -1), ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"Row {row_index+self.column_title_index+2} has {len(row_data)} columns, but should only have {plan.column_count}!")))
+                continue
+            full_rows.append(row_data)
+            full_row_indexes.append(row_index)
+
+        if len(full_rows) > 0:
+            scalar_rows = self._validate_special_columns(plan, full_rows, full_row_indexes, errors, warnings)
+            columns = list(zip(*full_rows))
+            for column_index, type_rule in enumerate(plan.type_rules):
+                if type_rule is None:
+                    continue
+                self._validate_type_column(plan, column_index, type_rule, columns[column_index], full_row_indexes, scalar_rows, errors, warnings)
+
+            # Rows where a special validator raised are validated again one cell at a time
+            for position in sorted(scalar_rows):
+                row_index = full_row_indexes[position]
+                row_errors = []
+                row_warnings = []
+                validate_row(plan, row_index, full_rows[position], row_errors, row_warnings)
+                errors += [((row_index, order), finding) for order, finding in enumerate(row_errors)]
+                warnings += [((row_index, order), finding) for order, finding in enumerate(row_warnings)]
+
+        errors.sort(key=_SORT_KEY)
+        warnings.sort(key=_SORT_KEY)
+        error_msg_list.extend(finding for _, finding in errors)
+        warn_msg_list.extend(finding for _, finding in warnings)
+
+    def _finding(self, plan, row_index, column_index, message) -> ODS_Finding:
+        return ODS_Finding.of_message(plan.sheet_name, column_index+1, row_index+self.column_title_index+2, plan.column_labels[column_index], message)
+
+    def _validate_special_columns(self, plan, full_rows, full_row_indexes, errors, warnings) -> set:
+        # The special validators look across the row, so they still run one cell at a time
+        special_checkers = [(column_index, plan.checkers[column_index]) for column_index, type_rule in enumerate(plan.type_rules) if type_rule is None]
+        if not special_checkers:
+            return set()
+        row_context_of = plan.row_context
+        scalar_rows = set()
+        for position, row_data in enumerate(full_rows):
+            try:
+                row_context = row_context_of(row_data)
+                row_findings = [(column_index, checker(column_index, row_data[column_index], row_data, row_context)) for column_index, checker in special_checkers]
+            except Exception:
+                scalar_rows.add(position)
+                continue
+            row_index = full_row_indexes[position]
+            for column_index, (err_str, warn_str) in row_findings:
+                if err_str:
+                    errors.append(((row_index, column_index), self._finding(plan, row_index, column_index, err_str)))
+                if warn_str:
+                    warnings.append(((row_index, column_index), self._finding(plan, row_index, column_index, warn_str)))
+        return scalar_rows
+
+    def _validate_type_column(self, plan, column_index, type_rule, column_values, full_row_indexes, scalar_rows, errors, warnings):
+        expected_type, warn_if_empty, required = type_rule
+        values = np.empty(len(column_values), dtype=object)
+        values[:] = column_values
+        codes = column_result_codes(values, expected_type, warn_if_empty, required)
+
+        type_checker = compile_type_checker(expected_type, warn_if_empty, required)
+        for position in np.flatnonzero(codes).tolist():
+            if position in scalar_rows:
+                continue
+            value = values[position]
+            code = codes[position]
+            row_index = full_row_indexes[position]
+            if code != _NEEDS_SCALAR:
+                # The message is formatted when the finding is written
+                result = ODS_Check_Result(code)
+                finding = ODS_Finding(plan.sheet_name, column_index+1, row_index+self.column_title_index+2, plan.column_labels[column_index], value, result, expected_type)
+                (warnings if result in WARNING_RESULTS else errors).append(((row_index, column_index), finding))
+                continue
+            err_str, warn_str = type_checker(value)
+            if err_str:
+                errors.append(((row_index, column_index), self._finding(plan, row_index, column_index, err_str)))
+            if warn_str:
+                warnings.append(((row_index, column_index), self._finding(plan, row_index, column_index, warn_str)))
+
+
+def column_result_codes(values, expected_type: ODS_Data_Types, warn_if_empty: bool, required: bool):
+    """
+    The ODS_Check_Result of every cell of a column (an object array), or _NEEDS_SCALAR for the
+    cells that have to go through the scalar type checker. Only the type of every cell is looked
+    up one by one, the checks are done on arrays of the cells of the expected type.
+    """
+    _import_numpy()
+    if expected_type != ODS_Data_Types.DATE_TYPE and expected_type not in ODS_Integer_Data_Types \
+            and expected_type not in ODS_Float_Data_Types and expected_type not in ODS_Char_Data_Types:
+        # Types without a rule are always accepted
+        return np.zeros(len(values), dtype=np.int8)
+
+    type_ids = np.fromiter(map(_TYPE_IDS.get, map(type, values), itertools.repeat(_TYPE_OTHER)), dtype=np.int8, count=len(values))
+    is_str = type_ids == _TYPE_STR
+    # Only a str can be empty (len(str(cell)) == 0), the cells of other types are left to the scalar checker
+    empty = np.zeros(len(values), dtype=bool)
+    empty[is_str] = values[is_str] == ''
+    if warn_if_empty and not required:
+        empty_code = ODS_Check_Result.DATA_EMPTY_WARNING
+    elif required:
+        empty_code = ODS_Check_Result.DATA_EMPTY_ERROR
+    else:
+        empty_code = ODS_Check_Result.OK
+    codes = np.full(len(values), _NEEDS_SCALAR, dtype=np.int8)
+
+    if expected_type == ODS_Data_Types.DATE_TYPE:
+        # Strings are parsed by the scalar checker for a date in the wrong format
+        codes[(type_ids != _TYPE_STR) & (type_ids != _TYPE_OTHER)] = ODS_Check_Result.WRONG_TYPE
+        codes[type_ids == _TYPE_DATETIME] = ODS_Check_Result.OK
+    elif expected_type == ODS_Data_Types.NUMBER_TYPE:
+        # Anything int() accepts is fine, only ints can be decided without calling it
+        codes[(type_ids == _TYPE_INT) | (type_ids == _TYPE_BOOL)] = ODS_Check_Result.OK
+    elif expected_type in ODS_Integer_Data_Types:
+        is_int = type_ids == _TYPE_INT
+        codes[(type_ids != _TYPE_INT) & (type_ids != _TYPE_OTHER)] = ODS_Check_Result.WRONG_TYPE
+        lengths = _integer_lengths(values[is_int])
+        codes[is_int] = np.where(lengths > ODS_Integer_Data_Types[expected_type], ODS_Check_Result.DATA_TOO_LONG, ODS_Check_Result.OK)
+    elif expected_type in ODS_Float_Data_Types:
+        is_float = type_ids == _TYPE_FLOAT
+        codes[(type_ids != _TYPE_FLOAT) & (type_ids != _TYPE_OTHER)] = ODS_Check_Result.WRONG_TYPE
+        codes[type_ids == _TYPE_INT] = ODS_Check_Result.POSSIBLE_ISSUE
+        float_limits = ODS_Float_Data_Types[expected_type]
+        codes[is_float] = _float_result_codes(values[is_float].astype(np.float64), float_limits["total"], float_limits["before"], float_limits["after"])
+    else:
+        codes[(type_ids != _TYPE_STR) & (type_ids != _TYPE_OTHER)] = ODS_Check_Result.WRONG_TYPE
+        lengths = np.fromiter(map(len, values[is_str]), dtype=np.int64, count=int(is_str.sum()))
+        codes[is_str] = np.where(lengths > ODS_Char_Data_Types[expected_type], ODS_Check_Result.DATA_TOO_LONG, ODS_Check_Result.OK)
+    codes[empty] = empty_code
+    return codes
+
+def _integer_lengths(values):
+    # len(str(value)) of the ints in the object array values
+    try:
+        integers = values.astype(np.int64)
+    except OverflowError:
+        integers = None
+    if integers is None or (len(integers) > 0 and integers.min() == np.iinfo(np.int64).min):
+        # Past the int64 range, or -2**63 that has no positive int64
+        return np.fromiter(map(len, map(str, values)), dtype=np.int64, count=len(values))
+    # The number of digits, 0 has one as well, and the minus sign
+    return np.maximum(np.searchsorted(_POWERS_OF_TEN, np.abs(integers), side='right'), 1) + (integers < 0)
+
+def _float_result_codes(floats, total: int, max_before: int, max_after: int):
+    """
+    The result of ods_plan._check_float for the floats, without their text. str(value) of a float
+    is the shortest decimal that reads back as the same float, in positional notation for the
+    values checked here. So its digits after the decimal are the fewest k for which round(value,
+    k) gives value back, and the digits before are those of the integer part of value. The values
+    this can not be told exactly for (exponent notation, inf, nan, too large to round exactly)
+    are left to the scalar checker.
+    """
+    magnitudes = np.abs(floats)
+    scale = 10.0 ** max_after
+    with np.errstate(invalid='ignore', over='ignore'):
+        exact = (floats == 0) | ((magnitudes >= _MIN_POSITIONAL) & (magnitudes * scale < _MAX_EXACT_INTEGER))
+    exact_floats = np.where(exact, floats, 0.0)
+    before = np.maximum(np.searchsorted(_POWERS_OF_TEN, np.floor(np.abs(exact_floats)).astype(np.int64), side='right'), 1) + np.signbit(exact_floats)
+    # The digits after the decimal up to max_after, max_after + 1 stands for more. At least one, e.g. "1.0"
+    after = np.full(len(floats), max_after + 1, dtype=np.int64)
+    for digits in range(max_after, 0, -1):
+        digits_scale = 10.0 ** digits
+        scaled = np.rint(exact_floats * digits_scale)
+        # The closest decimal with this many digits is one of these, and the division is rounded like float("...") is
+        rounds_back = ((scaled - 1) / digits_scale == exact_floats) | (scaled / digits_scale == exact_floats) | ((scaled + 1) / digits_scale == exact_floats)
+        after[rounds_back] = digits
+
+    codes = np.full(len(floats), ODS_Check_Result.OK, dtype=np.int8)
+    codes[after > max_after] = ODS_Check_Result.AFTER_DECIMAL_TOO_LONG
+    codes[before > max_before] = ODS_Check_Result.BEFORE_DECIMAL_TOO_LONG
+    # The total is max_before + 1 + max_after
+    # With more than max_after digits after the decimal the length is at least this
+    lengths = before + 1 + after
+    codes[lengths > total] = ODS_Check_Result.DATA_TOO_LONG
+    # Unless that is already too long, the result depends on how many more digits there are
+    codes[~exact | ((after > max_after) & (lengths <= total))] = _NEEDS_SCALAR
+    return codes
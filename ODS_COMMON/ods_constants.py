@@ -1,10 +1,16 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 class FILE_STATUS(Enum):
     FILE_STATUS_UNKNOWN = 0
     FILE_STATUS_OK = 1
     FILE_STATUS_ERROR = 3
 
+class ODS_Engine(Enum):
+    # Row by row validation of every cell
+    SCALAR = "scalar"
+    # Column wise validation of the type checks with numpy, see ods_columnar.py
+    COLUMNAR = "columnar"
+
 class ODS_Data_Types(Enum):
     def __repr__(self):
         return self.name
@@ -35,6 +41,18 @@ class ODS_Data_Types(Enum):
     CHAR120_TYPE = 17
 
 
+class ODS_Check_Result(IntEnum):
+    OK = 0
+    WRONG_TYPE = 1
+    DATA_TOO_LONG = 2
+    BEFORE_DECIMAL_TOO_LONG = 3
+    AFTER_DECIMAL_TOO_LONG = 4
+    DATA_EMPTY_WARNING = 5
+    DATA_EMPTY_ERROR = 6
+    POSSIBLE_ISSUE = 7
+    WRONG_DATE_FORMAT = 8
+
+
 class ODS_Reequired_Columns_Keys(Enum):
     COLUMN_NAME = "column_name"
     REQUIRED = "required"
@@ -96,6 +114,9 @@ ODS_Column_Label_Lookup = [
     "Z", #25
 ]
 
+# Columns of a sheet, A to XFD
+ODS_MAX_COLUMNS = 16384
+
 class BeforeDecimalTooLong(Exception):
     pass
 
@@ -1,10 +1,19 @@
 from ODS_COMMON.ods_constants import FILE_STATUS
-import pyexcel_ods3 as ods_lib
+from ODS_COMMON.ods_reader import iter_ods_rows
 import os
 
 class ODS_File():
-    def __init__(self, file_name):
+    def __init__(self, file_name, content=None, sheet_names=None, max_empty_rows: int = None):
+        # content is the file itself, as bytes or a file object (e.g. an upload), else it is read from file_name.
+        # A file object has to be seekable if the results are cached.
+        # Only the rows of the sheets in sheet_names are read and a sheet is read up to max_empty_rows
+        # consecutive empty rows, see ODS_Content_Handler. By default the validator reads the sheets it needs
         self.file_name = file_name
+        self.content = content
+        self.sheet_names = None if sheet_names is None else list(sheet_names)
+        if max_empty_rows is not None and max_empty_rows < 1:
+            raise ValueError(f"ERROR: max_empty_rows must be at least 1, but is {max_empty_rows}!")
+        self.max_empty_rows = max_empty_rows
         self.file_status = FILE_STATUS.FILE_STATUS_UNKNOWN
         self.error_strings = []
         self.warning_strings = []
@@ -14,5 +23,28 @@ class ODS_File():
         if file_ext.lower() != ".ods":
             raise OSError(f"ERROR: Wrong file type ({file_ext}), needs to be *.ods")
 
+    @property
+    def source(self):
+        # What the file is read from, see ODS_Archive
+        return self.content if self.content is not None else self.file_name
+
     def get_data(self):
-        return ods_lib.get_data(self.file_name)
\ No newline at end of file
+        # pyexcel_ods3 (and its plugin machinery) is slow to import and only needed here
+        import pyexcel_ods3 as ods_lib
+        if self.content is None:
+            return ods_lib.get_data(self.file_name)
+        import io
+        stream = io.BytesIO(self.content) if isinstance(self.content, (bytes, bytearray, memoryview)) else self.content
+        return ods_lib.get_data(stream, file_type="ods")
+
+    @property
+    def read_options(self) -> str:
+        # What limits the rows that are read, part of the cache keys. Empty when everything is read
+        if self.sheet_names is None and self.max_empty_rows is None:
+            return ""
+        return f"sheet_names={self.sheet_names}, max_empty_rows={self.max_empty_rows}"
+
+    def iter_rows(self, sheet_names=None, data_start_row: int = 0):
+        # Streams (sheet_name, row_index, row_values) instead of loading every sheet like get_data().
+        # sheet_names is used if the file was not given its own, the empty rows of max_empty_rows count from data_start_row
+        return iter_ods_rows(self.source, self.sheet_names if self.sheet_names is not None else sheet_names, self.max_empty_rows, data_start_row)
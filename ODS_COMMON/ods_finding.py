@@ -0,0 +1,85 @@
+from ODS_COMMON.ods_constants import ODS_Check_Result, ODS_Data_Types
+from ODS_COMMON.ods_plan import ODS_Check_Message, format_check_result
+
+LOG_FIELDNAMES = ['sheet_name', 'entry', 'row', 'column', 'message']
+_FIELD_KEYS = dict.fromkeys(LOG_FIELDNAMES).keys()
+_ATTRIBUTE_FIELDS = frozenset(LOG_FIELDNAMES) - {'message'}
+
+
+class ODS_Finding():
+    """
+    One error or warning of a validation. It reads like the dict with the LOG_FIELDNAMES keys it
+    replaces (finding['message'], get, keys, dict(finding)), so the sinks and csv.DictWriter take
+    either. The sheet names and column labels are the shared strings of the ODS_Sheet_Plan.
+    The message of a failed type check is kept as its template, the ODS_Check_Result, and the
+    arguments (value, data_type), and only formatted when it is read. Other messages are given
+    as the text in value, with template None.
+    """
+    __slots__ = ('sheet_name', 'entry', 'row', 'column', 'value', 'template', 'data_type')
+
+    def __init__(self, sheet_name: str, entry, row, column, value, template: ODS_Check_Result = None, data_type: ODS_Data_Types = None):
+        self.sheet_name = sheet_name
+        self.entry = entry
+        self.row = row
+        self.column = column
+        self.value = value
+        self.template = template
+        self.data_type = data_type
+
+    @classmethod
+    def of_message(cls, sheet_name: str, entry, row, column, message: str):
+        # The message of a special validator, with its template if it is the message of a type check
+        if type(message) is ODS_Check_Message:
+            return cls(sheet_name, entry, row, column, message.value, message.template, message.data_type)
+        return cls(sheet_name, entry, row, column, message)
+
+    @property
+    def message(self) -> str:
+        if self.template is None:
+            return self.value
+        err_str, warn_str = format_check_result(self.template, self.value, self.data_type)
+        return err_str or warn_str
+
+    def moved_to(self, entry, column):
+        # The same message for another cell of the row
+        return ODS_Finding(self.sheet_name, entry, self.row, column, self.value, self.template, self.data_type)
+
+    def values(self) -> tuple:
+        # In the order of LOG_FIELDNAMES, e.g. for a csv row
+        return (self.sheet_name, self.entry, self.row, self.column, self.message)
+
+    def __getitem__(self, key: str):
+        if key == 'message':
+            return self.message
+        if key in _ATTRIBUTE_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return _FIELD_KEYS
+
+    def __iter__(self):
+        return iter(_FIELD_KEYS)
+
+    def __len__(self):
+        return len(_FIELD_KEYS)
+
+    def __eq__(self, other):
+        if isinstance(other, (ODS_Finding, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Pickled for the result cache and the worker processes, without the slot names
+        return (ODS_Finding, (self.sheet_name, self.entry, self.row, self.column, self.value, self.template, self.data_type))
+
+    def __repr__(self):
+        return f"ODS_Finding({dict(self)!r})"
@@ -0,0 +1,157 @@
+import itertools
+import time
+import typing
+from ODS_COMMON.ods_file import ODS_File
+
+# The validator of a worker process, built once by _init_worker
+_worker_validator = None
+
+# Rows of the first chunk of a sheet sent to a worker, the chunks after it double up to CHUNK_ROWS.
+# The chunks are sent while the sheet is read, before its rows are known, so small first chunks
+# keep the workers busy early and split sheets of a few thousand rows as well
+FIRST_CHUNK_ROWS = 500
+# Small chunks cost more to send than they take to validate
+CHUNK_ROWS = 5000
+# Chunks per worker that are sent but not done yet, before the reading waits for the workers
+PENDING_CHUNKS_PER_WORKER = 2
+# How often a wait for the workers looks whether the validation was cancelled, see ods_async.py
+CANCEL_POLL_SECONDS = 0.1
+
+def _init_worker(validator_class, validator_args, warm_up=False):
+    global _worker_validator
+    _worker_validator = validator_class(*validator_args)
+    if warm_up:
+        _worker_validator.warm_up()
+
+def create_validator_pool(workers: int, validator_class, *validator_args, warm_up: bool = False):
+    """
+    Create a ProcessPoolExecutor where every worker holds its own validator_class(*validator_args),
+    so only the sheet rows or the file name have to be sent for each task.
+    With warm_up every worker builds the rules and the sheet plans of its validator when it
+    starts (see ODS_Validator.warm_up), instead of on its first file.
+    """
+    # multiprocessing is slow to import, so only when a pool is used
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(validator_class, validator_args, warm_up))
+
+def validate_sheet_in_worker(sheet_name: str, sheet_rows: list, limits=None) -> typing.Tuple[list, list]:
+    # sheet_rows is a list of (row_index, row_data) for the sheet
+    return _worker_validator._validate_sheet_columns(sheet_name, sheet_rows, limits=limits)
+
+def validate_rows_in_worker(sheet_name: str, sheet_rows: list) -> typing.Tuple[list, list]:
+    # sheet_rows is a list of (row_index, row_data) after the column titles of the sheet
+    return _worker_validator._validate_rows(sheet_name, sheet_rows)
+
+
+def wait_for_futures(futures, return_when: str, cancelled=None) -> tuple:
+    """
+    concurrent.futures.wait for futures, but raises ods_async.ODS_Validation_Cancelled once the
+    threading.Event cancelled is set.
+    """
+    from concurrent.futures import ALL_COMPLETED, wait
+    if cancelled is None:
+        return wait(futures, return_when=return_when)
+    while not cancelled.is_set():
+        done, not_done = wait(futures, timeout=CANCEL_POLL_SECONDS, return_when=return_when)
+        if not not_done or (done and return_when != ALL_COMPLETED):
+            return done, not_done
+    from ODS_COMMON.ods_async import ODS_Validation_Cancelled
+    raise ODS_Validation_Cancelled()
+
+
+class ODS_Bounded_Submitter():
+    """
+    Submits to executor like executor.submit, but waits while max_pending of the tasks submitted
+    through it are not done. So the rows of a large file wait in the file until a worker is free
+    for them, instead of all of them waiting in the queue of the pool. The wait stops once the
+    threading.Event cancelled is set.
+    """
+    def __init__(self, executor, max_pending: int, cancelled=None):
+        self.executor = executor
+        self.max_pending = max(max_pending, 1)
+        self.cancelled = cancelled
+        self._pending = set()
+
+    def submit(self, function, *args):
+        if len(self._pending) >= self.max_pending:
+            from concurrent.futures import FIRST_COMPLETED
+            _, self._pending = wait_for_futures(self._pending, FIRST_COMPLETED, self.cancelled)
+        future = self.executor.submit(function, *args)
+        self._pending.add(future)
+        return future
+
+
+def chunk_sizes(chunk_rows: int = None):
+    # The rows of the chunks of a sheet one after the other: chunk_rows each, or if None from FIRST_CHUNK_ROWS doubling up to CHUNK_ROWS
+    if chunk_rows is not None:
+        return itertools.repeat(chunk_rows)
+    growing_sizes = itertools.takewhile(lambda size: size < CHUNK_ROWS, (FIRST_CHUNK_ROWS << doubling for doubling in itertools.count()))
+    return itertools.chain(growing_sizes, itertools.repeat(CHUNK_ROWS))
+
+
+class ODS_Chunked_Result():
+    """
+    The futures of the chunks of a sheet, used like the future of the whole sheet.
+    """
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, executor, sheet_name: str, sheet_rows: list, with_titles: bool, limits=None):
+        # Send the chunk sheet_rows, a list of (row_index, row_data). The first chunk of a sheet goes with_titles
+        if with_titles:
+            self.futures.append(executor.submit(validate_sheet_in_worker, sheet_name, sheet_rows, limits))
+        else:
+            self.futures.append(executor.submit(validate_rows_in_worker, sheet_name, sheet_rows))
+
+    def result(self, cancelled=None) -> typing.Tuple[list, list]:
+        # The findings of the chunks one after the other, so in the order of the rows. Stops once the threading.Event cancelled is set
+        error_list = []
+        warn_list = []
+        for future in self.futures:
+            if cancelled is not None:
+                from concurrent.futures import ALL_COMPLETED
+                wait_for_futures([future], ALL_COMPLETED, cancelled)
+            chunk_errors, chunk_warnings = future.result()
+            error_list.extend(chunk_errors)
+            warn_list.extend(chunk_warnings)
+        return error_list, warn_list
+
+    def cancel(self):
+        for future in self.futures:
+            future.cancel()
+
+
+def submit_sheet(executor, sheet_name: str, sheet_rows, limits=None, chunk_rows: int = None) -> ODS_Chunked_Result:
+    """
+    Validate the sheet on executor (from create_validator_pool, or an ODS_Bounded_Submitter of it).
+    sheet_rows yields (row_index, row_data) from the column titles on. Each chunk of chunk_rows rows
+    (if None growing from FIRST_CHUNK_ROWS to CHUNK_ROWS, see chunk_sizes) is sent as soon as it was
+    read: the first one with the column titles like a whole sheet, the others only row by row. Sheets with limits, or all of them with chunk_rows 0,
+    are sent as a whole, a sheet with limits stops at the first row past its limit.
+    """
+    sheet_rows = iter(sheet_rows)
+    result = ODS_Chunked_Result()
+    try:
+        if limits is not None or (chunk_rows is not None and chunk_rows <= 0):
+            result.submit(executor, sheet_name, list(sheet_rows), True, limits)
+            return result
+        # The first chunk is sent even if it is empty, the worker reports the missing column titles
+        sizes = chunk_sizes(chunk_rows)
+        chunk = list(itertools.islice(sheet_rows, next(sizes)))
+        with_titles = True
+        while with_titles or chunk:
+            result.submit(executor, sheet_name, chunk, with_titles)
+            with_titles = False
+            chunk = list(itertools.islice(sheet_rows, next(sizes)))
+    except BaseException:
+        result.cancel()
+        raise
+    return result
+
+def validate_file_in_worker(file_name: str, cache=None, limits=None, content: bytes = None) -> typing.Tuple[list, list, float]:
+    # Returns the error strings, the warning strings and the time taken in seconds.
+    # content is the file itself, else it is read from file_name
+    start_time = time.perf_counter()
+    ods_file = ODS_File(file_name, content)
+    _worker_validator.validate_file(ods_file, cache=cache, limits=limits)
+    return ods_file.error_strings, ods_file.warning_strings, time.perf_counter() - start_time
@@ -0,0 +1,384 @@
+from datetime import datetime
+import calendar
+import functools
+import itertools
+import re
+import sys
+import typing
+from ODS_COMMON.ods_constants import ODS_Char_Data_Types, ODS_Check_Result, ODS_Data_Types, ODS_Column_Label_Lookup, ODS_Float_Data_Types, ODS_Integer_Data_Types, ODS_MAX_COLUMNS
+from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
+
+ALT_DATE_FORMATS = [
+    "%d/%m/%Y",
+    "%d/%m/%y",
+    r"%d\%m\%Y",
+    r"%d\%m\%y",
+    "%d-%m-%y",
+    "%d-%m-%Y",
+    "%m-%d-%y",
+    "%m-%d-%Y",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    r"%m\%d\%Y",
+    r"%m\%d\%y",
+]
+
+# =========================================================================
+# Type checks, the limits of the type are passed in so they are only looked up once.
+# The checks return an ODS_Check_Result code, the messages are only built for failed checks.
+# =========================================================================
+_OK = ODS_Check_Result.OK
+_WRONG_TYPE = ODS_Check_Result.WRONG_TYPE
+_DATA_TOO_LONG = ODS_Check_Result.DATA_TOO_LONG
+_BEFORE_DECIMAL_TOO_LONG = ODS_Check_Result.BEFORE_DECIMAL_TOO_LONG
+_AFTER_DECIMAL_TOO_LONG = ODS_Check_Result.AFTER_DECIMAL_TOO_LONG
+_DATA_EMPTY_WARNING = ODS_Check_Result.DATA_EMPTY_WARNING
+_DATA_EMPTY_ERROR = ODS_Check_Result.DATA_EMPTY_ERROR
+_POSSIBLE_ISSUE = ODS_Check_Result.POSSIBLE_ISSUE
+_WRONG_DATE_FORMAT = ODS_Check_Result.WRONG_DATE_FORMAT
+
+_NO_MESSAGES = ('', '')
+# The results format_check_result reports as a warning, the others as an error
+WARNING_RESULTS = frozenset((_DATA_EMPTY_WARNING, _POSSIBLE_ISSUE))
+
+def _check_empty(warn_if_empty, required):
+    if warn_if_empty and not required:
+        return _DATA_EMPTY_WARNING
+    elif required:
+        return _DATA_EMPTY_ERROR
+    return _OK
+
+def _check_date(input_data, warn_if_empty, required, _):
+    # First check if it is empty
+    if len(str(input_data)) == 0:
+        return _check_empty(warn_if_empty, required)
+    if type(input_data) == datetime:
+        return _OK
+    if type(input_data) != str:
+        # Only strings can be parsed for a date in the wrong format
+        return _WRONG_TYPE
+    return _classify_date_string(input_data)
+
+# One pass replacement for trying datetime.strptime with every format in ALT_DATE_FORMATS.
+# All of them are day and month (in either order) and a 4 or 2 digit year, split by the same
+# separator, using the same sub patterns as strptime for %d, %m, %Y and %y.
+_ALT_DATE_REGEX = re.compile(r"(\d{1,2}| \d)([/\\-])(\d{1,2}| \d)\2(\d{4}|\d{2})")
+_DAY_REGEX = re.compile(r"3[01]|[12]\d|0[1-9]|[1-9]| [1-9]")
+_MONTH_REGEX = re.compile(r"1[0-2]|0[1-9]|[1-9]")
+
+def _is_valid_date(day_text, month_text, year) -> bool:
+    if _DAY_REGEX.fullmatch(day_text) is None or _MONTH_REGEX.fullmatch(month_text) is None:
+        return False
+    day = int(day_text)
+    month = int(month_text)
+    return 1 <= year and day <= calendar.monthrange(year, month)[1]
+
+@functools.lru_cache(maxsize=4096)
+def _classify_date_string(input_data: str) -> ODS_Check_Result:
+    # Wrong-format dates usually fill whole columns, so the same strings come back again and again
+    match = _ALT_DATE_REGEX.fullmatch(input_data)
+    if match is None:
+        return _WRONG_TYPE
+    first, _, second, year_text = match.groups()
+    year = int(year_text)
+    if len(year_text) == 2:
+        year += 2000 if year <= 68 else 1900
+    if _is_valid_date(first, second, year) or _is_valid_date(second, first, year):
+        return _WRONG_DATE_FORMAT
+    return _WRONG_TYPE
+
+def _check_number(input_data, warn_if_empty, required, _):
+    # First check if it is empty
+    if len(str(input_data)) == 0:
+        return _check_empty(warn_if_empty, required)
+    # The number data type may be input as a string, so as long as it converts to an int, it is good
+    if type(input_data) == int:
+        return _OK
+    try:
+        _ = int(input_data)
+    except (ValueError, TypeError):
+        return _WRONG_TYPE
+    return _OK
+
+def _check_integer(input_data, warn_if_empty, required, max_length):
+    # First check if it is empty
+    if len(str(input_data)) == 0:
+        return _check_empty(warn_if_empty, required)
+    if type(input_data) != int:
+        # Invalid parse
+        return _WRONG_TYPE
+    # Check the length of the total character
+    if len(str(input_data)) > max_length:
+        return _DATA_TOO_LONG
+    return _OK
+
+def _check_float(input_data, warn_if_empty, required, limits):
+    total, max_before, max_after = limits
+    # First check if it is empty
+    if len(str(input_data)) == 0:
+        return _check_empty(warn_if_empty, required)
+    # Check that the number is a float
+    if type(input_data) != float:
+        if type(input_data) == int:
+            # This could happen if after the decimal was 0's so it wasnt propigated through.
+            return _POSSIBLE_ISSUE
+        return _WRONG_TYPE
+    # Check that the total length is valid
+    text = str(input_data)
+    if len(text) > total:
+        return _DATA_TOO_LONG
+    # Split the number into before and after the decimal
+    before, after = text.split(".")
+    if len(before) > max_before:
+        return _BEFORE_DECIMAL_TOO_LONG
+    if len(after) > max_after:
+        return _AFTER_DECIMAL_TOO_LONG
+    return _OK
+
+def _check_char(input_data, warn_if_empty, required, max_length):
+    # First check if it is empty
+    if len(str(input_data)) == 0:
+        return _check_empty(warn_if_empty, required)
+    # Check that the type is a string
+    if type(input_data) != str:
+        return _WRONG_TYPE
+    if len(input_data) > max_length:
+        return _DATA_TOO_LONG
+    return _OK
+
+def _check_nothing(input_data, warn_if_empty, required, _):
+    # Types without a rule (e.g. NUMBER_10_TYPE) are always accepted
+    return _OK
+
+def format_check_result(result: ODS_Check_Result, input_data, expected_type: ODS_Data_Types) -> typing.Tuple[str, str]:
+    """
+    Build the (error, warning) strings for the result code of a type check.
+    """
+    if result == _OK:
+        return _NO_MESSAGES
+    elif result == _WRONG_TYPE:
+        return f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})!", ''
+    elif result == _DATA_TOO_LONG:
+        return f"The data ({input_data!r}) is too long. It has a length of ({len(str(input_data))}) for the type ({expected_type!r})!", ''
+    elif result == _BEFORE_DECIMAL_TOO_LONG:
+        return f"The data ({input_data!r}) has too many digits before the decimal. It has a length of ({len(str(input_data).split('.')[0])}) for the type ({expected_type!r})!", ''
+    elif result == _AFTER_DECIMAL_TOO_LONG:
+        return f"The data ({input_data}) has too many digits after the decimal. It has a length of ({len(str(input_data).split('.')[1])}) for the type ({expected_type!r})!", ''
+    elif result == _DATA_EMPTY_WARNING:
+        return '', "The data was empty."
+    elif result == _DATA_EMPTY_ERROR:
+        return "The data was empty.", ''
+    elif result == _POSSIBLE_ISSUE:
+        return '', f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})! Note, this might not be an issue if the digits after the decimnal are all 0's."
+    elif result == _WRONG_DATE_FORMAT:
+        return f"The data ({input_data!r}) is a valid date, but needs to be entered in the format \"yyy-mm-dd\".", ''
+    return _NO_MESSAGES
+
+class ODS_Check_Message(str):
+    """
+    The message of a failed type check, that still has the ODS_Check_Result and the arguments it
+    was formatted from. So the findings of the special validators that pass on the message of a
+    type check keep its template too, see ODS_Finding.of_message.
+    """
+    def __new__(cls, result: ODS_Check_Result, input_data, expected_type: ODS_Data_Types):
+        err_str, warn_str = format_check_result(result, input_data, expected_type)
+        message = super().__new__(cls, err_str or warn_str)
+        message.template = result
+        message.value = input_data
+        message.data_type = expected_type
+        return message
+
+    def __reduce__(self):
+        return (ODS_Check_Message, (self.template, self.value, self.data_type))
+
+def _run_type_check(check, expected_type, warn_if_empty, required, limits, input_data) -> typing.Tuple[str, str]:
+    try:
+        result = check(input_data, warn_if_empty, required, limits)
+    except Exception as e:
+        return f"General error: Failed to check the data type. {e}", ''
+    if result == _OK:
+        return _NO_MESSAGES
+    message = ODS_Check_Message(result, input_data, expected_type)
+    if not message:
+        return _NO_MESSAGES
+    return ('', message) if result in WARNING_RESULTS else (message, '')
+
+def _select_check(expected_type: ODS_Data_Types):
+    if expected_type == ODS_Data_Types.DATE_TYPE:
+        return _check_date, None
+    elif expected_type == ODS_Data_Types.NUMBER_TYPE:
+        return _check_number, None
+    elif expected_type in ODS_Integer_Data_Types:
+        return _check_integer, ODS_Integer_Data_Types[expected_type]
+    elif expected_type in ODS_Float_Data_Types:
+        float_limits = ODS_Float_Data_Types[expected_type]
+        return _check_float, (float_limits["total"], float_limits["before"], float_limits["after"])
+    elif expected_type in ODS_Char_Data_Types:
+        return _check_char, ODS_Char_Data_Types[expected_type]
+    return _check_nothing, None
+
+@functools.lru_cache(maxsize=None)
+def compile_result_checker(expected_type: ODS_Data_Types, warn_if_empty: bool, required: bool) -> typing.Callable[[typing.Any], ODS_Check_Result]:
+    """
+    Build the check for a single cell of the given type. The returned callable takes the cell
+    value and returns an ODS_Check_Result, see format_check_result for the messages.
+    """
+    check, limits = _select_check(expected_type)
+    def check_result(input_data):
+        return check(input_data, warn_if_empty, required, limits)
+    return check_result
+
+@functools.lru_cache(maxsize=None)
+def compile_type_checker(expected_type: ODS_Data_Types, warn_if_empty: bool, required: bool) -> typing.Callable[[typing.Any], typing.Tuple[str, str]]:
+    """
+    Build a checker for a single cell of the given type. The returned callable takes the cell
+    value and returns the (error, warning) strings, the same as ODS_Validator._check_data_type.
+    """
+    check, limits = _select_check(expected_type)
+    return functools.partial(_run_type_check, check, expected_type, warn_if_empty, required, limits)
+
+
+# =========================================================================
+# Cross column dependencies of the special validators
+# =========================================================================
+# Switch column of the validators that depend on the nearest "yes" in any column before their own
+PREVIOUS_COLUMNS = "previous_columns"
+
+def switch_columns(*column_indexes):
+    """
+    Declare the columns a special validator depends on besides its own: column indexes, whose
+    lowercased text it reads, or PREVIOUS_COLUMNS for the nearest "yes" before its own column.
+    The sheet plan resolves the declared columns of all its validators once per row into an
+    ODS_Row_Context, which is given to the declared validators as row_context.
+    """
+    def declare(special_validator):
+        special_validator.switch_columns = column_indexes
+        return special_validator
+    return declare
+
+class ODS_Row_Context():
+    """
+    The states of the switch_columns of a row, resolved in a single pass over the row.
+    """
+    __slots__ = ('row_data', 'previous_yes', 'last_yes', 'switches')
+
+    def __init__(self, row_data: list, switch_columns=(PREVIOUS_COLUMNS,)):
+        self.row_data = row_data
+        # The lowercased text of the declared columns, the same as str(row_data[column_index]).lower()
+        self.switches = {column_index: str(row_data[column_index]).lower() for column_index in switch_columns
+                         if column_index != PREVIOUS_COLUMNS and column_index < len(row_data)}
+        self.previous_yes = None
+        self.last_yes = -1
+        if PREVIOUS_COLUMNS in switch_columns:
+            # Index of the nearest "yes" before each column, -1 if there is none
+            self.previous_yes = previous_yes = []
+            last_yes = -1
+            for column_index, value in enumerate(row_data):
+                previous_yes.append(last_yes)
+                # lower() never makes a string shorter, so only three characters can be "yes"
+                if type(value) == str and len(value) == 3 and value.lower() == "yes":
+                    last_yes = column_index
+            self.last_yes = last_yes
+
+    def switch(self, column_index: int) -> str:
+        return self.switches[column_index]
+
+    def nearest_previous_yes(self, column_index: int) -> int:
+        if column_index == 0:
+            # The same as walking row_data[-1::-1], which wraps around to the end of the row
+            return self.last_yes
+        return self.previous_yes[column_index]
+
+
+# =========================================================================
+# Column labels and titles
+# =========================================================================
+# The labels of all the columns of a sheet (A, ..., Z, AA, ..., XFD), built on first use
+_column_labels = None
+
+def _build_column_labels() -> tuple:
+    labels = []
+    for length in (1, 2, 3):
+        labels += (''.join(letters) for letters in itertools.product(ODS_Column_Label_Lookup, repeat=length))
+    return tuple(labels[:ODS_MAX_COLUMNS])
+
+def column_label(column_index: int) -> str:
+    global _column_labels
+    if _column_labels is None:
+        _column_labels = _build_column_labels()
+    if column_index < ODS_MAX_COLUMNS:
+        return _column_labels[column_index]
+    # Past the columns of a sheet, with the same lettering
+    label = ''
+    column_number = column_index + 1
+    while column_number > 0:
+        column_number, remainder = divmod(column_number - 1, 26)
+        label = ODS_Column_Label_Lookup[remainder] + label
+    return label
+
+def normalize_title(title) -> str:
+    # Column titles compared without the differences in spaces and line breaks
+    return ' '.join(str(title).split())
+
+def header_index(column_names: list, key: typing.Callable = None) -> dict:
+    """
+    The position of the first column with each title (or key(title)) in column_names.
+    """
+    positions = {}
+    for position, column_name in enumerate(column_names):
+        positions.setdefault(column_name if key is None else key(column_name), position)
+    return positions
+
+
+# =========================================================================
+# Per sheet validation plan
+# =========================================================================
+
+def _compile_column_checker(col_validator_data: dict) -> typing.Callable[[int, typing.Any, list, ODS_Row_Context], typing.Tuple[str, str]]:
+    if RCKeys.SPECIAL_VALIDATOR in col_validator_data:
+        special_validator = col_validator_data[RCKeys.SPECIAL_VALIDATOR]
+        declared_columns = getattr(special_validator, 'switch_columns', None)
+        if declared_columns is not None:
+            def check_column(column_index, column_data, row_data, row_context=None):
+                if row_context is None:
+                    row_context = ODS_Row_Context(row_data, declared_columns)
+                return special_validator(column_index, row_data, col_validator_data, row_context=row_context)
+        else:
+            def check_column(column_index, column_data, row_data, row_context=None):
+                return special_validator(column_index, row_data, col_validator_data)
+    else:
+        type_checker = compile_type_checker(col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
+        def check_column(column_index, column_data, row_data, row_context=None):
+            return type_checker(column_data)
+    return check_column
+
+class ODS_Sheet_Plan():
+    """
+    The required columns of a sheet compiled into one checker per column. Every checker is called
+    as checker(column_index, column_data, row_data, row_context) and returns the (error, warning)
+    strings. row_context is the ODS_Row_Context of the row for the switch_columns of the sheet,
+    see row_context, or None (then a declared validator resolves its own).
+    result_checkers holds the compile_result_checker of the columns that only need a type check,
+    so their messages can be formatted later, and None for the columns with a special validator.
+    """
+    def __init__(self, sheet_name: str, required_columns: dict):
+        # The sheet name and the column labels are shared by all the findings of the sheet
+        self.sheet_name = sys.intern(sheet_name)
+        self.column_count = len(required_columns)
+        self.checkers = tuple(_compile_column_checker(required_columns[column_index]) for column_index in range(self.column_count))
+        # (data_type, warn_if_blank, required) of the columns that only need a type check, None for special validators
+        self.type_rules = tuple(None if RCKeys.SPECIAL_VALIDATOR in col_validator_data else (col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
+                                for col_validator_data in (required_columns[column_index] for column_index in range(self.column_count)))
+        self.result_checkers = tuple(None if type_rule is None else compile_result_checker(*type_rule) for type_rule in self.type_rules)
+        self.column_labels = tuple(sys.intern(column_label(column_index)) for column_index in range(self.column_count))
+        # The switch columns declared by the special validators of the sheet, see switch_columns
+        switches = set()
+        for col_validator_data in required_columns.values():
+            switches.update(getattr(col_validator_data.get(RCKeys.SPECIAL_VALIDATOR), 'switch_columns', None) or ())
+        self.switch_columns = tuple(switches)
+
+    def row_context(self, row_data: list) -> typing.Optional[ODS_Row_Context]:
+        # The context of a row, passed to the checkers of all its columns. None if no validator needs one
+        if not self.switch_columns:
+            return None
+        return ODS_Row_Context(row_data, self.switch_columns)
@@ -0,0 +1,277 @@
+import contextlib
+import copy
+import json
+import time
+from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
+from ODS_COMMON.ods_plan import ODS_Sheet_Plan
+from ODS_COMMON.ods_sinks import ODS_Finding_Sink
+
+# Number of functions (cProfile) and lines (tracemalloc) listed in the report
+REPORT_TOP = 25
+
+
+class ODS_Timed_Sink(ODS_Finding_Sink):
+    """
+    Passes the findings on to target and adds the time spent in it to a phase of the profiler,
+    e.g. the writing of the logs while the file is validated.
+    """
+    def __init__(self, target, profiler, phase_name: str):
+        super().__init__()
+        self.target = target
+        self._stat = profiler._stat(profiler.phases, phase_name)
+
+    @property
+    def full(self) -> bool:
+        return getattr(self.target, 'full', False)
+
+    def append(self, finding):
+        self.count += 1
+        start_time = time.perf_counter()
+        self.target.append(finding)
+        self._stat[0] += time.perf_counter() - start_time
+        self._stat[1] += 1
+
+    def close(self):
+        start_time = time.perf_counter()
+        self.target.close()
+        self._stat[0] += time.perf_counter() - start_time
+
+
+class ODS_Profiler():
+    """
+    Records the wall time and the number of calls of a validation per phase, per sheet and per
+    validator function, optionally with cProfile and tracemalloc. Pass it to
+    ODS_Validator.validate_file(profiler=...), it is attached to the validator for the call:
+
+        read                 streaming the rows of the file, also per sheet
+        sheet_position       checking the position of the required sheets
+        header               checking the column titles, per sheet
+        rows                 validating the data rows, per sheet (includes the validators)
+        write_logs           the sinks given with timed_sink, e.g. the log files
+
+    validators holds the special validators and the _check_data_type calls they make, type_checks
+    the type checks of the columns without a special validator, per data type (with the columnar
+    engine per block of a column, so calls counts the blocks and not the cells). Both are part of
+    the time of rows, as is writing the findings the rows produce. Rows validated in worker
+    processes (workers > 1) are not profiled. The timing adds a little to every cell, so the
+    totals are higher than without the profiler.
+    """
+    def __init__(self, use_cprofile: bool = False, use_tracemalloc: bool = False):
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        # name -> [seconds, calls]
+        self.phases = {}
+        self.validators = {}
+        self.type_checks = {}
+        # sheet name -> {phase name -> [seconds, calls]}
+        self.sheets = {}
+        self.files = []
+        self._cprofile = None
+        self._started_tracemalloc = False
+        self._tracemalloc = None
+        self._sheet_plans = {}
+
+    def _stat(self, stats: dict, name: str) -> list:
+        stat = stats.get(name)
+        if stat is None:
+            stat = stats[name] = [0.0, 0]
+        return stat
+
+    def _sheet_stat(self, sheet_name: str, phase_name: str) -> list:
+        sheet_stats = self.sheets.get(sheet_name)
+        if sheet_stats is None:
+            sheet_stats = self.sheets[sheet_name] = {}
+        return self._stat(sheet_stats, phase_name)
+
+    @contextlib.contextmanager
+    def phase(self, phase_name: str, sheet_name: str = None):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start_time
+            stat = self._stat(self.phases, phase_name) if sheet_name is None else self._sheet_stat(sheet_name, phase_name)
+            stat[0] += seconds
+            stat[1] += 1
+
+    def timed(self, stat: list, function):
+        # function with its time and calls added to stat
+        def timed_function(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stat[0] += time.perf_counter() - start_time
+                stat[1] += 1
+        return timed_function
+
+    def timed_sheet(self, phase_name: str, function, sheet_name_of):
+        # function with its time added to phase_name of the sheet sheet_name_of(*args) and of the file
+        file_stat = self._stat(self.phases, phase_name)
+        def timed_function(*args):
+            start_time = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                seconds = time.perf_counter() - start_time
+                sheet_stat = self._sheet_stat(sheet_name_of(*args), phase_name)
+                sheet_stat[0] += seconds
+                sheet_stat[1] += 1
+                file_stat[0] += seconds
+                file_stat[1] += 1
+        return timed_function
+
+    def timed_rows(self, ods_file_rows):
+        """
+        Yields the (sheet_name, row_index, row_values) of ods_file_rows and adds the time spent
+        reading them to the read phase, of the file and of the sheet of the row.
+        """
+        file_stat = self._stat(self.phases, "read")
+        ods_file_rows = iter(ods_file_rows)
+        sheet_name = None
+        sheet_stat = None
+        while True:
+            start_time = time.perf_counter()
+            try:
+                row = next(ods_file_rows)
+            except StopIteration:
+                file_stat[0] += time.perf_counter() - start_time
+                return
+            seconds = time.perf_counter() - start_time
+            if row[0] != sheet_name:
+                sheet_name = row[0]
+                sheet_stat = self._sheet_stat(sheet_name, "read")
+            sheet_stat[0] += seconds
+            sheet_stat[1] += 1
+            file_stat[0] += seconds
+            file_stat[1] += 1
+            yield row
+
+    def timed_sink(self, sink, phase_name: str = "write_logs") -> ODS_Timed_Sink:
+        return ODS_Timed_Sink(sink, self, phase_name)
+
+    def instrument_plan(self, plan: ODS_Sheet_Plan, required_columns: dict) -> ODS_Sheet_Plan:
+        """
+        A copy of plan whose checkers add their time to validators (special validators) or type_checks.
+        """
+        timed_plan = copy.copy(plan)
+        checkers = []
+        result_checkers = []
+        for column_index, (checker, result_checker, type_rule) in enumerate(zip(plan.checkers, plan.result_checkers, plan.type_rules)):
+            if type_rule is None:
+                validator_name = required_columns[column_index][RCKeys.SPECIAL_VALIDATOR].__name__
+                checkers.append(self.timed(self._stat(self.validators, validator_name), checker))
+                result_checkers.append(None)
+            else:
+                type_stat = self._stat(self.type_checks, type_rule[0].name)
+                checkers.append(self.timed(type_stat, checker))
+                result_checkers.append(self.timed(type_stat, result_checker))
+        timed_plan.checkers = tuple(checkers)
+        timed_plan.result_checkers = tuple(result_checkers)
+        return timed_plan
+
+    def attach(self, validator):
+        """
+        Time the steps of validator, until detach. The timed functions are set on the instance,
+        so a validator must not be used by other threads while it is profiled.
+        """
+        get_sheet_plan = validator._get_sheet_plan
+        def get_timed_sheet_plan(sheet_name):
+            plan = self._sheet_plans.get(sheet_name)
+            if plan is None:
+                plan = self._sheet_plans[sheet_name] = self.instrument_plan(get_sheet_plan(sheet_name), validator.required_columns[sheet_name])
+            return plan
+        validator._get_sheet_plan = get_timed_sheet_plan
+        validator._check_data_type = self.timed(self._stat(self.validators, "_check_data_type"), validator._check_data_type)
+        validator._validate_sheet_position = self.timed(self._stat(self.phases, "sheet_position"), validator._validate_sheet_position)
+        validator._validate_column_names = self.timed_sheet("header", validator._validate_column_names, lambda sheet_name, *_: sheet_name)
+        if validator._columnar_engine is None:
+            validator._validate_row = self.timed_sheet("rows", validator._validate_row, lambda plan, *_: plan.sheet_name)
+        else:
+            # The columnar engine falls back to _validate_row inside validate_rows, so only that is timed
+            validator._columnar_engine.validate_rows = self.timed_sheet("rows", validator._columnar_engine.validate_rows, lambda plan, *_: plan.sheet_name)
+            # It checks the types a column at a time, without the checkers of the plan
+            validate_type_column = validator._columnar_engine._validate_type_column
+            def timed_type_column(plan, column_index, type_rule, *args):
+                return self.timed(self._stat(self.type_checks, type_rule[0].name), validate_type_column)(plan, column_index, type_rule, *args)
+            validator._columnar_engine._validate_type_column = timed_type_column
+
+    def detach(self, validator):
+        for attribute_name in ("_get_sheet_plan", "_check_data_type", "_validate_sheet_position", "_validate_column_names", "_validate_row"):
+            validator.__dict__.pop(attribute_name, None)
+        if validator._columnar_engine is not None:
+            for attribute_name in ("validate_rows", "_validate_type_column"):
+                validator._columnar_engine.__dict__.pop(attribute_name, None)
+        # The plans are instrumented for a validator
+        self._sheet_plans = {}
+
+    def start(self):
+        if self.use_tracemalloc:
+            import tracemalloc
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        if self.use_cprofile:
+            import cProfile
+            if self._cprofile is None:
+                self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.use_tracemalloc:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+                self._tracemalloc = {
+                    "current_bytes": current_bytes,
+                    "peak_bytes": peak_bytes,
+                    "top": [{"location": str(statistic.traceback), "size_bytes": statistic.size, "count": statistic.count}
+                            for statistic in snapshot.statistics("lineno")[:REPORT_TOP]],
+                }
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def profile_file(self, file_name: str):
+        """
+        Profile the validation of a file, with cProfile and tracemalloc if they were asked for.
+        """
+        self.files.append(file_name)
+        self.start()
+        try:
+            with self.phase("validate_file"):
+                yield self
+        finally:
+            self.stop()
+
+    def report(self) -> dict:
+        def seconds_and_calls(stats: dict) -> dict:
+            return {name: {"seconds": round(seconds, 6), "calls": calls} for name, (seconds, calls) in sorted(stats.items(), key=lambda item: item[1][0], reverse=True)}
+
+        report = {
+            "files": self.files,
+            "phases": seconds_and_calls(self.phases),
+            "sheets": {sheet_name: seconds_and_calls(sheet_stats) for sheet_name, sheet_stats in self.sheets.items()},
+            "validators": seconds_and_calls(self.validators),
+            "type_checks": seconds_and_calls(self.type_checks),
+        }
+        if self._cprofile is not None:
+            import pstats
+            stats = pstats.Stats(self._cprofile)
+            functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:REPORT_TOP]
+            report["cprofile"] = [{"function": f"{file_name}:{line_number}({function_name})", "calls": calls, "total_seconds": round(total_time, 6), "cumulative_seconds": round(cumulative_time, 6)}
+                                  for (file_name, line_number, function_name), (_, calls, total_time, cumulative_time, _) in functions]
+        if self._tracemalloc is not None:
+            report["tracemalloc"] = self._tracemalloc
+        return report
+
+    def write_report(self, file_path: str):
+        with open(file_path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+        if self._cprofile is not None:
+            # For pstats or other viewers of cProfile output
+            self._cprofile.dump_stats(f"{file_path[:-len('.json')] if file_path.endswith('.json') else file_path}.prof")
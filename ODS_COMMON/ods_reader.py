@@ -0,0 +1,268 @@
+import datetime
+from xml.parsers import expat
+
+# Namespaced tag names as reported by expat (namespace URI + " " + local name)
+_TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+_OFFICE_NS = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+
+_TABLE = f"{_TABLE_NS} table"
+_TABLE_ROW = f"{_TABLE_NS} table-row"
+_TABLE_CELL = f"{_TABLE_NS} table-cell"
+_COVERED_TABLE_CELL = f"{_TABLE_NS} covered-table-cell"
+_TEXT_P = f"{_TEXT_NS} p"
+_TEXT_H = f"{_TEXT_NS} h"
+_TEXT_S = f"{_TEXT_NS} s"
+_TEXT_TAB = f"{_TEXT_NS} tab"
+_TEXT_LINE_BREAK = f"{_TEXT_NS} line-break"
+
+_ATTR_TABLE_NAME = f"{_TABLE_NS} name"
+_ATTR_ROWS_REPEATED = f"{_TABLE_NS} number-rows-repeated"
+_ATTR_COLUMNS_REPEATED = f"{_TABLE_NS} number-columns-repeated"
+_ATTR_VALUE_TYPE = f"{_OFFICE_NS} value-type"
+_ATTR_VALUE = f"{_OFFICE_NS} value"
+_ATTR_DATE_VALUE = f"{_OFFICE_NS} date-value"
+_ATTR_TIME_VALUE = f"{_OFFICE_NS} time-value"
+_ATTR_BOOLEAN_VALUE = f"{_OFFICE_NS} boolean-value"
+_ATTR_STRING_VALUE = f"{_OFFICE_NS} string-value"
+_ATTR_CURRENCY = f"{_OFFICE_NS} currency"
+_ATTR_TEXT_C = f"{_TEXT_NS} c"
+
+_CELL_TAGS = (_TABLE_CELL, _COVERED_TABLE_CELL)
+_PARAGRAPH_TAGS = (_TEXT_P, _TEXT_H)
+
+# Size of the chunks of the decompressed content.xml fed to the parser
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _date_value(value):
+    # Same conversion as pyexcel-io so the validator sees the same types as from get_data()
+    if len(value) == 10:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    elif len(value) == 19:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+    elif len(value) > 19:
+        return datetime.datetime.strptime(value[0:26], "%Y-%m-%dT%H:%M:%S.%f")
+    raise ValueError(f"Bad date value {value}")
+
+
+def _time_value(value):
+    hour = int(value[2:4])
+    minute = int(value[5:7])
+    second = int(value[8:10])
+    if hour < 24:
+        return datetime.time(hour, minute, second)
+    return datetime.timedelta(hours=hour, minutes=minute, seconds=second)
+
+
+def _float_value(value):
+    number = float(value)
+    if number == int(number):
+        return int(number)
+    return number
+
+
+class ODS_Content_Handler():
+    """
+    Expat callbacks turning the content.xml of an ODS file into rows of cell values.
+    Completed rows are buffered until they are collected with pop_rows().
+    Only the sheets in sheet_names are read (all if it is None), the others are reported with a
+    single empty row so the order of the sheets is kept. With max_empty_rows the rest of a sheet
+    is skipped after that many consecutive empty rows from the zero based row data_start_row on,
+    e.g. the formatted empty rows up to the end of the sheet that the templates are saved with.
+    """
+    def __init__(self, sheet_names=None, max_empty_rows: int = None, data_start_row: int = 0):
+        if max_empty_rows is not None and max_empty_rows < 1:
+            raise ValueError(f"ERROR: max_empty_rows must be at least 1, but is {max_empty_rows}!")
+        self.rows = []
+        self.sheet_name = None
+        self.row_index = 0
+        self.sheet_names = None if sheet_names is None else frozenset(sheet_names)
+        self.max_empty_rows = max_empty_rows
+        self.data_start_row = data_start_row
+
+        self._parser = None
+        # Depth of the elements below the table that is skipped
+        self._skip_depth = 0
+        self._empty_rows = 0
+
+        self._row_cells = None
+        self._row_repeat = 1
+        self._pending_empty_cells = 0
+
+        self._in_cell = False
+        self._cell_depth = 0
+        self._cell_attrs = None
+        self._cell_repeat = 1
+        self._collect_text = False
+        self._paragraph_depth = 0
+        self._paragraph_count = 0
+        self._text_parts = []
+
+    def create_parser(self):
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        self._parser = parser
+        return parser
+
+    def _skip_table(self):
+        # The rest of the table is only counted through, its cells are never looked at
+        self._skip_depth = 1
+        self._parser.StartElementHandler = self._skip_start_element
+        self._parser.EndElementHandler = self._skip_end_element
+        self._parser.CharacterDataHandler = None
+
+    def _skip_start_element(self, tag, attrs):
+        self._skip_depth += 1
+
+    def _skip_end_element(self, tag):
+        self._skip_depth -= 1
+        if self._skip_depth == 0:
+            self._parser.StartElementHandler = self.start_element
+            self._parser.EndElementHandler = self.end_element
+            self._parser.CharacterDataHandler = self.character_data
+
+    def pop_rows(self) -> list:
+        rows = self.rows
+        self.rows = []
+        return rows
+
+    def start_element(self, tag, attrs):
+        if self._in_cell:
+            self._cell_depth += 1
+            if not self._collect_text:
+                return
+            if tag in _PARAGRAPH_TAGS and self._cell_depth == 2:
+                # Only paragraphs directly below the cell are part of its text (not annotations)
+                if self._paragraph_count > 0:
+                    self._text_parts.append("\n")
+                self._paragraph_count += 1
+                self._paragraph_depth = self._cell_depth
+            elif self._paragraph_depth:
+                if tag == _TEXT_S:
+                    self._text_parts.append(" " * int(attrs.get(_ATTR_TEXT_C, 1)))
+                elif tag == _TEXT_TAB:
+                    self._text_parts.append("\t")
+                elif tag == _TEXT_LINE_BREAK:
+                    self._text_parts.append("\n")
+        elif tag in _CELL_TAGS:
+            self._in_cell = True
+            self._cell_depth = 1
+            self._cell_attrs = attrs
+            self._cell_repeat = int(attrs.get(_ATTR_COLUMNS_REPEATED, 1))
+            self._collect_text = attrs.get(_ATTR_VALUE_TYPE) == "string" and _ATTR_STRING_VALUE not in attrs
+            self._paragraph_depth = 0
+            self._paragraph_count = 0
+        elif tag == _TABLE_ROW:
+            self._row_cells = []
+            self._row_repeat = int(attrs.get(_ATTR_ROWS_REPEATED, 1))
+            self._pending_empty_cells = 0
+        elif tag == _TABLE:
+            self.sheet_name = attrs.get(_ATTR_TABLE_NAME, "")
+            self.row_index = 0
+            self._empty_rows = 0
+            if self.sheet_names is not None and self.sheet_name not in self.sheet_names:
+                self.rows.append((self.sheet_name, 0, []))
+                self._skip_table()
+
+    def end_element(self, tag):
+        if self._in_cell:
+            if self._cell_depth == 1:
+                self._end_cell()
+                return
+            if self._cell_depth == self._paragraph_depth:
+                self._paragraph_depth = 0
+            self._cell_depth -= 1
+        elif tag == _TABLE_ROW:
+            self._end_row()
+
+    def character_data(self, data):
+        if self._paragraph_depth:
+            self._text_parts.append(data)
+
+    def _end_cell(self):
+        self._in_cell = False
+        self._cell_depth = 0
+        try:
+            value = self._cell_value(self._cell_attrs)
+        except Exception as e:
+            print(f"ERROR: Failed to read a cell in row {self.row_index + 1} of the sheet ({self.sheet_name}). {e}")
+            value = ""
+        self._text_parts = []
+        self._cell_attrs = None
+
+        if value is None or value == "":
+            # Trailing empty cells are dropped, so only add them once a value follows
+            self._pending_empty_cells += self._cell_repeat
+            return
+        if self._pending_empty_cells:
+            self._row_cells.extend([""] * self._pending_empty_cells)
+            self._pending_empty_cells = 0
+        if self._cell_repeat == 1:
+            self._row_cells.append(value)
+        else:
+            self._row_cells.extend([value] * self._cell_repeat)
+
+    def _cell_value(self, attrs):
+        value_type = attrs.get(_ATTR_VALUE_TYPE)
+        if value_type is None:
+            return ""
+        elif value_type == "string":
+            if _ATTR_STRING_VALUE in attrs:
+                return attrs[_ATTR_STRING_VALUE]
+            return "".join(self._text_parts)
+        elif value_type == "float":
+            return _float_value(attrs[_ATTR_VALUE])
+        elif value_type == "percentage":
+            return float(attrs[_ATTR_VALUE])
+        elif value_type == "currency":
+            return f"{_float_value(attrs[_ATTR_VALUE])} {attrs.get(_ATTR_CURRENCY, '')}"
+        elif value_type == "date":
+            return _date_value(attrs[_ATTR_DATE_VALUE])
+        elif value_type == "time":
+            return _time_value(attrs[_ATTR_TIME_VALUE])
+        elif value_type == "boolean":
+            return attrs.get(_ATTR_BOOLEAN_VALUE) == "true"
+        return ""
+
+    def _end_row(self):
+        row_cells = self._row_cells
+        self._row_cells = None
+        if len(row_cells) == 0:
+            # A block of empty rows is reported once, the row index still advances over all of them
+            self.rows.append((self.sheet_name, self.row_index, row_cells))
+            # Only the rows from data_start_row on count, the title rows are often blank
+            self._empty_rows += max(0, min(self._row_repeat, self.row_index + self._row_repeat - self.data_start_row))
+        else:
+            for repeat_index in range(self._row_repeat):
+                self.rows.append((self.sheet_name, self.row_index + repeat_index, row_cells if repeat_index == 0 else list(row_cells)))
+            self._empty_rows = 0
+        self.row_index += self._row_repeat
+        if self.max_empty_rows is not None and self._empty_rows >= self.max_empty_rows:
+            # Skip from the end of this row to the end of the table
+            self._skip_table()
+
+
+def iter_ods_rows(source, sheet_names=None, max_empty_rows: int = None, data_start_row: int = 0):
+    """
+    Stream the rows of every sheet in an ODS file without loading the whole workbook.
+    source is the path of the file, its bytes or a file object (see ODS_Archive).
+    sheet_names, max_empty_rows and data_start_row limit what is read, see ODS_Content_Handler.
+    Yields (sheet_name, row_index, row_values) in document order, where row_index is the
+    zero based row of the sheet and row_values follow the same conventions as
+    pyexcel_ods3.get_data() (trailing empty cells dropped, empty cells as "").
+    """
+    # Imported here so the CLI starts fast, e.g. for --help
+    from ODS_COMMON.ods_utils import ODS_Archive
+    with ODS_Archive(source) as ods_archive:
+        handler = ODS_Content_Handler(sheet_names, max_empty_rows, data_start_row)
+        parser = handler.create_parser()
+        # The chunks are slices of the archive or fresh from the decompressor, the parser copies what it keeps
+        for chunk in ods_archive.iter_content(READ_CHUNK_SIZE):
+            parser.Parse(chunk, False)
+            yield from handler.pop_rows()
+        parser.Parse(b"", True)
+        yield from handler.pop_rows()
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import marshal
+import os
+from ODS_COMMON.ods_constants import ODS_Data_Types
+from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "schemas")
+DEFAULT_SCHEMA_FILE = os.path.join(SCHEMA_DIR, "other_templates_2015-16_v4.json")
+# Bump when the layout of ODS_Compiled_Schema.to_marshal changes, so older artifacts are not loaded
+SCHEMA_COMPILER_VERSION = 1
+# The compiled schemas are stored next to the schema files, the same as *.pyc files
+COMPILED_SCHEMA_DIR = "__pycache__"
+
+# The schemas compiled or loaded by this process, keyed by the hash of the schema file
+_loaded_schemas = {}
+
+
+class ODS_Compiled_Schema():
+    """
+    The rules of a template, checked and flattened. sheets is a tuple of (sheet_name, columns) in the
+    required order, columns a tuple of (column_name, required, data_type, warn_if_blank, validator_name)
+    with validator_name None for the columns that only need a type check.
+    """
+    def __init__(self, template: str, column_title_index: int, sheets: tuple):
+        self.template = template
+        self.column_title_index = column_title_index
+        self.sheets = sheets
+
+    @property
+    def required_sheets(self) -> list:
+        return [sheet_name for sheet_name, _ in self.sheets]
+
+    def required_columns(self, validator) -> dict:
+        """
+        The required_columns dict of ODS_Validator, with the special validators bound to validator.
+        """
+        required_columns = {}
+        for sheet_name, columns in self.sheets:
+            sheet_columns = {}
+            for column_index, (column_name, required, data_type, warn_if_blank, validator_name) in enumerate(columns):
+                col_validator_data = {RCKeys.COLUMN_NAME: column_name, RCKeys.REQUIRED: required, RCKeys.DATA_TYPE: data_type, RCKeys.WARN_IF_BLANK: warn_if_blank}
+                if validator_name is not None:
+                    special_validator = getattr(validator, validator_name, None)
+                    if not callable(special_validator):
+                        raise ValueError(f"ERROR: The validator ({validator_name}) of column {column_index+1} of the sheet {sheet_name} does not exist in {type(validator).__name__}!")
+                    col_validator_data[RCKeys.SPECIAL_VALIDATOR] = special_validator
+                sheet_columns[column_index] = col_validator_data
+            required_columns[sheet_name] = sheet_columns
+        return required_columns
+
+    def to_marshal(self) -> tuple:
+        # Only built in types, the data types are stored by name
+        return (SCHEMA_COMPILER_VERSION, self.template, self.column_title_index,
+                tuple((sheet_name, tuple((column_name, required, data_type.name, warn_if_blank, validator_name)
+                                         for column_name, required, data_type, warn_if_blank, validator_name in columns))
+                      for sheet_name, columns in self.sheets))
+
+    @classmethod
+    def from_marshal(cls, data: tuple):
+        version, template, column_title_index, sheets = data
+        if version != SCHEMA_COMPILER_VERSION:
+            raise ValueError(f"ERROR: The compiled schema has version {version}, expected {SCHEMA_COMPILER_VERSION}!")
+        return cls(template, column_title_index,
+                   tuple((sheet_name, tuple((column_name, required, ODS_Data_Types[data_type], warn_if_blank, validator_name)
+                                            for column_name, required, data_type, warn_if_blank, validator_name in columns))
+                         for sheet_name, columns in sheets))
+
+
+def _schema_error(message: str):
+    return ValueError(f"ERROR: Invalid schema. {message}")
+
+def _get(schema_dict: dict, key: str, expected_type, where: str):
+    if key not in schema_dict:
+        raise _schema_error(f"{where} is missing \"{key}\"!")
+    value = schema_dict[key]
+    if type(value) != expected_type:
+        raise _schema_error(f"\"{key}\" of {where} must be of type {expected_type.__name__}, but is {value!r}!")
+    return value
+
+def compile_schema(schema: dict) -> ODS_Compiled_Schema:
+    """
+    Check a schema (the parsed JSON of a schema file) and compile it.
+
+        {"template": "...", "column_title_index": 8, "sheets": [
+            {"name": "Other_Grants_V3", "columns": [
+                {"title": "...", "type": "DATE_TYPE", "required": true, "warn_if_blank": true, "validator": "validate_yes_no"}, ...]}, ...]}
+
+    "type" is the name of an ODS_Data_Types. "validator" is optional and names the special validator
+    method of ODS_Validator for the column, which is how conditions across the columns are given.
+    """
+    if type(schema) != dict:
+        raise _schema_error("The schema must be an object!")
+    template = _get(schema, "template", str, "The schema")
+    column_title_index = _get(schema, "column_title_index", int, "The schema")
+    sheets = []
+    for sheet_index, sheet in enumerate(_get(schema, "sheets", list, "The schema")):
+        if type(sheet) != dict:
+            raise _schema_error(f"Sheet {sheet_index+1} must be an object!")
+        sheet_name = _get(sheet, "name", str, f"Sheet {sheet_index+1}")
+        if sheet_name in [name for name, _ in sheets]:
+            raise _schema_error(f"The sheet {sheet_name} is given twice!")
+        columns = []
+        for column_index, column in enumerate(_get(sheet, "columns", list, f"The sheet {sheet_name}")):
+            where = f"Column {column_index+1} of the sheet {sheet_name}"
+            if type(column) != dict:
+                raise _schema_error(f"{where} must be an object!")
+            data_type = _get(column, "type", str, where)
+            if data_type not in ODS_Data_Types.__members__:
+                raise _schema_error(f"{where} has the unknown type {data_type}!")
+            validator_name = column.get("validator")
+            if validator_name is not None and type(validator_name) != str:
+                raise _schema_error(f"\"validator\" of {where} must be the name of a method!")
+            columns.append((_get(column, "title", str, where), _get(column, "required", bool, where), ODS_Data_Types[data_type],
+                            _get(column, "warn_if_blank", bool, where), validator_name))
+        sheets.append((sheet_name, tuple(columns)))
+    return ODS_Compiled_Schema(template, column_title_index, tuple(sheets))
+
+def _compiled_schema_path(schema_file: str, schema_hash: str) -> str:
+    schema_dir, schema_name = os.path.split(os.path.realpath(schema_file))
+    return os.path.join(schema_dir, COMPILED_SCHEMA_DIR, f"{schema_name}.{schema_hash[:16]}.v{SCHEMA_COMPILER_VERSION}.marshal")
+
+def load_schema(schema_file: str = DEFAULT_SCHEMA_FILE) -> ODS_Compiled_Schema:
+    """
+    The compiled schema of a schema file. It is compiled once per version of the file, the result is
+    stored as a marshal artifact so the following runs only have to load it.
+    """
+    with open(schema_file, 'rb') as f:
+        schema_bytes = f.read()
+    schema_hash = hashlib.sha256(schema_bytes).hexdigest()
+    if schema_hash in _loaded_schemas:
+        return _loaded_schemas[schema_hash]
+
+    compiled_path = _compiled_schema_path(schema_file, schema_hash)
+    compiled_schema = None
+    try:
+        with open(compiled_path, 'rb') as f:
+            compiled_schema = ODS_Compiled_Schema.from_marshal(marshal.loads(f.read()))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"WARNING: Ignoring the compiled schema {compiled_path}. {e}")
+
+    if compiled_schema is None:
+        try:
+            schema = json.loads(schema_bytes.decode('utf-8'))
+        except ValueError as e:
+            raise _schema_error(f"The file {schema_file} is not valid JSON. {e}")
+        compiled_schema = compile_schema(schema)
+        _store_compiled_schema(compiled_path, compiled_schema)
+
+    _loaded_schemas[schema_hash] = compiled_schema
+    return compiled_schema
+
+def _store_compiled_schema(compiled_path: str, compiled_schema: ODS_Compiled_Schema):
+    # Storing is only an optimisation, e.g. the schema directory may be read only
+    import tempfile
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(compiled_path), suffix=".tmp")
+        with os.fdopen(handle, 'wb') as f:
+            f.write(marshal.dumps(compiled_schema.to_marshal()))
+        os.replace(temp_path, compiled_path)
+    except OSError:
+        pass
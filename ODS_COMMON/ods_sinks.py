@@ -0,0 +1,215 @@
+import csv
+import json
+from ODS_COMMON.ods_constants import ODS_Check_Result
+from ODS_COMMON.ods_finding import LOG_FIELDNAMES, ODS_Finding
+
+# The records of ODS_Aggregating_Sink, rows are ranges like "10-25, 31" and values a sample like "1, 2, ..."
+AGGREGATED_LOG_FIELDNAMES = ['sheet_name', 'entry', 'column', 'message', 'count', 'rows', 'values']
+# The findings without a value to sample, and the end of a sample with more values
+_NO_VALUE = object()
+# The rows of a group of ODS_Aggregating_Sink start after its count, message and values
+_GROUP_ROWS = 3
+_EMPTY_RESULTS = frozenset((ODS_Check_Result.DATA_EMPTY_WARNING, ODS_Check_Result.DATA_EMPTY_ERROR))
+
+
+class ODS_Finding_Sink():
+    """
+    Receives the findings of a validation as they are produced, each an ODS_Finding or a dict with the LOG_FIELDNAMES keys.
+    Sinks can be used where ODS_Validator takes the error or warning list, they have append and extend.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def append(self, finding: dict):
+        self.count += 1
+        self._write(finding)
+
+    def extend(self, findings):
+        for finding in findings:
+            self.append(finding)
+
+    def _write(self, finding: dict):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ODS_Memory_Sink(ODS_Finding_Sink):
+    """
+    Keeps the findings in a list, e.g. ODS_File.error_strings.
+    """
+    def __init__(self, findings: list = None):
+        super().__init__()
+        self.findings = findings if findings is not None else []
+        # Straight to the list, this is called for every finding
+        self.append = self.findings.append
+        self.extend = self.findings.extend
+
+    def __len__(self):
+        return len(self.findings)
+
+
+class _ODS_File_Sink(ODS_Finding_Sink):
+    def __init__(self, file_path: str, flush_every: int):
+        super().__init__()
+        self.file_path = file_path
+        # Flushed every flush_every findings, so the log can be followed while the validation runs
+        self.flush_every = flush_every
+        self._file = open(file_path, 'w', encoding='utf-8', newline='')
+
+    def append(self, finding: dict):
+        self.count += 1
+        self._write(finding)
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ODS_CSV_Sink(_ODS_File_Sink):
+    """
+    Writes the findings to a CSV file with a header row, the same format as the log files of ods_validator_main.py.
+    """
+    def __init__(self, file_path: str, flush_every: int = 1000, fieldnames: list = LOG_FIELDNAMES):
+        super().__init__(file_path, flush_every)
+        self._csv_file = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._csv_file.writeheader()
+        # ODS_Finding gives its values in the order of LOG_FIELDNAMES, without the lookups of DictWriter
+        self._values_in_order = fieldnames == LOG_FIELDNAMES
+
+    def _write(self, finding):
+        if self._values_in_order and type(finding) is ODS_Finding:
+            self._csv_file.writer.writerow(finding.values())
+        else:
+            self._csv_file.writerow(finding)
+
+
+class ODS_JSONL_Sink(_ODS_File_Sink):
+    """
+    Writes one JSON object per finding and line.
+    """
+    def __init__(self, file_path: str, flush_every: int = 1000):
+        super().__init__(file_path, flush_every)
+        self._json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+    def _write(self, finding: dict):
+        self._file.write(self._json_encoder.encode(dict(finding)))
+        self._file.write("\n")
+
+
+class ODS_Limited_Sink(ODS_Finding_Sink):
+    """
+    Passes the first max_findings findings on to target and counts the others as dropped. full is
+    True once the limit, or the limit of target if that is an ODS_Limited_Sink too, was reached.
+    """
+    def __init__(self, target, max_findings: int):
+        super().__init__()
+        self.target = target
+        self.max_findings = max_findings
+        self.dropped = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.max_findings or getattr(self.target, 'full', False)
+
+    def append(self, finding: dict):
+        if self.count >= self.max_findings:
+            self.dropped += 1
+            return
+        self.count += 1
+        self.target.append(finding)
+
+
+class ODS_Aggregating_Sink(ODS_Finding_Sink):
+    """
+    Groups the findings of the same sheet, entry and column with the same message template into
+    one record with their count, the ranges of their rows and a sample of up to SAMPLE_VALUES of
+    their values, see AGGREGATED_LOG_FIELDNAMES. The failed type checks of an ODS_Finding are
+    grouped on the ODS_Check_Result, the expected type and the type of the value, so e.g. all the
+    PossibleIssue warnings of ints in a float column are one record. Other findings are grouped
+    on their message. Only the message of the first finding of a group is kept (the later ones
+    share the strings of the plan), with the rows as ranges. The records are passed on to target
+    when the sink is closed, in the order the groups were first found.
+    """
+    SAMPLE_VALUES = 5
+
+    def __init__(self, target=None):
+        super().__init__()
+        self.target = target
+        # key -> [count, message, sampled values, start, end, start, end, ...] of the rows
+        self._groups = {}
+
+    def append(self, finding: dict):
+        self.count += 1
+        if type(finding) is ODS_Finding and finding.template in _EMPTY_RESULTS:
+            # "The data was empty." names no value
+            key = (finding.sheet_name, finding.entry, finding.column, finding.template)
+            value = _NO_VALUE
+        elif type(finding) is ODS_Finding and finding.template is not None:
+            key = (finding.sheet_name, finding.entry, finding.column, finding.template, finding.data_type, type(finding.value))
+            value = finding.value
+        else:
+            key = (finding['sheet_name'], finding['entry'], finding['column'], finding['message'])
+            value = _NO_VALUE
+        group = self._groups.get(key)
+        if group is None:
+            # Formatted once per group
+            group = self._groups[key] = [0, finding['message'], []]
+        group[0] += 1
+        if value is not _NO_VALUE and value not in group[2] and len(group[2]) <= self.SAMPLE_VALUES:
+            # One more than SAMPLE_VALUES only marks that there were more
+            group[2].append(value if len(group[2]) < self.SAMPLE_VALUES else _NO_VALUE)
+        row = finding['row']
+        if type(row) == int:
+            # The rows of a group arrive in order, so they mostly extend the last range
+            if len(group) > _GROUP_ROWS and group[-1] + 1 == row:
+                group[-1] = row
+            elif len(group) == _GROUP_ROWS or not group[-2] <= row <= group[-1]:
+                group += (row, row)
+
+    def records(self):
+        for key, group in self._groups.items():
+            sheet_name, entry, column = key[:3]
+            yield {'sheet_name': sheet_name, 'entry': entry, 'column': column, 'message': group[1], 'count': group[0],
+                   'rows': format_row_ranges(group[_GROUP_ROWS:]), 'values': format_sampled_values(group[2])}
+
+    def close(self):
+        if self.target is not None:
+            self.target.extend(self.records())
+            self.target.close()
+            # Closing twice must not write the records again
+            self.target = None
+
+
+def format_row_ranges(row_ranges: list) -> str:
+    # row_ranges is the flat start, end, start, end, ... list of ODS_Aggregating_Sink
+    merged = []
+    for start, end in sorted(zip(row_ranges[0::2], row_ranges[1::2])):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return ", ".join(str(start) if start == end else f"{start}-{end}" for start, end in merged)
+
+def format_sampled_values(sampled_values: list) -> str:
+    return ", ".join("..." if value is _NO_VALUE else repr(value) for value in sampled_values)
+
+def aggregate_findings(findings) -> list:
+    """
+    The records of ODS_Aggregating_Sink for a list of findings.
+    """
+    aggregating_sink = ODS_Aggregating_Sink()
+    aggregating_sink.extend(findings)
+    return list(aggregating_sink.records())
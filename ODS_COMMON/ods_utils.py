@@ -1 +1,244 @@
-pass
\ No newline at end of file
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+
+# End of central directory record, the ZIP64 locator and record, a central directory file header and a local file header
+_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_END_RECORD = struct.Struct("<4sQ2H2L4Q")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_END_RECORD_SIGNATURE = b"PK\x05\x06"
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_END_RECORD_SIGNATURE = b"PK\x06\x06"
+_CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_ZIP64_EXTRA_ID = 0x0001
+_ZIP64_LIMIT = 0xFFFFFFFF
+# The end record is followed by a comment of at most 65535 bytes
+_MAX_END_SEARCH = _END_RECORD.size + 0xFFFF
+
+_STORED = 0
+_DEFLATED = 8
+_ENCRYPTED_FLAG = 0x1
+
+# Size of the decompressed chunks handed out by ODS_Archive.iter_member
+MEMBER_CHUNK_SIZE = 64 * 1024
+# Compressed bytes given to the decompressor at a time. Small, so what it can not take yet
+# (copied to unconsumed_tail) stays small as well
+_DEFLATE_INPUT_SIZE = 16 * 1024
+
+
+class ODS_Member():
+    """
+    Where a file of the archive is stored, from its central directory entry.
+    """
+    __slots__ = ('name', 'method', 'flags', 'crc', 'compressed_size', 'size', 'header_offset')
+
+    def __init__(self, name: str, method: int, flags: int, crc: int, compressed_size: int, size: int, header_offset: int):
+        self.name = name
+        self.method = method
+        self.flags = flags
+        self.crc = crc
+        self.compressed_size = compressed_size
+        self.size = size
+        self.header_offset = header_offset
+
+
+class ODS_Archive():
+    """
+    An *.ods file (a zip archive) read where it is, without the copies of zipfile: a path or an
+    open file is memory mapped, bytes and the buffer of an io.BytesIO are used as they are. Other
+    file-like objects (e.g. the body of an upload) are read once. The files of the archive are
+    found through its central directory and streamed in chunks, see iter_member.
+
+        with ODS_Archive("returns.ods") as ods_archive:
+            for chunk in ods_archive.iter_member("content.xml"):
+                parser.Parse(chunk, False)
+
+    Errors in the archive raise zipfile.BadZipFile, the same as zipfile.
+    """
+    def __init__(self, source):
+        self._file = None
+        self._mmap = None
+        self._view = None
+        self._members = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, 'rb')
+            self._view = self._map_file(self._file)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._view = memoryview(source).cast('B')
+        elif hasattr(source, 'getbuffer'):
+            self._view = source.getbuffer()
+        elif hasattr(source, 'read'):
+            try:
+                self._view = self._map_file(source)
+            except (AttributeError, OSError, ValueError):
+                # Pipes, sockets and the like, or a file that can not be mapped
+                self._view = memoryview(source.read())
+        else:
+            raise TypeError(f"ERROR: An ODS file can not be read from {type(source)}, expected a path, bytes or a file object!")
+
+    def _map_file(self, file) -> memoryview:
+        try:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped
+            raise zipfile.BadZipFile("File is not a zip file")
+        return memoryview(self._mmap)
+
+    def close(self):
+        self._members = None
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A chunk handed out is still referenced, the mapping is closed when it is collected
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def members(self) -> dict:
+        # name -> ODS_Member of the files in the archive, read from the central directory on first use
+        if self._members is None:
+            self._members = self._read_central_directory()
+        return self._members
+
+    def _read_central_directory(self) -> dict:
+        view = self._view
+        # The end record is the last thing in the archive but for its comment, copy only that tail
+        tail_start = max(0, len(view) - _MAX_END_SEARCH)
+        tail = bytes(view[tail_start:])
+        end_index = tail.rfind(_END_RECORD_SIGNATURE)
+        if end_index < 0 or end_index + _END_RECORD.size > len(tail):
+            raise zipfile.BadZipFile("File is not a zip file")
+        end_offset = tail_start + end_index
+        _, _, _, _, entry_count, directory_size, directory_offset, _ = _END_RECORD.unpack_from(tail, end_index)
+        if directory_offset == _ZIP64_LIMIT or entry_count == 0xFFFF:
+            locator_offset = end_offset - _ZIP64_LOCATOR.size
+            if locator_offset < 0 or bytes(view[locator_offset:locator_offset+4]) != _ZIP64_LOCATOR_SIGNATURE:
+                raise zipfile.BadZipFile("Corrupt ZIP64 end of central directory locator")
+            _, _, zip64_end_offset, _ = _ZIP64_LOCATOR.unpack_from(view, locator_offset)
+            if bytes(view[zip64_end_offset:zip64_end_offset+4]) != _ZIP64_END_RECORD_SIGNATURE:
+                raise zipfile.BadZipFile("Corrupt ZIP64 end of central directory record")
+            _, _, _, _, _, _, _, entry_count, directory_size, directory_offset = _ZIP64_END_RECORD.unpack_from(view, zip64_end_offset)
+        if directory_offset + directory_size > len(view):
+            raise zipfile.BadZipFile("Bad offset for central directory")
+
+        members = {}
+        offset = directory_offset
+        for _ in range(entry_count):
+            if offset + _CENTRAL_HEADER.size > len(view):
+                raise zipfile.BadZipFile("Truncated central directory")
+            (signature, _, _, flags, method, _, _, crc, compressed_size, size,
+             name_length, extra_length, comment_length, _, _, _, header_offset) = _CENTRAL_HEADER.unpack_from(view, offset)
+            if signature != _CENTRAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile("Bad magic number for central directory")
+            name_start = offset + _CENTRAL_HEADER.size
+            name = bytes(view[name_start:name_start+name_length]).decode('utf-8' if flags & 0x800 else 'cp437')
+            if _ZIP64_LIMIT in (compressed_size, size, header_offset):
+                size, compressed_size, header_offset = self._zip64_sizes(view, name_start + name_length, extra_length, size, compressed_size, header_offset)
+            members[name] = ODS_Member(name, method, flags, crc, compressed_size, size, header_offset)
+            offset = name_start + name_length + extra_length + comment_length
+        return members
+
+    def _zip64_sizes(self, view, extra_start, extra_length, size, compressed_size, header_offset) -> tuple:
+        # The values that did not fit into 32 bits are in the ZIP64 extra field, in this order
+        extra_end = extra_start + extra_length
+        while extra_start + 4 <= extra_end:
+            field_id, field_length = struct.unpack_from("<2H", view, extra_start)
+            if field_id == _ZIP64_EXTRA_ID:
+                values = iter(struct.unpack_from(f"<{field_length // 8}Q", view, extra_start + 4))
+                try:
+                    if size == _ZIP64_LIMIT:
+                        size = next(values)
+                    if compressed_size == _ZIP64_LIMIT:
+                        compressed_size = next(values)
+                    if header_offset == _ZIP64_LIMIT:
+                        header_offset = next(values)
+                except StopIteration:
+                    raise zipfile.BadZipFile("Corrupt ZIP64 extra field")
+                return size, compressed_size, header_offset
+            extra_start += 4 + field_length
+        raise zipfile.BadZipFile("Missing ZIP64 extra field")
+
+    def _member_data(self, member: ODS_Member) -> memoryview:
+        # The stored bytes of the member, a slice of the archive (no copy)
+        view = self._view
+        if member.header_offset + _LOCAL_HEADER.size > len(view):
+            raise zipfile.BadZipFile(f"Bad offset for the file {member.name}")
+        signature, _, _, _, _, _, _, _, _, name_length, extra_length = _LOCAL_HEADER.unpack_from(view, member.header_offset)
+        if signature != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile("Bad magic number for file header")
+        data_start = member.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+        if data_start + member.compressed_size > len(view):
+            raise zipfile.BadZipFile(f"Truncated file {member.name}")
+        return view[data_start:data_start+member.compressed_size]
+
+    def iter_member(self, name: str, chunk_size: int = MEMBER_CHUNK_SIZE):
+        """
+        Yields the content of the file name of the archive in chunks of at most chunk_size bytes,
+        decompressed as they are asked for. Stored files are handed out as slices of the archive.
+        The CRC-32 and the size are checked at the end.
+        """
+        member = self.members.get(name)
+        if member is None:
+            raise KeyError(f"There is no item named {name!r} in the archive")
+        if member.flags & _ENCRYPTED_FLAG:
+            raise NotImplementedError(f"ERROR: The file {name} of the archive is encrypted!")
+        if member.method not in (_STORED, _DEFLATED):
+            raise NotImplementedError(f"ERROR: The file {name} of the archive uses the unsupported compression method {member.method}!")
+
+        crc = 0
+        size = 0
+        with self._member_data(member) as data:
+            if member.method == _STORED:
+                for start in range(0, len(data), chunk_size):
+                    chunk = data[start:start+chunk_size]
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    yield chunk
+            else:
+                # zlib has no decompress into a given buffer, every chunk is a new bytes of at most
+                # chunk_size. Copying it into a reused bytearray would only add a copy, and callers
+                # could not keep a chunk
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                for start in range(0, len(data), _DEFLATE_INPUT_SIZE):
+                    with data[start:start+_DEFLATE_INPUT_SIZE] as compressed:
+                        pending = compressed
+                        while len(pending) > 0:
+                            chunk = decompressor.decompress(pending, chunk_size)
+                            pending = decompressor.unconsumed_tail
+                            if len(chunk) > 0:
+                                crc = zlib.crc32(chunk, crc)
+                                size += len(chunk)
+                                yield chunk
+                chunk = decompressor.flush()
+                if len(chunk) > 0:
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    yield chunk
+                if not decompressor.eof:
+                    raise zipfile.BadZipFile(f"Truncated file {name}")
+        if size != member.size:
+            raise zipfile.BadZipFile(f"Bad size for file {name!r}")
+        if crc != member.crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {name!r}")
+
+    def iter_content(self, chunk_size: int = MEMBER_CHUNK_SIZE):
+        # content.xml holds the sheets of the spreadsheet
+        return self.iter_member("content.xml", chunk_size)
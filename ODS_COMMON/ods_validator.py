@@ -1,221 +1,102 @@
-from datetime import datetime
+import contextlib
+import io
 import traceback
 import typing
-import math
+import itertools
+import operator
 from ODS_COMMON.ods_file import ODS_File
-from ODS_COMMON.ods_constants import DataEmptyWarning, DataEmptyError, ODS_Char_Data_Types, ODS_Data_Types, ODS_Column_Label_Lookup, AfterDecimalTooLong, BeforeDecimalTooLong, DataTooLong, ODS_Float_Data_Types, ODS_Integer_Data_Types, PossibleIssue, WrongDateFormat
+from ODS_COMMON.ods_constants import ODS_Data_Types, ODS_Engine
+from ODS_COMMON.ods_columnar import BLOCK_ROWS, ODS_Columnar_Engine
+from ODS_COMMON.ods_plan import ODS_Row_Context, ODS_Sheet_Plan, PREVIOUS_COLUMNS, WARNING_RESULTS, compile_type_checker, header_index, normalize_title, switch_columns
+from ODS_COMMON.ods_finding import ODS_Finding
+from ODS_COMMON.ods_profile import ODS_Profiler
+from ODS_COMMON.ods_parallel import PENDING_CHUNKS_PER_WORKER, ODS_Bounded_Submitter, create_validator_pool, submit_sheet
+from ODS_COMMON.ods_cache import SHEET_HOLD_ROWS, ODS_Result_Cache, ODS_Row_Spool, ODS_Sheet_Fingerprint, rules_fingerprint
+from ODS_COMMON.ods_schema import DEFAULT_SCHEMA_FILE, load_schema
+from ODS_COMMON.ods_sinks import ODS_Finding_Sink, ODS_Limited_Sink, ODS_Memory_Sink
 from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
 
+
+class ODS_Validation_Limits():
+    """
+    Where a validation run stops early, None for no limit. After max_sheet_errors errors the rest of
+    a sheet is skipped, after max_file_errors errors the rest of the file. With fail_fast_on_header
+    the rows of a sheet are not validated if its column titles do not match the template.
+    Each of them adds an error saying how much was skipped.
+    """
+    def __init__(self, max_sheet_errors: int = None, max_file_errors: int = None, fail_fast_on_header: bool = False):
+        for name, limit in (("max_sheet_errors", max_sheet_errors), ("max_file_errors", max_file_errors)):
+            if limit is not None and limit < 1:
+                raise ValueError(f"ERROR: {name} must be at least 1, but is {limit}!")
+        self.max_sheet_errors = max_sheet_errors
+        self.max_file_errors = max_file_errors
+        self.fail_fast_on_header = fail_fast_on_header
+
+    @property
+    def is_limited(self) -> bool:
+        return self.max_sheet_errors is not None or self.max_file_errors is not None or self.fail_fast_on_header
+
+    def __repr__(self):
+        # Part of the cache keys, the results of a run with limits are not the complete results
+        return f"ODS_Validation_Limits(max_sheet_errors={self.max_sheet_errors}, max_file_errors={self.max_file_errors}, fail_fast_on_header={self.fail_fast_on_header})"
+
+
 class ODS_Validator:
-    def __init__(self):
-        self.required_sheets = ["Other_Grants_V3", 
-                                "Other_Options_V3", 
-                                "Other_Acquisition_V3", 
-                                "Other_RestrictedSecurities_V3", 
-                                "Other_OtherBenefits_V3",
-                                "Other_Convertible_V3",
-                                "Other_Notional_V3",
-                                "Other_Enhancement_V3",
-                                "Other_Sold_V3",
-                                ]
-        self.required_columns = {
-            "Other_Grants_V3": {
-                0: {RCKeys.COLUMN_NAME:"1.\nDate of grant\n(yyyy-mm-dd)",RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME:"2.\nNumber of employees granted options", RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM6_TYPE, RCKeys.WARN_IF_BLANK: True},
-                2: {RCKeys.COLUMN_NAME:"3.\nUnrestricted market value of a security at date of grant\n£\ne.g. 10.1234",RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                3: {RCKeys.COLUMN_NAME:"4.\nNumber of securities over which options granted\ne.g. 100.00",RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-            },
-            "Other_Options_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\nyyyy-mm-dd',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM8_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.scheme_ref_num_validator},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance Number\n(if applicable)', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nDate of grant of option subject to the reportable event\nyyyy-mm-dd',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nGrantor company name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR120_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nGrantor company address line 1',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                11: {RCKeys.COLUMN_NAME: '12.\nGrantor company address line 2',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                12: {RCKeys.COLUMN_NAME: '13.\nGrantor company address line 3',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                13: {RCKeys.COLUMN_NAME: '14.\nGrantor company address line 4',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                14: {RCKeys.COLUMN_NAME: '15.\nGrantor company country',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                15: {RCKeys.COLUMN_NAME: '16.\nGrantor company postcode',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR8_TYPE, RCKeys.WARN_IF_BLANK: False},
-                16: {RCKeys.COLUMN_NAME: '17.\nGrantor Company Registration Number (CRN) , if applicable',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False},
-                17: {RCKeys.COLUMN_NAME: '18.\nGrantor company Corporation Tax reference, if applicable',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_corp_tax_ref},
-                18: {RCKeys.COLUMN_NAME: '19.\nGrantor company PAYE reference',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: False},
-                19: {RCKeys.COLUMN_NAME: '20.\nName of the company whose securities under option',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR120_TYPE, RCKeys.WARN_IF_BLANK: True},
-                20: {RCKeys.COLUMN_NAME: '21.\nCompany whose securities under option – Address line 1',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: True},
-                21: {RCKeys.COLUMN_NAME: '22.\nCompany whose securities under option – Address line 2',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                22: {RCKeys.COLUMN_NAME: '23.\nCompany whose securities under option – Address line 3',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                23: {RCKeys.COLUMN_NAME: '24.\nCompany whose securities under option – Address line 4',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                24: {RCKeys.COLUMN_NAME: '25.\nCompany whose securities under option – Country',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                25: {RCKeys.COLUMN_NAME: '26.\nCompany whose securities under option – Postcode',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR8_TYPE, RCKeys.WARN_IF_BLANK: False},
-                26: {RCKeys.COLUMN_NAME: '27.\nCompany Reference Number (CRN) of company whose securities under option',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False},
-                27: {RCKeys.COLUMN_NAME: '28.\nCorporation Tax reference of company whose securities under option',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_corp_tax_ref},
-                28: {RCKeys.COLUMN_NAME: '29.\nPAYE reference of company whose securities under option',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                29: {RCKeys.COLUMN_NAME: '30.\nWere the options exercised?\n(yes/no).\nIf yes go to next question\nIf no go to question 38',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                30: {RCKeys.COLUMN_NAME: '31.\nTotal number of securities employee entitled to on exercise of the option before any cashless exercise or other adjustment\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes},
-                31: {RCKeys.COLUMN_NAME: '32.\nIf consideration was given for the securities, the amount given per security\n£\ne.g. 10.1234',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes},
-                32: {RCKeys.COLUMN_NAME: '33.\nIf securities were acquired, Market Value (see note in guidance) of a security on the date of acquisition\n£\ne.g. 10.1234',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes},
-                33: {RCKeys.COLUMN_NAME: '34.\nIf shares were acquired, are the shares listed on a recognised stock exchange?\n(yes/no).\nIf yes go to question 37\nIf no go to next question',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes_and_this_is_yes_no},
-                34: {RCKeys.COLUMN_NAME: '35.\nIf shares were not listed on a recognised stock exchange, was valuation agreed with HMRC?\n(yes/no)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.no_35_special_validator},
-                35: {RCKeys.COLUMN_NAME: '36.\nIf yes, enter the HMRC reference given',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_HMRC_ref},
-                36: {RCKeys.COLUMN_NAME: '37.\nIf the shares were acquired,\ntotal deductible amount excluding\nany consideration given for the securities\n£\ne.g. 10.1234. Then go to question 40',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.no_37_special_validator},
-                37: {RCKeys.COLUMN_NAME: '38.\nIf securities were not acquired, was money or value received on the release, assignment, cancellation or lapse of the option?\n(yes/no)\nIf yes go to next question\nIf no, no further information required on this event.',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_30_answered_yes},
-                38: {RCKeys.COLUMN_NAME: '39.\nIf yes, amount of money or value received\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: False, RCKeys.SPECIAL_VALIDATOR: self.validate_amount_of_money_rx},
-                39: {RCKeys.COLUMN_NAME: '40.\nWas a NICs election or agreement operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                40: {RCKeys.COLUMN_NAME: '41.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                41: {RCKeys.COLUMN_NAME: '42.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_Acquisition_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM8_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nName of the company whose securities acquired',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR120_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nCompany whose securities acquired – Address line 1',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nCompany whose securities acquired – Address line 2',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                11: {RCKeys.COLUMN_NAME: '12.\nCompany whose securities acquired – Address line 3',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR27_TYPE, RCKeys.WARN_IF_BLANK: False},
-                12: {RCKeys.COLUMN_NAME: '13.\nCompany whose securities acquired – Address line 4',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                13: {RCKeys.COLUMN_NAME: '14.\nCompany whose securities acquired – Country',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR18_TYPE, RCKeys.WARN_IF_BLANK: False},
-                14: {RCKeys.COLUMN_NAME: '15.\nCompany whose securities acquired – Postcode',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR8_TYPE, RCKeys.WARN_IF_BLANK: False},
-                15: {RCKeys.COLUMN_NAME: '16.\nCompany Reference Number (CRN) of company whose securities acquired',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False},
-                16: {RCKeys.COLUMN_NAME: '17.\nCorporation Tax reference of company whose securities acquired',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: False},
-                17: {RCKeys.COLUMN_NAME: '18.\nPAYE reference of company whose securities acquired',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: False},
-                18: {RCKeys.COLUMN_NAME: '19.\nDescription of security. Enter a number from 1 to 9. Follow the link in cell A7 for a list of security types',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUMBER_TYPE, RCKeys.WARN_IF_BLANK: True,RCKeys.SPECIAL_VALIDATOR: self.validate_between_1_and_9},
-                19: {RCKeys.COLUMN_NAME: "20.\nIf the securities are not shares enter ' no' and go to question 24\nIf the securities are shares, are they part of the largest class of shares in the company?\n(yes/no)",RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                20: {RCKeys.COLUMN_NAME: '21.\nIf the securities are shares, are they listed on a recognised stock exchange?\n(yes/no)\nIf no go to question 22, If yes go to question 24',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes_and_this_is_yes_no},
-                21: {RCKeys.COLUMN_NAME: '22.\nIf shares were not listed on a recognised stock exchange, was valuation agreed with HMRC?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_previous_yes_no_was_yes_and_this_was_no_or_yes_if_prev_no},
-                22: {RCKeys.COLUMN_NAME: '23.\nIf yes, enter the HMRC reference given',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_HMRC_ref_Sheet_3},
-                23: {RCKeys.COLUMN_NAME: '24.\nNumber of securities acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                24: {RCKeys.COLUMN_NAME: '25.\nSecurity type. Enter a number from 1 to 3, (follow the link at cell A7 for a list of security types).\nIf restricted go to next question.\nIf convertible go to question 32.\nIf both restricted and convertible enter 1 and answer all questions 26 to 32.\nIf neither restricted nor convertible go to question 29.',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUMBER_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_between_1_and_3},
-                25: {RCKeys.COLUMN_NAME: '26.\nIf restricted, nature of restriction. Enter a number from 1-3, follow the link at cell A7 for a list of restrictions',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUMBER_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_nature_of_restriction},
-                26: {RCKeys.COLUMN_NAME: '27.\nIf restricted, length of time of restriction in years (if less than a whole year, enter as a decimal fraction, for example 0.6)', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM6V2_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_length_of_restriction},
-                27: {RCKeys.COLUMN_NAME: '28.\nIf restricted, actual market value per security at date of acquisition\n£\ne.g. 10.1234\n(no entry should be made if an election to disregard ALL restrictions is operated)', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_restricted_market_val_per_security},
-                28: {RCKeys.COLUMN_NAME: '29.\nUnrestricted market value per security at date of acquisition\n£\ne.g. 10.1234', RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_unrestricted_market_val_per_security},
-                29: {RCKeys.COLUMN_NAME: '30.\nIf restricted, has an election been operated to disregard restrictions?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_election_happened_answer},
-                30: {RCKeys.COLUMN_NAME: '31.\nIf an election has been operated to disregard restrictions, have all or some been disregarded?\n(enter all or some)' ,RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_some_or_all},
-                31: {RCKeys.COLUMN_NAME: '32.\nIf convertible, market value per security ignoring conversion rights\n£\ne.g. 10.1234' ,RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_market_value_per_share_convertible},
-                32: {RCKeys.COLUMN_NAME: '33.\nTotal price paid for the securities\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                33: {RCKeys.COLUMN_NAME: '34.\nWas the price paid in pounds sterling?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                34: {RCKeys.COLUMN_NAME: "35.\nWas there an artificial reduction in value on acquisition?\n(yes/no)\nIf 'yes' go to question 36, if 'No' go to question 37",RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                35: {RCKeys.COLUMN_NAME: '36.\nIf there was an artificial reduction in value, nature of the artificial reduction\nEnter a number from 1 to 3. Follow the link in cell A7 for a list of types of artificial restriction',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUMBER_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_nature_of_artifical_reduction},
-                36: {RCKeys.COLUMN_NAME: '37.\nWere shares acquired under an employee shareholder arrangement?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                37: {RCKeys.COLUMN_NAME: '38.\nIf shares were acquired under an employee shareholder arrangement, was the total actual market value (AMV) of shares £2,000 or more?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_Other_Acquisition_V3_38},
-                38: {RCKeys.COLUMN_NAME: '39.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True},
-                39: {RCKeys.COLUMN_NAME: '40.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_RestrictedSecurities_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM8_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance Number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nDate securities originally acquired\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nNumber of securities originally acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nFor disposals or lifting of restrictions, total chargeable amount\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME: '12.\nFor lifting of restrictions, are the shares listed on a recognised stock exchange?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                12: {RCKeys.COLUMN_NAME: '13.\nIf shares were not listed on a recognised stock exchange, was valuation agreed with HMRC?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_valuation_agreed_wtih_hmrc},
-                13: {RCKeys.COLUMN_NAME: '14.\nIf yes, enter the HMRC reference given',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR10_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_hmrc_ref_given},
-                14: {RCKeys.COLUMN_NAME: '15.\nFor variations, date of variation\n(yyyy-mm-dd)',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: False},
-                15: {RCKeys.COLUMN_NAME: '16.\nFor variations, Actual Market Value (AMV) per security directly before variation\n£\ne.g. 10.1234',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                16: {RCKeys.COLUMN_NAME: '17.\nFor variations, Actual Market Value (AMV) per security directly after variation\n£\ne.g. 10.1234\n',RCKeys.REQUIRED: False, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                17: {RCKeys.COLUMN_NAME: '18.\nHas a National Insurance Contribution election or agreement been operated (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                18: {RCKeys.COLUMN_NAME: '19.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                19: {RCKeys.COLUMN_NAME: '20.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_OtherBenefits_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nDate securities originally acquired\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nNumber of securities originally acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nAmount or market value of the benefit\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME: '12.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                12: {RCKeys.COLUMN_NAME: '13.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_Convertible_V3": {
-                0: {RCKeys.COLUMN_NAME:'1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME:'2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME:'3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME:'4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME:'5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME:'6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME:'7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME:'8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME:'9.\nDate securities originally acquired\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME:'10.\nNumber of securities originally acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME:'11.\nFor receipt of money or value, enter amount or market value of the benefit\n£\ne.g. 10.1234\nThen go to question 14',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME:'12.\nFor conversion, disposal or release of entitlement to convert, total chargeable amount\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                12: {RCKeys.COLUMN_NAME:'13.\nHas a National Insurance Contribution election or agreement been operated (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                13: {RCKeys.COLUMN_NAME:'14.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                14: {RCKeys.COLUMN_NAME:'15.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK? (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_Notional_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nDate securities originally acquired\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nNumber of securities originally acquired\ne.g 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nAmount of notional loan discharged\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME: '12.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                12: {RCKeys.COLUMN_NAME: '13.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK? (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-
-            },
-            "Other_Enhancement_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nDate securities originally acquired\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nNumber of securities originally acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nTotal unrestricted market value (UMV) on 5th April or date of disposal if earlier\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME: '12.\nTotal UMV ignoring effect of artificial increase on date of taxable event\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                12: {RCKeys.COLUMN_NAME: '13.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                13: {RCKeys.COLUMN_NAME: '14.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK? (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            },
-            "Other_Sold_V3": {
-                0: {RCKeys.COLUMN_NAME: '1.\nDate of event\n(yyyy-mm-dd)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.DATE_TYPE, RCKeys.WARN_IF_BLANK: True},
-                1: {RCKeys.COLUMN_NAME: '2.\nIs the event in relation to a disclosable tax avoidance scheme?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                2: {RCKeys.COLUMN_NAME: '3.\nIf yes, enter the eight-digit scheme reference number (SRN)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_srn},
-                3: {RCKeys.COLUMN_NAME: '4.\nEmployee first name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                4: {RCKeys.COLUMN_NAME: '5.\nEmployee second name\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: False},
-                5: {RCKeys.COLUMN_NAME: '6.\nEmployee last name',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR35_TYPE, RCKeys.WARN_IF_BLANK: True},
-                6: {RCKeys.COLUMN_NAME: '7.\nNational Insurance number\n(if applicable)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR9_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_NINO},
-                7: {RCKeys.COLUMN_NAME: '8.\nPAYE reference of employing company',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR14_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_paye_ref},
-                8: {RCKeys.COLUMN_NAME: '9.\nNumber of securities originally acquired\ne.g. 100.00',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM11V2_TYPE, RCKeys.WARN_IF_BLANK: True},
-                9: {RCKeys.COLUMN_NAME: '10.\nAmount received on disposal\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                10: {RCKeys.COLUMN_NAME: '11.\nTotal market value on disposal\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                11: {RCKeys.COLUMN_NAME: '12.\nExpenses incurred\n£\ne.g. 10.1234',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.NUM13V4_TYPE, RCKeys.WARN_IF_BLANK: True},
-                12: {RCKeys.COLUMN_NAME: '13.\nWas PAYE operated?\n(yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-                13: {RCKeys.COLUMN_NAME: '14.\nWas any adjustment made for amounts subject to apportionment for residence or duties outside the UK? (yes/no)',RCKeys.REQUIRED: True, RCKeys.DATA_TYPE: ODS_Data_Types.CHAR3_TYPE, RCKeys.WARN_IF_BLANK: True, RCKeys.SPECIAL_VALIDATOR: self.validate_yes_no},
-            }
-        }
+    def __init__(self, engine: ODS_Engine = ODS_Engine.SCALAR, schema_file: str = DEFAULT_SCHEMA_FILE):
+        # The sheets and columns of the template are read from a schema file, see ods_schema.py.
+        # The rule tables are only built on first use, see _load_rules
+        self.schema_file = schema_file
+        self._required_sheets = None
+        self._required_columns = None
+        self._column_title_index = None
+        # Compiled ODS_Sheet_Plan per sheet name, see _get_sheet_plan
+        self._sheet_plans = {}
+        # The columnar engine needs numpy, so it is only created when asked for
+        self.engine = ODS_Engine(engine)
+        self._columnar_engine = ODS_Columnar_Engine(self.column_title_index) if self.engine == ODS_Engine.COLUMNAR else None
+        # Hash of the rule set for the result cache, see rules_fingerprint
+        self._rules_fingerprint = None
+
+    def _load_rules(self):
+        schema = load_schema(self.schema_file)
+        self._required_sheets = schema.required_sheets
         # Column titles are stored in row 9 of the spreadsheets
-        self.column_title_index = 8
+        self._column_title_index = schema.column_title_index
+        self._required_columns = schema.required_columns(self)
+
+    def warm_up(self):
+        """
+        Load the rules, compile the plans of all the required sheets and validate an empty row of
+        each, so the first file does not pay for what is built on first use (e.g. in the workers
+        of a long running service).
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            for sheet_name in self.required_sheets:
+                required_columns = self.required_columns.get(sheet_name)
+                if not required_columns:
+                    continue
+                column_names = [''] * (max(required_columns) + 1)
+                for required_col_index, required_col_data in required_columns.items():
+                    column_names[required_col_index] = required_col_data[RCKeys.COLUMN_NAME]
+                self._validate_sheet_columns(sheet_name, [(self.column_title_index, column_names), (self.column_title_index + 1, [''] * len(column_names))])
+
+    @property
+    def required_sheets(self) -> list:
+        if self._required_sheets is None:
+            self._load_rules()
+        return self._required_sheets
+
+    @property
+    def required_columns(self) -> dict:
+        if self._required_columns is None:
+            self._load_rules()
+        return self._required_columns
+
+    @property
+    def column_title_index(self) -> int:
+        if self._column_title_index is None:
+            self._load_rules()
+        return self._column_title_index
 
     # =========================================================================
     # Custom validators
@@ -383,30 +264,33 @@ class ODS_Validator:
     #         err_msg = "Failed to run \"ensure_no_spaces\"!"
     #     return err_msg, warn_msg
 
-    def validate_amount_of_money_rx(self, current_index, row_data, col_validator_data) -> typing.Tuple[list, list]:
+    @switch_columns(37)
+    def validate_amount_of_money_rx(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[list, list]:
         err_msg = ''
         warn_msg = ''
         try:
             # If entry 38 )37 index) was anserwed yes, validate this, else make sure it was blank
-            if len(str(row_data[37])) > 0 and str(row_data[37]).lower() == 'yes':
+            switch = row_context.switch(37) if row_context is not None else str(row_data[37]).lower()
+            if len(switch) > 0 and switch == 'yes':
                 err_msg, warn_msg = self._check_data_type(row_data[current_index], col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
-            elif len(str(row_data[37])) > 0 and len(str(row_data[current_index])) > 0:
+            elif len(switch) > 0 and len(str(row_data[current_index])) > 0:
                 err_msg = "There was a value provided but entry 38 was left blank!"
         except Exception as e:
             print(f"Unexpected Error: (validate_amount_of_money_rx). {e}. {str(traceback.format_exc())}")
         return err_msg, warn_msg
 
 
-    def validate_previous_yes_no_was_yes(self, current_index, row_data, col_validator_data) -> typing.Tuple[list, list]:
+    @switch_columns(PREVIOUS_COLUMNS)
+    def validate_previous_yes_no_was_yes(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[list, list]:
         err_msg = ''
         warn_msg = ''
 
         # Check the previous values for a yes value
         try:
-            for prev_col_value in row_data[current_index-1::-1]:
-                if type(prev_col_value) == str and prev_col_value.lower() == "yes":
-                    err_msg, warn_msg = self._check_data_type(row_data[current_index], col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
-                    break
+            if row_context is None:
+                row_context = ODS_Row_Context(row_data)
+            if row_context.nearest_previous_yes(current_index) >= 0:
+                err_msg, warn_msg = self._check_data_type(row_data[current_index], col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
             else:
                 # Since no yes value was found, ensure this is empty
                 if len(str(row_data[current_index])) > 0:
@@ -415,16 +299,17 @@ class ODS_Validator:
             print(f"Unexpected Error: (validate_previous_yes_no_was_yes). {e}. {str(traceback.format_exc())}")
         return err_msg, warn_msg
 
-    def validate_previous_yes_no_was_yes_and_this_is_yes_no(self, current_index, row_data, col_validator_data) -> typing.Tuple[str, str]:
+    @switch_columns(PREVIOUS_COLUMNS)
+    def validate_previous_yes_no_was_yes_and_this_is_yes_no(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[str, str]:
         err_msg = ''
         warn_msg = ''
 
         # Check the previous values for a yes value
         try:
-            for prev_col_value in row_data[current_index-1::-1]:
-                if type(prev_col_value) == str and prev_col_value.lower() == "yes":
-                    err_msg, warn_msg = self._check_data_type(row_data[current_index], col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
-                    break
+            if row_context is None:
+                row_context = ODS_Row_Context(row_data)
+            if row_context.nearest_previous_yes(current_index) >= 0:
+                err_msg, warn_msg = self._check_data_type(row_data[current_index], col_validator_data[RCKeys.DATA_TYPE], col_validator_data[RCKeys.WARN_IF_BLANK], col_validator_data[RCKeys.REQUIRED])
             else:
                 # Since no yes value was found, ensure this is empty
                 if len(str(row_data[current_index])) > 0:
@@ -589,11 +474,12 @@ class ODS_Validator:
             print(f"Unexpected error: (validate_market_value_per_share_convertible). {e}")
         return err_msg, warn_msg
 
-    def validate_nature_of_artifical_reduction(self, current_index, row_data, col_validator_data) -> typing.Tuple[str, str]:
+    @switch_columns(34)
+    def validate_nature_of_artifical_reduction(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[str, str]:
         err_msg = ''
         warn_msg = ''
         try:
-            if str(row_data[34]).lower() == "yes":
+            if (row_context.switch(34) if row_context is not None else str(row_data[34]).lower()) == "yes":
                 val = int(row_data[current_index])
                 if val < 1 or val > 3:
                     err_msg = f"The entry must be a number greater than or equal to 1 and less than or equal to 3! Provided value was {val}"
@@ -606,11 +492,12 @@ class ODS_Validator:
             print(f"Unexpected error: (validate_nature_of_artifical_reduction). {e}")
         return err_msg, warn_msg
 
-    def validate_valuation_agreed_wtih_hmrc(self, current_index, row_data, col_validator_data) -> typing.Tuple[str, str]:
+    @switch_columns(11)
+    def validate_valuation_agreed_wtih_hmrc(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[str, str]:
         err_msg = ''
         warn_msg = ''
         try:
-            if str(row_data[11]).lower() == "no":
+            if (row_context.switch(11) if row_context is not None else str(row_data[11]).lower()) == "no":
                 if len(str(row_data[current_index])) > 0:
                     err_msg ="Because Number 12 has been answered no, this column should be answered."
                 else:
@@ -619,11 +506,12 @@ class ODS_Validator:
             print(f"Unexpected error: (validate_valuation_agreed_wtih_hmrc). {e}")
         return err_msg, warn_msg
 
-    def validate_hmrc_ref_given(self, current_index, row_data, col_validator_data) -> typing.Tuple[str, str]:
+    @switch_columns(11)
+    def validate_hmrc_ref_given(self, current_index, row_data, col_validator_data, row_context: ODS_Row_Context = None) -> typing.Tuple[str, str]:
         err_msg = ''
         warn_msg = ''
         try:
-            if str(row_data[11]).lower() == "no":
+            if (row_context.switch(11) if row_context is not None else str(row_data[11]).lower()) == "no":
                 if len(str(row_data[current_index])) > 0:
                     err_msg ="Because Number 12 has been answered no, this column should be answered."
                 else:
@@ -649,76 +537,365 @@ class ODS_Validator:
     # =========================================================================
 
 
-    def validate_file(self, ods_file):
+    def validate_file(self, ods_file, workers: int = 1, cache: ODS_Result_Cache = None, error_sink: ODS_Finding_Sink = None, warning_sink: ODS_Finding_Sink = None,
+                      limits: ODS_Validation_Limits = None, profiler: ODS_Profiler = None, chunk_rows: int = None):
+        """
+        Validate the file and push the findings to error_sink and warning_sink as they are found,
+        by default ods_file.error_strings and ods_file.warning_strings (see ods_sinks.py).
+        With workers > 1 the sheets are validated in parallel on a pool of that many processes, large
+        sheets in chunks of chunk_rows rows (if None growing up to ods_parallel.CHUNK_ROWS, 0 for whole sheets), sent
+        while the file is read.
+        If a cache is given and it holds the results of the same file content and rules, these are
+        used without reading the file. Otherwise the results of the sheets whose rows did not change
+        are taken from it, see _validate_cached_sheet.
+        limits stops the validation early, see ODS_Validation_Limits.
+        profiler records the time of the steps of the validation, see ODS_Profiler.
+        """
+        if not isinstance(ods_file, ODS_File):
+            raise TypeError(f"ERROR: The passed object was of type {type(ods_file)}, expected ODS_File!")
+        if profiler is None:
+            self._validate_file(ods_file, workers, cache, error_sink, warning_sink, limits, chunk_rows=chunk_rows)
+            return
+        profiler.attach(self)
+        try:
+            with profiler.profile_file(ods_file.file_name):
+                self._validate_file(ods_file, workers, cache, error_sink, warning_sink, limits, profiler, chunk_rows=chunk_rows)
+        finally:
+            profiler.detach(self)
+
+    async def validate_file_async(self, ods_file, workers: int = 1, cache: ODS_Result_Cache = None, limits: ODS_Validation_Limits = None,
+                                  timeout: float = None, executor=None, limiter=None, chunk_rows: int = None):
+        """
+        Validate the file without blocking the event loop and yield (severity, finding) as the
+        findings of each sheet come in, severity is ods_async.ERROR or ods_async.WARNING:
+
+            async for severity, finding in validator.validate_file_async(ods_file, timeout=60):
+                ...
+
+        The file is read and validated in executor, the default executor of the loop if None. With
+        workers > 1 the sheets are validated on a pool of processes as in validate_file (see
+        chunk_rows), so the thread of the executor mostly reads the file. Cancelling the task, leaving the loop early or
+        passing timeout seconds (asyncio.TimeoutError) stops the validation at the next row or
+        finding. limiter, e.g. an asyncio.Semaphore shared by the uploads, limits how many files are
+        validated at the same time, see ods_async.validate_files_async.
+        """
         if not isinstance(ods_file, ODS_File):
             raise TypeError(f"ERROR: The passed object was of type {type(ods_file)}, expected ODS_File!")
-        # Retrieve all data from the sheet
-        ods_file_data = ods_file.get_data()
+        # asyncio is only imported when it is used
+        from ODS_COMMON.ods_async import iter_findings_async
+        async for severity, finding in iter_findings_async(self, ods_file, workers, cache, limits, timeout, executor, limiter, chunk_rows):
+            yield severity, finding
+
+    def _validate_file(self, ods_file, workers, cache, error_sink, warning_sink, limits, profiler=None, cancelled=None, chunk_rows=None):
+        if error_sink is None:
+            error_sink = ODS_Memory_Sink(ods_file.error_strings)
+        if warning_sink is None:
+            warning_sink = ODS_Memory_Sink(ods_file.warning_strings)
+        if limits is not None and not limits.is_limited:
+            limits = None
+        cache_key = None
+        if cache is not None:
+            fingerprint = self._cache_fingerprint(limits)
+            if ods_file.read_options:
+                fingerprint = f"{fingerprint}:{ods_file.read_options}"
+            cache_key = cache.key(ods_file.source, fingerprint)
+            cached_results = cache.get(cache_key)
+            if cached_results is not None:
+                error_sink.extend(cached_results[0])
+                warning_sink.extend(cached_results[1])
+                return
+        # Stream the rows of the required sheets, one row at a time. The other sheets are only listed
+        ods_file_rows = ods_file.iter_rows(self.required_sheets, self.column_title_index + 1)
+        if profiler is not None:
+            ods_file_rows = profiler.timed_rows(ods_file_rows)
+        if cancelled is not None:
+            from ODS_COMMON.ods_async import cancellable_rows
+            ods_file_rows = cancellable_rows(ods_file_rows, cancelled)
+
+        # The cache stores the complete lists, else the findings go straight to the sinks
+        err_msg_list = [] if cache is not None else error_sink
+        warn_msg_list = [] if cache is not None else warning_sink
 
         # 1) Validate the name and the position of the sheets
         try:
-            err_msg_list = ''
-            warn_msg_list = ''
-            err_msg_list, warn_msg_list = self._validate_sheet_index_and_names(ods_file_data)
+            if workers is not None and workers > 1:
+                executor = create_validator_pool(workers, type(self), self.engine, self.schema_file)
+                try:
+                    # The reading waits for the workers, so the rows of a large file are not all queued at once
+                    submitter = ODS_Bounded_Submitter(executor, PENDING_CHUNKS_PER_WORKER * workers, cancelled)
+                    self._validate_sheet_index_and_names(ods_file_rows, submitter, cache, err_msg_list, warn_msg_list, limits, chunk_rows, cancelled)
+                except BaseException:
+                    # Cancelled, timed out or failed: drop the chunks that were not started instead of waiting for them
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                executor.shutdown()
+            else:
+                self._validate_sheet_index_and_names(ods_file_rows, cache=cache, error_msg_list=err_msg_list, warn_msg_list=warn_msg_list, limits=limits)
         except Exception as e:
+            if cancelled is not None and cancelled.is_set():
+                # The async validation was stopped, see ods_async.py
+                raise
             print(f"ERROR: Failed to validate the file data. {e} | {str(traceback.format_exc())}")
+            # Never cache the results of a validation that did not finish
+            cache_key = None
 
-        ods_file.error_strings += err_msg_list
-        ods_file.warning_strings += warn_msg_list
-
-    def _validate_sheet_index_and_names(self, ods_file_data) -> typing.Tuple[list, list]:
-        ods_file_sheets = [key for key in ods_file_data]
-        error_msg_list = []
-        warn_msg_list = []
-        for index, sheet_name in enumerate(self.required_sheets):
-            if sheet_name not in ods_file_sheets:
-                error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"The sheet \"{sheet_name}\" is missing!",
-                    }
-                error_msg_list.append(error_dict)
-                continue
-            # Check the index
+        if cache is not None:
+            error_sink.extend(err_msg_list)
+            warning_sink.extend(warn_msg_list)
+        if cache_key is not None:
             try:
-                if ods_file_sheets[index] != sheet_name:
-                    error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"The sheet \"{sheet_name}\" is not at the required index {index+1}!",
-                    }
-                    error_msg_list.append(error_dict)
-            except IndexError as _:
-                error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"The sheet ({sheet_name}) should be at index ({index+1}), but this document does not contain enough sheets to reach this value!",
-                    }
-                error_msg_list.append(error_dict)
+                cache.put(cache_key, err_msg_list, warn_msg_list)
             except Exception as e:
-                print(f"Unknown Error: (_validate_sheet_index_and_names) {e}")
+                print(f"WARNING: Failed to store the results in the cache. {e}")
+
+    @property
+    def rules_fingerprint(self) -> str:
+        if self._rules_fingerprint is None:
+            self._rules_fingerprint = rules_fingerprint(self.required_sheets, self.required_columns, self.column_title_index)
+        return self._rules_fingerprint
+
+    def _cache_fingerprint(self, limits: ODS_Validation_Limits = None) -> str:
+        if limits is None:
+            return self.rules_fingerprint
+        return f"{self.rules_fingerprint}:{limits!r}"
 
-            # Validate the columns in this sheet
-            erro_list, warn_list = self._validate_sheet_columns(sheet_name, ods_file_data[sheet_name])
+    def _validate_sheet_index_and_names(self, ods_file_rows, executor=None, cache: ODS_Result_Cache = None, error_msg_list=None, warn_msg_list=None,
+                                        limits: ODS_Validation_Limits = None, chunk_rows: int = None, cancelled=None) -> typing.Tuple[list, list]:
+        """
+        ods_file_rows yields (sheet_name, row_index, row_values) in document order. Each required
+        sheet is validated while its rows stream past, the results are reported in the order of
+        self.required_sheets. If an executor from create_validator_pool is given the rows of each
+        sheet are sent to it in chunks of chunk_rows rows while they are read and validated in
+        parallel (see ods_parallel.submit_sheet). If a cache is given the results of a sheet with the same rows are taken from it.
+        The findings are added to error_msg_list and warn_msg_list (lists or an ODS_Finding_Sink).
+        Without an executor or a cache the sheets that come in the required order are reported while
+        they are validated, only the findings of the other sheets are held until the end of the file.
+        Once limits.max_file_errors errors were reported the remaining sheets are skipped. Sheets that
+        were already sent to the executor are validated completely, only their errors are dropped.
+        The waits for the executor raise ods_async.ODS_Validation_Cancelled once the threading.Event
+        cancelled is set.
+        """
+        if error_msg_list is None:
+            error_msg_list = []
+        if warn_msg_list is None:
+            warn_msg_list = []
+        file_errors = error_msg_list
+        if limits is not None and limits.max_file_errors is not None:
+            file_errors = ODS_Limited_Sink(error_msg_list, limits.max_file_errors)
+        ods_file_sheets = []
+        sheet_results = {}
+        sheet_cache_keys = {}
+        # Number of required sheets that were reported already
+        reported_sheets = 0
+        try:
+            for sheet_name, sheet_rows in itertools.groupby(ods_file_rows, key=operator.itemgetter(0)):
+                if file_errors is not error_msg_list and file_errors.full:
+                    # Nothing more can be reported, so stop reading the file
+                    break
+                if sheet_name in ods_file_sheets:
+                    continue
+                ods_file_sheets.append(sheet_name)
+                if sheet_name in self.required_columns:
+                    sheet_rows = ((row_index, row_data) for _, row_index, row_data in sheet_rows)
+                    if executor is None and cache is None and reported_sheets < len(self.required_sheets) and sheet_name == self.required_sheets[reported_sheets]:
+                        # All the required sheets before this one were reported, so its findings can go straight out
+                        self._validate_sheet_position(reported_sheets, sheet_name, ods_file_sheets, file_errors)
+                        self._validate_sheet_columns(sheet_name, sheet_rows, file_errors, warn_msg_list, limits)
+                        reported_sheets += 1
+                        continue
+                    # The rows above the column titles and the empty rows are never looked at, so do not send or hash them
+                    sheet_rows = (row for row in sheet_rows if row[0] == self.column_title_index or (row[0] > self.column_title_index and len(row[1]) > 0))
+                    if cache is not None:
+                        sheet_results[sheet_name], sheet_cache_key = self._validate_cached_sheet(sheet_name, sheet_rows, executor, cache, limits, chunk_rows)
+                        if sheet_cache_key is not None:
+                            sheet_cache_keys[sheet_name] = sheet_cache_key
+                    elif executor is None:
+                        sheet_results[sheet_name] = self._validate_sheet_columns(sheet_name, sheet_rows, limits=limits)
+                    else:
+                        sheet_results[sheet_name] = submit_sheet(executor, sheet_name, sheet_rows, limits, chunk_rows)
+
+            skipped_sheets = []
+            for index in range(reported_sheets, len(self.required_sheets)):
+                sheet_name = self.required_sheets[index]
+                if file_errors is not error_msg_list and file_errors.full:
+                    skipped_sheets.append(sheet_name)
+                    if sheet_name in sheet_results and not isinstance(sheet_results[sheet_name], tuple):
+                        sheet_results[sheet_name].cancel()
+                    continue
+                if sheet_name not in ods_file_sheets:
+                    error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"The sheet \"{sheet_name}\" is missing!")
+                    file_errors.append(error_finding)
+                    continue
+                self._validate_sheet_position(index, sheet_name, ods_file_sheets, file_errors)
 
-            error_msg_list += erro_list
-            warn_msg_list += warn_list
+                # Add the results of the columns in this sheet
+                if isinstance(sheet_results[sheet_name], tuple):
+                    erro_list, warn_list = sheet_results[sheet_name]
+                else:
+                    # The ODS_Chunked_Result of submit_sheet
+                    erro_list, warn_list = sheet_results[sheet_name].result(cancelled)
+                if sheet_name in sheet_cache_keys:
+                    try:
+                        cache.put(sheet_cache_keys[sheet_name], erro_list, warn_list)
+                    except Exception as e:
+                        print(f"WARNING: Failed to store the results of the sheet {sheet_name} in the cache. {e}")
+
+                file_errors.extend(erro_list)
+                warn_msg_list.extend(warn_list)
+        finally:
+            # A failed sheet, a cancel or a timeout leaves the other results unread: drop their chunks
+            # that were not started. A no-op for the results that were read
+            for results in sheet_results.values():
+                if not isinstance(results, tuple):
+                    results.cancel()
+
+        if file_errors is not error_msg_list and (skipped_sheets or file_errors.dropped):
+            # Past the limit, so it is always reported
+            error_msg_list.append(self._summary_error('N/A', f"Stopped validating the file after {file_errors.max_findings} errors. {file_errors.dropped} more errors were not reported and {len(skipped_sheets)} sheets were not validated ({', '.join(skipped_sheets)})."))
 
         return error_msg_list, warn_msg_list
 
-    def _validate_sheet_columns(self, sheet_name, ods_sheet_data) -> typing.Tuple[list, list]:
-        error_msg_list = []
-        warn_msg_list = []
+    def _validate_cached_sheet(self, sheet_name, sheet_rows, executor, cache: ODS_Result_Cache, limits: ODS_Validation_Limits = None,
+                               chunk_rows: int = None) -> tuple:
+        """
+        Validate the rows of the sheet, inline or on executor, unless cache holds the results of the
+        same rows. The rows are hashed while they stream past (see ODS_Sheet_Fingerprint) and held
+        until the sheet ends, so it is looked up before it is validated: up to SHEET_HOLD_ROWS rows
+        in memory, the rows of a longer sheet in an ODS_Row_Spool.
+        Returns the results (a tuple or an ODS_Chunked_Result) and the cache key to store them
+        under, None if they came from the cache.
+        """
+        fingerprint = ODS_Sheet_Fingerprint()
+        sheet_rows = fingerprint.hashed(sheet_rows)
+        held_rows = list(itertools.islice(sheet_rows, SHEET_HOLD_ROWS))
+        spool = None
+        if len(held_rows) == SHEET_HOLD_ROWS:
+            spool = ODS_Row_Spool(itertools.chain(held_rows, sheet_rows))
+            held_rows = None
+        sheet_cache_key = cache.sheet_key(sheet_name, fingerprint.hexdigest(), self._cache_fingerprint(limits))
+        cached_results = cache.get(sheet_cache_key)
+        if cached_results is not None:
+            if spool is not None:
+                spool.close()
+            return cached_results, None
+        sheet_rows = held_rows if spool is None else spool.rows()
+        if executor is None:
+            return self._validate_sheet_columns(sheet_name, sheet_rows, limits=limits), sheet_cache_key
+        return submit_sheet(executor, sheet_name, sheet_rows, limits, chunk_rows), sheet_cache_key
+
+    def _summary_error(self, sheet_name, message) -> ODS_Finding:
+        # Says how much was skipped when a limit of ODS_Validation_Limits was reached
+        return ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', message)
+
+    def _validate_sheet_position(self, index, sheet_name, ods_file_sheets, error_msg_list):
+        # Check the index
+        try:
+            if ods_file_sheets[index] != sheet_name:
+                error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"The sheet \"{sheet_name}\" is not at the required index {index+1}!")
+                error_msg_list.append(error_finding)
+        except IndexError as _:
+            error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"The sheet ({sheet_name}) should be at index ({index+1}), but this document does not contain enough sheets to reach this value!")
+            error_msg_list.append(error_finding)
+        except Exception as e:
+            print(f"Unknown Error: (_validate_sheet_index_and_names) {e}")
+
+    def _validate_sheet_columns(self, sheet_name, ods_sheet_rows, error_msg_list=None, warn_msg_list=None, limits: ODS_Validation_Limits = None) -> typing.Tuple[list, list]:
+        """
+        ods_sheet_rows yields (row_index, row_data) for the rows of a single sheet. The findings are
+        added to error_msg_list and warn_msg_list, new lists if they are not given.
+        The rows are no longer validated once limits.max_sheet_errors errors were found, or the limit
+        of error_msg_list if it is an ODS_Limited_Sink, or if the column titles do not match and
+        limits.fail_fast_on_header is set.
+        """
+        if error_msg_list is None:
+            error_msg_list = []
+        if warn_msg_list is None:
+            warn_msg_list = []
+        # A list when the rows were sent to a worker, the rest is counted when a limit is reached
+        ods_sheet_rows = iter(ods_sheet_rows)
+        sheet_errors = error_msg_list
+        if limits is not None and limits.max_sheet_errors is not None:
+            sheet_errors = ODS_Limited_Sink(error_msg_list, limits.max_sheet_errors)
+        limited = isinstance(sheet_errors, ODS_Limited_Sink)
+        # The number of rows left out when the validation of the sheet stopped early
+        skipped_rows = None
         required_columns = self.required_columns[sheet_name]
-        # Row 9 contains the column names. 
-        column_names = ods_sheet_data[self.column_title_index]
+        plan = self._get_sheet_plan(sheet_name)
+        # Row 9 contains the column names.
+        column_names = None
+        # The data rows are collected in blocks for the columnar engine, else validated as they stream past
+        data_rows = [] if self._columnar_engine is not None else None
+        for sheet_row_index, sheet_row_data in ods_sheet_rows:
+            if sheet_row_index < self.column_title_index:
+                continue
+            if column_names is None:
+                # The title row may have been part of a block of empty rows
+                column_names = sheet_row_data if sheet_row_index == self.column_title_index else []
+                header_errors = []
+                self._validate_column_names(sheet_name, required_columns, column_names, header_errors)
+                sheet_errors.extend(header_errors)
+                if header_errors and limits is not None and limits.fail_fast_on_header:
+                    skipped_rows = self._count_data_rows(ods_sheet_rows)
+                    if sheet_row_index > self.column_title_index and len(sheet_row_data) > 0:
+                        skipped_rows += 1
+                    error_msg_list.append(self._summary_error(sheet_name, f"The column titles do not match the template, so the {skipped_rows} rows of the sheet were not validated."))
+                    return error_msg_list,warn_msg_list
+                if sheet_row_index == self.column_title_index:
+                    continue
+            if len(sheet_row_data) == 0:
+                # Empty rows, e.g. the formatted rows at the end of the sheet, have nothing to validate
+                continue
+            if limited and sheet_errors.full:
+                # This row and the ones after it
+                skipped_rows = 1 + self._count_data_rows(ods_sheet_rows)
+                break
+            if data_rows is None:
+                self._validate_row(plan, sheet_row_index - self.column_title_index - 1, sheet_row_data, sheet_errors, warn_msg_list)
+            else:
+                data_rows.append((sheet_row_index - self.column_title_index - 1, sheet_row_data))
+                if len(data_rows) == BLOCK_ROWS:
+                    self._columnar_engine.validate_rows(plan, data_rows, self._validate_row, sheet_errors, warn_msg_list)
+                    data_rows = []
+
+        if column_names is None:
+            raise IndexError(f"The sheet ({sheet_name}) ends before the column titles in row {self.column_title_index+1}")
+        if data_rows is not None:
+            self._columnar_engine.validate_rows(plan, data_rows, self._validate_row, sheet_errors, warn_msg_list)
+
+        # At the limit of the file (error_msg_list) the summary of the file says what was skipped
+        if sheet_errors is not error_msg_list and sheet_errors.count >= sheet_errors.max_findings and (skipped_rows is not None or sheet_errors.dropped):
+            error_msg_list.append(self._summary_error(sheet_name, f"Stopped validating the sheet after {sheet_errors.max_findings} errors. {skipped_rows or 0} more rows were not validated and {sheet_errors.dropped} more errors were not reported."))
+
+        return error_msg_list,warn_msg_list
 
+    def _validate_rows(self, sheet_name, ods_sheet_rows, error_msg_list=None, warn_msg_list=None) -> typing.Tuple[list, list]:
+        """
+        Validate the rows of ods_sheet_rows, (row_index, row_data) after the column titles of the
+        sheet, without looking at the titles. A chunk of a sheet split over the workers.
+        """
+        if error_msg_list is None:
+            error_msg_list = []
+        if warn_msg_list is None:
+            warn_msg_list = []
+        plan = self._get_sheet_plan(sheet_name)
+        data_rows = [(sheet_row_index - self.column_title_index - 1, sheet_row_data) for sheet_row_index, sheet_row_data in ods_sheet_rows if len(sheet_row_data) > 0]
+        if self._columnar_engine is not None:
+            for start in range(0, len(data_rows), BLOCK_ROWS):
+                self._columnar_engine.validate_rows(plan, data_rows[start:start+BLOCK_ROWS], self._validate_row, error_msg_list, warn_msg_list)
+        else:
+            for row_index, row_data in data_rows:
+                self._validate_row(plan, row_index, row_data, error_msg_list, warn_msg_list)
+        return error_msg_list, warn_msg_list
+
+    def _count_data_rows(self, ods_sheet_rows) -> int:
+        # The rows left in ods_sheet_rows that would have been validated (the empty ones never are)
+        return sum(1 for _, row_data in ods_sheet_rows if len(row_data) > 0)
+
+    def _validate_column_names(self, sheet_name, required_columns, column_names, error_msg_list):
+        # The titles found in the sheet, looked up instead of searching column_names for every required column
+        found_columns = header_index(column_names)
+        # Only built when a title is missing, see normalize_title
+        normalized_columns = None
         for required_col_index, required_col_data in required_columns.items():
             try:
                 required_col_name = required_col_data[RCKeys.COLUMN_NAME]
@@ -726,16 +903,16 @@ class ODS_Validator:
                 print(f"Unexpected error: (_validate_sheet_columns). {e}")
             try:
                 # Check that the column name exists
-                if required_col_name not in column_names:
+                if required_col_name not in found_columns:
                     safe_name = required_col_name.strip().replace('\n', ' ')
-                    error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"ERROR: Could not find the column ({safe_name}) in the sheet ({sheet_name}). The found columns are ({column_names})",
-                    }
-                    error_msg_list.append(error_dict)
+                    message = f"ERROR: Could not find the column ({safe_name}) in the sheet ({sheet_name}). The found columns are ({column_names})"
+                    if normalized_columns is None:
+                        normalized_columns = header_index(column_names, normalize_title)
+                    nearest_index = normalized_columns.get(normalize_title(required_col_name))
+                    if nearest_index is not None:
+                        message += f" The column at index ({nearest_index}) has the same title apart from the spaces and line breaks."
+                    error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', message)
+                    error_msg_list.append(error_finding)
                     # No further validation can be done since the column was not present
                     continue
             except Exception as e:
@@ -744,187 +921,72 @@ class ODS_Validator:
                 # Check that the column index is matched
                 if column_names[required_col_index] != required_col_name:
                     safe_name = required_col_name.strip().replace('\n', ' ')
-                    error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"ERROR: The column ({safe_name}) in the sheet ({sheet_name}) should be at index ({required_col_index}).",
-                    }
-                    error_msg_list.append(error_dict)
+                    error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"ERROR: The column ({safe_name}) in the sheet ({sheet_name}) should be at index ({required_col_index}).")
+                    error_msg_list.append(error_finding)
                     # No further validation can be done since the column was not present
                     continue
             except Exception as e:
                 print(f"Unexpected error: (_validate_sheet_columns), failed to validate the column index. {e}")
 
-        
-        # Validate the data in all further rows
-        for row_index, row_data in enumerate(ods_sheet_data[self.column_title_index+1:-1]):
-            if len(row_data) == 0:
-                continue
-            # Check to see if an extra column was added or one was removed
-            if len(required_columns) != len(row_data):
-                error_dict = {
-                        'sheet_name': sheet_name,
-                        'entry': 'N/A',
-                        'row': 'N/A',
-                        'column': 'N/A',
-                        'message': f"Row {row_index+self.column_title_index+2} has {len(row_data)} columns, but should only have {len(required_columns)}!"
-                    }
-                error_msg_list.append(error_dict)
-                continue
-            for column_index, column_data in enumerate(row_data):
-                # Check the data type of the entry in the column
+    def _get_sheet_plan(self, sheet_name) -> ODS_Sheet_Plan:
+        # The required columns are compiled once per sheet on first use
+        try:
+            return self._sheet_plans[sheet_name]
+        except KeyError:
+            plan = ODS_Sheet_Plan(sheet_name, self.required_columns[sheet_name])
+            self._sheet_plans[sheet_name] = plan
+            return plan
+
+    def _validate_row(self, plan: ODS_Sheet_Plan, row_index, row_data, error_msg_list, warn_msg_list):
+        # row_index counts from the first row after the column titles
+        if len(row_data) == 0:
+            return
+        sheet_name = plan.sheet_name
+        row_number = row_index+self.column_title_index+2
+        # Check to see if an extra column was added or one was removed
+        if plan.column_count != len(row_data):
+            error_finding = ODS_Finding(sheet_name, 'N/A', 'N/A', 'N/A', f"Row {row_number} has {len(row_data)} columns, but should only have {plan.column_count}!")
+            error_msg_list.append(error_finding)
+            return
+        # The findings of the last column that was checked
+        error_finding = None
+        warning_finding = None
+        # The switches of the row, resolved once for all the special validators that declared them
+        row_context = plan.row_context(row_data)
+        for column_index, (column_data, checker, result_checker, type_rule, column_text) in enumerate(zip(row_data, plan.checkers, plan.result_checkers, plan.type_rules, plan.column_labels)):
+            if result_checker is not None:
+                # Only the data type is checked, the message is formatted when the finding is written
                 try:
-                    if RCKeys.SPECIAL_VALIDATOR in required_columns[column_index]:
-                        err_str, warn_str = required_columns[column_index][RCKeys.SPECIAL_VALIDATOR](column_index, row_data, required_columns[column_index])
-                    else:
-                        data_type = required_columns[column_index][RCKeys.DATA_TYPE]
-                        warn_if_blank = required_columns[column_index][RCKeys.WARN_IF_BLANK]
-                        required = required_columns[column_index][RCKeys.REQUIRED]
-                        err_str, warn_str = self._check_data_type(column_data, data_type, warn_if_empty=warn_if_blank, required=required)
+                    result = result_checker(column_data)
                 except Exception as e:
-                    print(f"Unknown Error (Row {row_index+self.column_title_index+2} | Column {column_index}: Trying to parse {sheet_name}. {e}")
-                    print(str(traceback.format_exc()))
+                    error_finding = ODS_Finding(sheet_name, column_index+1, row_number, column_text, f"General error: Failed to check the data type. {e}")
+                    warning_finding = None
+                else:
+                    if not result:
+                        error_finding = warning_finding = None
+                    elif result in WARNING_RESULTS:
+                        error_finding = None
+                        warning_finding = ODS_Finding(sheet_name, column_index+1, row_number, column_text, column_data, result, type_rule[0])
+                    else:
+                        error_finding = ODS_Finding(sheet_name, column_index+1, row_number, column_text, column_data, result, type_rule[0])
+                        warning_finding = None
+            else:
                 try:
-                    result = math.floor(column_index / 26) - 1
-                    remainder = column_index % 26
-                    if len(err_str) > 0:                        
-                        column_text = f"{ODS_Column_Label_Lookup[result] if column_index > 25 else ''}{ODS_Column_Label_Lookup[remainder]}"
-                        error_dict = {'sheet_name': sheet_name, 'entry': column_index+1,'row': row_index+self.column_title_index+2, 'column': column_text, 'message': err_str}
-                        error_msg_list.append(error_dict)
-                    if len(warn_str) > 0:
-                        column_text = f"{ODS_Column_Label_Lookup[result] if column_index > 25 else ''}{ODS_Column_Label_Lookup[remainder]}"
-                        wanr_dict = {'sheet_name': sheet_name, 'entry': column_index+1,'row': row_index+self.column_title_index+2, 'column': column_text, 'message': warn_str}
-                        warn_msg_list.append(wanr_dict)
+                    err_str, warn_str = checker(column_index, column_data, row_data, row_context)
+                    error_finding = ODS_Finding.of_message(sheet_name, column_index+1, row_number, column_text, err_str) if err_str else None
+                    warning_finding = ODS_Finding.of_message(sheet_name, column_index+1, row_number, column_text, warn_str) if warn_str else None
                 except Exception as e:
-                    print(f"Unknown Error (Row {row_index+self.column_title_index+2} | Column {column_index}: Trying to parse {sheet_name}. The result was ({result}), the remainder was ({remainder}) {e}")
+                    print(f"Unknown Error (Row {row_number} | Column {column_index}: Trying to parse {sheet_name}. {e}")
                     print(str(traceback.format_exc()))
-        
-        return error_msg_list,warn_msg_list
-            
+                    # The messages of the column before are reported again for this one
+                    if error_finding is not None:
+                        error_finding = error_finding.moved_to(column_index+1, column_text)
+                    if warning_finding is not None:
+                        warning_finding = warning_finding.moved_to(column_index+1, column_text)
+            if error_finding is not None:
+                error_msg_list.append(error_finding)
+            if warning_finding is not None:
+                warn_msg_list.append(warning_finding)
 
     def _check_data_type(self, input_data, expected_type: ODS_Data_Types, warn_if_empty: bool, required: bool) -> typing.Tuple[str, str]:
-        err_string = ''
-        warning_str = ''
-        try:
-            if expected_type == ODS_Data_Types.DATE_TYPE:
-                # First check if it is empty
-                if len(str(input_data)) == 0:
-                    if warn_if_empty and not required:
-                        raise DataEmptyWarning()
-                    elif required:
-                        raise DataEmptyError()
-                elif type(input_data) != datetime and type(input_data) != datetime.date:
-                    alt_formats = [
-                        "%d/%m/%Y",
-                        "%d/%m/%y",
-                        r"%d\%m\%Y",
-                        r"%d\%m\%y",
-                        "%d-%m-%y",
-                        "%d-%m-%Y",
-                        "%m-%d-%y",
-                        "%m-%d-%Y",
-                        "%m/%d/%Y",
-                        "%m/%d/%y",
-                        r"%m\%d\%Y",
-                        r"%m\%d\%y",
-                    ]
-                    for alt_format in alt_formats:
-                        try:
-                            datetime.strptime(input_data, alt_format)
-                            raise WrongDateFormat
-                        except ValueError:
-                            pass
-                    # If we made it this far, we found no matches
-                    raise TypeError()
-
-            elif expected_type in ODS_Integer_Data_Types:
-                # First check if it is empty
-                if len(str(input_data)) == 0:
-                    if warn_if_empty and not required:
-                        raise DataEmptyWarning()
-                    elif required:
-                        raise DataEmptyError()
-                    else:
-                        # The cell is empty so no further validation needed
-                        return err_string, warning_str
-
-                # Special handling for the number data type which may be input as a string, so as long as it converts to an int, it is good
-                if expected_type == ODS_Data_Types.NUMBER_TYPE:
-                    try:
-                        _ = int(input_data)
-                    except (ValueError, TypeError) as e:
-                        raise TypeError from e
-                else:
-                    if type(input_data) != int:
-                        # Invalid parse
-                        raise TypeError()
-                    # Check the length of the total character
-                    if len(str(input_data)) > ODS_Integer_Data_Types[expected_type]:
-                        raise DataTooLong()
-
-            elif expected_type in ODS_Float_Data_Types:
-                # First check if it is empty
-                if len(str(input_data)) == 0:
-                    if warn_if_empty and not required:
-                        raise DataEmptyWarning()
-                    elif required:
-                        raise DataEmptyError()
-                    else:
-                        # The cell is empty so no further validation needed
-                        return err_string, warning_str
-                # Check that the number is a float
-                if type(input_data) != float:
-                    if type(input_data) == int:
-                        # This could happen if after the decimal was 0's so it wasnt propigated through.
-                        raise PossibleIssue()
-                    else:
-                        raise TypeError()
-                # Check that the total length is valid
-                if len(str(input_data)) > ODS_Float_Data_Types[expected_type]["total"]:
-                    raise DataTooLong()
-                # Split the number into before and after the decimal
-                before, after = str(input_data).split(".")
-                if len(before) > ODS_Float_Data_Types[expected_type]["before"]:
-                    raise BeforeDecimalTooLong
-                if len(after) > ODS_Float_Data_Types[expected_type]["after"]:
-                    raise AfterDecimalTooLong
-                    
-            elif expected_type in ODS_Char_Data_Types:
-                # First check if it is empty
-                if len(str(input_data)) == 0:
-                    if warn_if_empty and not required:
-                        raise DataEmptyWarning()
-                    elif required:
-                        raise DataEmptyError()
-                    else:
-                        # The cell is empty so no further validation needed
-                        return err_string, warning_str
-                # Check that the type is a string
-                if type(input_data) != str:
-                    raise TypeError()
-                if len(input_data) > ODS_Char_Data_Types[expected_type]:
-                    raise DataTooLong
-
-        except TypeError as _:
-            err_string = f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})!"
-        except DataTooLong as _:
-            err_string = f"The data ({input_data!r}) is too long. It has a length of ({len(str(input_data))}) for the type ({expected_type!r})!"
-        except BeforeDecimalTooLong as _:
-            err_string = f"The data ({input_data!r}) has too many digits before the decimal. It has a length of ({len(str(input_data).split('.')[0])}) for the type ({expected_type!r})!"
-        except AfterDecimalTooLong as _:
-            err_string = f"The data ({input_data}) has too many digits after the decimal. It has a length of ({len(str(input_data).split('.')[1])}) for the type ({expected_type!r})!"
-        except DataEmptyWarning as _:
-            warning_str = "The data was empty."
-        except DataEmptyError as _:
-            err_string = "The data was empty."
-        except PossibleIssue as _:
-            warning_str = f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})! Note, this might not be an issue if the digits after the decimnal are all 0's."
-        except WrongDateFormat as _:
-            err_string = f"The data ({input_data!r}) is a valid date, but needs to be entered in the format \"yyy-mm-dd\"."
-        except Exception as e:
-            err_string = f"General error: Failed to check the data type. {e}"
-        
-        return err_string, warning_str
-
+        return compile_type_checker(expected_type, warn_if_empty, required)(input_data)
@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of the result code type checks against the exception based
+_check_data_type they replaced. Both are run over the same cells and must return
+the same messages.
+
+    python benchmarks/bench_check_data_type.py -n 200000
+"""
+from datetime import datetime
+import datetime as datetime_module
+import optparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from ODS_COMMON.ods_constants import DataEmptyWarning, DataEmptyError, ODS_Char_Data_Types, ODS_Data_Types, AfterDecimalTooLong, BeforeDecimalTooLong, DataTooLong, ODS_Float_Data_Types, ODS_Integer_Data_Types, PossibleIssue, WrongDateFormat
+from ODS_COMMON.ods_plan import ALT_DATE_FORMATS, compile_type_checker
+
+
+def exception_check_data_type(input_data, expected_type, warn_if_empty, required):
+    # The exception based implementation, kept as the reference for this benchmark
+    err_string = ''
+    warning_str = ''
+    try:
+        if expected_type == ODS_Data_Types.DATE_TYPE:
+            if len(str(input_data)) == 0:
+                if warn_if_empty and not required:
+                    raise DataEmptyWarning()
+                elif required:
+                    raise DataEmptyError()
+            elif type(input_data) != datetime and type(input_data) != datetime.date:
+                for alt_format in ALT_DATE_FORMATS:
+                    try:
+                        datetime.strptime(input_data, alt_format)
+                        raise WrongDateFormat
+                    except ValueError:
+                        pass
+                raise TypeError()
+        elif expected_type in ODS_Integer_Data_Types:
+            if len(str(input_data)) == 0:
+                if warn_if_empty and not required:
+                    raise DataEmptyWarning()
+                elif required:
+                    raise DataEmptyError()
+                else:
+                    return err_string, warning_str
+            if expected_type == ODS_Data_Types.NUMBER_TYPE:
+                try:
+                    _ = int(input_data)
+                except (ValueError, TypeError) as e:
+                    raise TypeError from e
+            else:
+                if type(input_data) != int:
+                    raise TypeError()
+                if len(str(input_data)) > ODS_Integer_Data_Types[expected_type]:
+                    raise DataTooLong()
+        elif expected_type in ODS_Float_Data_Types:
+            if len(str(input_data)) == 0:
+                if warn_if_empty and not required:
+                    raise DataEmptyWarning()
+                elif required:
+                    raise DataEmptyError()
+                else:
+                    return err_string, warning_str
+            if type(input_data) != float:
+                if type(input_data) == int:
+                    raise PossibleIssue()
+                else:
+                    raise TypeError()
+            if len(str(input_data)) > ODS_Float_Data_Types[expected_type]["total"]:
+                raise DataTooLong()
+            before, after = str(input_data).split(".")
+            if len(before) > ODS_Float_Data_Types[expected_type]["before"]:
+                raise BeforeDecimalTooLong
+            if len(after) > ODS_Float_Data_Types[expected_type]["after"]:
+                raise AfterDecimalTooLong
+        elif expected_type in ODS_Char_Data_Types:
+            if len(str(input_data)) == 0:
+                if warn_if_empty and not required:
+                    raise DataEmptyWarning()
+                elif required:
+                    raise DataEmptyError()
+                else:
+                    return err_string, warning_str
+            if type(input_data) != str:
+                raise TypeError()
+            if len(input_data) > ODS_Char_Data_Types[expected_type]:
+                raise DataTooLong
+    except TypeError as _:
+        err_string = f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})!"
+    except DataTooLong as _:
+        err_string = f"The data ({input_data!r}) is too long. It has a length of ({len(str(input_data))}) for the type ({expected_type!r})!"
+    except BeforeDecimalTooLong as _:
+        err_string = f"The data ({input_data!r}) has too many digits before the decimal. It has a length of ({len(str(input_data).split('.')[0])}) for the type ({expected_type!r})!"
+    except AfterDecimalTooLong as _:
+        err_string = f"The data ({input_data}) has too many digits after the decimal. It has a length of ({len(str(input_data).split('.')[1])}) for the type ({expected_type!r})!"
+    except DataEmptyWarning as _:
+        warning_str = "The data was empty."
+    except DataEmptyError as _:
+        err_string = "The data was empty."
+    except PossibleIssue as _:
+        warning_str = f"The data ({input_data!r}) is of type ({type(input_data)}) but the expected type is ({expected_type!r})! Note, this might not be an issue if the digits after the decimnal are all 0's."
+    except WrongDateFormat as _:
+        err_string = f"The data ({input_data!r}) is a valid date, but needs to be entered in the format \"yyy-mm-dd\"."
+    except Exception as e:
+        err_string = f"General error: Failed to check the data type. {e}"
+    return err_string, warning_str
+
+
+# (value, type, warn_if_empty, required), weighted towards blanks like the real returns
+SAMPLE_CELLS = [
+    ('', ODS_Data_Types.CHAR35_TYPE, True, True),
+    ('', ODS_Data_Types.CHAR35_TYPE, False, False),
+    ('', ODS_Data_Types.NUM13V4_TYPE, True, False),
+    ('', ODS_Data_Types.NUM6_TYPE, True, True),
+    ('Smith', ODS_Data_Types.CHAR35_TYPE, True, True),
+    ('yes', ODS_Data_Types.CHAR3_TYPE, True, True),
+    (12, ODS_Data_Types.NUM6_TYPE, True, True),
+    (12.5, ODS_Data_Types.NUM11V2_TYPE, True, True),
+    (100, ODS_Data_Types.NUM11V2_TYPE, True, True),
+    (datetime_module.date(2015, 4, 6), ODS_Data_Types.DATE_TYPE, True, True),
+    ('06-04-2015', ODS_Data_Types.DATE_TYPE, True, True),
+]
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-n", "--cells", dest="cells", type="int", help="Number of cells to check", default=200000)
+    parser.add_option("-r", "--repeat", dest="repeat", type="int", help="Number of timing repeats", default=5)
+    options, args = parser.parse_args()
+
+    cells = [SAMPLE_CELLS[index % len(SAMPLE_CELLS)] for index in range(options.cells)]
+    compiled_cells = [(compile_type_checker(data_type, warn_if_empty, required), value) for value, data_type, warn_if_empty, required in cells]
+
+    for value, data_type, warn_if_empty, required in SAMPLE_CELLS:
+        assert exception_check_data_type(value, data_type, warn_if_empty, required) == compile_type_checker(data_type, warn_if_empty, required)(value)
+
+    def run_exceptions():
+        for value, data_type, warn_if_empty, required in cells:
+            exception_check_data_type(value, data_type, warn_if_empty, required)
+
+    def run_result_codes():
+        for checker, value in compiled_cells:
+            checker(value)
+
+    exceptions = min(timeit.repeat(run_exceptions, number=1, repeat=options.repeat))
+    result_codes = min(timeit.repeat(run_result_codes, number=1, repeat=options.repeat))
+    print(f"exceptions    {exceptions * 1e9 / options.cells:8.1f} ns/cell")
+    print(f"result_codes  {result_codes * 1e9 / options.cells:8.1f} ns/cell")
+    print(f"speedup       {exceptions / result_codes:8.2f}x")
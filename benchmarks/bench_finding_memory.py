@@ -0,0 +1,93 @@
+"""
+Memory of the findings held by a validation: ODS_Finding against the dicts with the formatted
+message it replaced. Builds -n findings like _validate_row does (type check failures of fresh
+cell values, plus findings with a fixed text) and reports the bytes per finding and the MB per
+100k findings, measured with tracemalloc. Both must give the same CSV rows.
+
+    python benchmarks/bench_finding_memory.py -n 100000
+"""
+import csv
+import io
+import optparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from ODS_COMMON.ods_constants import ODS_Check_Result, ODS_Data_Types
+from ODS_COMMON.ods_finding import LOG_FIELDNAMES, ODS_Finding
+from ODS_COMMON.ods_plan import WARNING_RESULTS, column_label, format_check_result
+
+SHEET_NAME = "Other_Acquisition_V3"
+COLUMN_LABELS = [column_label(column_index) for column_index in range(40)]
+
+
+def cell(index: int):
+    # (value, result, data_type) of a failed check, the values are new objects like the ones of the reader
+    kind = index % 5
+    if kind == 0:
+        return f"{index % 28 + 1}/12/2020", ODS_Check_Result.WRONG_DATE_FORMAT, ODS_Data_Types.DATE_TYPE
+    elif kind == 1:
+        return '', ODS_Check_Result.DATA_EMPTY_ERROR, ODS_Data_Types.CHAR35_TYPE
+    elif kind == 2:
+        return 1000 + index, ODS_Check_Result.POSSIBLE_ISSUE, ODS_Data_Types.NUM11V2_TYPE
+    elif kind == 3:
+        return f"Name {index}", ODS_Check_Result.DATA_TOO_LONG, ODS_Data_Types.CHAR3_TYPE
+    return None, None, None
+
+def text_message(index: int) -> str:
+    # The findings of the special validators carry their text
+    return f"The PAYE entry does not start with three digits. Read value ({index:06d}x)!"
+
+def build_dicts(count: int) -> list:
+    findings = []
+    for index in range(count):
+        column_index = index % 40
+        value, result, data_type = cell(index)
+        if result is None:
+            message = text_message(index)
+        else:
+            err_str, warn_str = format_check_result(result, value, data_type)
+            message = warn_str if result in WARNING_RESULTS else err_str
+        findings.append({'sheet_name': SHEET_NAME, 'entry': column_index+1, 'row': index // 5 + 10, 'column': COLUMN_LABELS[column_index], 'message': message})
+    return findings
+
+def build_findings(count: int) -> list:
+    findings = []
+    for index in range(count):
+        column_index = index % 40
+        value, result, data_type = cell(index)
+        if result is None:
+            findings.append(ODS_Finding(SHEET_NAME, column_index+1, index // 5 + 10, COLUMN_LABELS[column_index], text_message(index)))
+        else:
+            findings.append(ODS_Finding(SHEET_NAME, column_index+1, index // 5 + 10, COLUMN_LABELS[column_index], value, result, data_type))
+    return findings
+
+def measure(build, count: int) -> tuple:
+    tracemalloc.start()
+    findings = build(count)
+    used_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return findings, used_bytes
+
+def csv_text(findings: list) -> str:
+    output = io.StringIO()
+    csv_file = csv.DictWriter(output, fieldnames=LOG_FIELDNAMES)
+    csv_file.writerows(findings)
+    return output.getvalue()
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-n", "--findings", dest="findings", type="int", help="Number of findings to build", default=100000)
+    options, args = parser.parse_args()
+
+    dict_findings, dict_bytes = measure(build_dicts, options.findings)
+    slot_findings, slot_bytes = measure(build_findings, options.findings)
+    if csv_text(dict_findings) != csv_text(slot_findings):
+        raise AssertionError("The findings do not give the same rows!")
+
+    for label, used_bytes in (("dict + message", dict_bytes), ("ODS_Finding", slot_bytes)):
+        print(f"{label:16} {used_bytes / options.findings:8.1f} bytes/finding  {used_bytes / options.findings * 100000 / 1024 / 1024:8.2f} MB per 100k findings")
+    print(f"ODS_Finding uses {slot_bytes / dict_bytes:.0%} of the memory of the dicts")
@@ -0,0 +1,76 @@
+"""
+Compares the per-cell dict dispatch that _validate_sheet_columns used to do with the
+compiled ODS_Sheet_Plan row loop.
+
+    python benchmarks/bench_sheet_plan.py -n 2000 -s Other_Options_V3
+"""
+import datetime
+import optparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from ODS_COMMON.ods_constants import ODS_Data_Types, ODS_Char_Data_Types, ODS_Float_Data_Types, ODS_Integer_Data_Types
+from ODS_COMMON.ods_constants import ODS_Reequired_Columns_Keys as RCKeys
+from ODS_COMMON.ods_validator import ODS_Validator
+
+
+def sample_value(col_validator_data, row_index):
+    data_type = col_validator_data[RCKeys.DATA_TYPE]
+    if row_index % 5 == 0:
+        return ''
+    if data_type in ODS_Integer_Data_Types:
+        return row_index % 9 + 1
+    if data_type in ODS_Float_Data_Types:
+        return 12.5 if row_index % 2 else 100
+    if data_type in ODS_Char_Data_Types:
+        return "yes" if data_type == ODS_Data_Types.CHAR3_TYPE else "Smith"
+    return datetime.date(2015, 4, 6)
+
+
+def sample_rows(validator, sheet_name, row_count):
+    required_columns = validator.required_columns[sheet_name]
+    return [[sample_value(required_columns[column_index], row_index) for column_index in range(len(required_columns))] for row_index in range(row_count)]
+
+
+def dict_dispatch(validator, required_columns, rows):
+    # The per-cell lookups done before the plan was compiled
+    for row_data in rows:
+        for column_index, column_data in enumerate(row_data):
+            if RCKeys.SPECIAL_VALIDATOR in required_columns[column_index]:
+                required_columns[column_index][RCKeys.SPECIAL_VALIDATOR](column_index, row_data, required_columns[column_index])
+            else:
+                data_type = required_columns[column_index][RCKeys.DATA_TYPE]
+                warn_if_blank = required_columns[column_index][RCKeys.WARN_IF_BLANK]
+                required = required_columns[column_index][RCKeys.REQUIRED]
+                validator._check_data_type(column_data, data_type, warn_if_empty=warn_if_blank, required=required)
+
+
+def plan_dispatch(validator, plan, rows):
+    for row_data in rows:
+        for column_index, (column_data, checker) in enumerate(zip(row_data, plan.checkers)):
+            checker(column_index, column_data, row_data)
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-n", "--rows", dest="rows", type="int", help="Number of rows to validate", default=2000)
+    parser.add_option("-s", "--sheet", dest="sheet", type="string", help="Sheet to take the column rules from", default="Other_Options_V3")
+    parser.add_option("-r", "--repeat", dest="repeat", type="int", help="Number of timing repeats", default=5)
+    options, args = parser.parse_args()
+
+    validator = ODS_Validator()
+    rows = sample_rows(validator, options.sheet, options.rows)
+    required_columns = validator.required_columns[options.sheet]
+    plan = validator._get_sheet_plan(options.sheet)
+    cell_count = options.rows * len(required_columns)
+
+    results = {
+        "dict_dispatch": min(timeit.repeat(lambda: dict_dispatch(validator, required_columns, rows), number=1, repeat=options.repeat)),
+        "plan_dispatch": min(timeit.repeat(lambda: plan_dispatch(validator, plan, rows), number=1, repeat=options.repeat)),
+    }
+    for name, seconds in results.items():
+        print(f"{name:15} {seconds * 1e9 / cell_count:8.1f} ns/cell ({cell_count} cells)")
+    print(f"speedup         {results['dict_dispatch'] / results['plan_dispatch']:8.2f}x")
@@ -0,0 +1,64 @@
+"""
+Startup time of ods_validator_main.py. Runs the CLI with --help (and on a missing file) in fresh
+interpreters under python -X importtime, and reports the wall time and the modules that take the
+longest to import.
+
+    python benchmarks/bench_startup.py -r 10 -t 15
+    python benchmarks/bench_startup.py -i returns.ods
+"""
+import optparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "ods_validator_main.py")
+
+
+def parse_importtime(stderr: str) -> tuple:
+    # "import time: self [us] | cumulative | imported package", nested imports are indented by two spaces.
+    # Returns the cumulative time per module and the total of the modules imported at the top level
+    import_times = {}
+    top_level_total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        module_name = name.strip()
+        import_times[module_name] = max(import_times.get(module_name, 0), int(cumulative))
+        if len(name) - len(name.lstrip()) == 1:
+            top_level_total += int(cumulative)
+    return import_times, top_level_total
+
+
+def run_cli(cli_args: list) -> tuple:
+    start_time = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", MAIN_SCRIPT] + cli_args, cwd=REPO_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return (time.perf_counter() - start_time,) + parse_importtime(result.stderr)
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-r", "--repeat", dest="repeat", type="int", help="Number of runs of every command", default=10)
+    parser.add_option("-t", "--top", dest="top", type="int", help="Number of the slowest imports to list", default=15)
+    parser.add_option("-i", "--in", dest="input", type="string", help="Also time validating this *.ods file", default="")
+    options, args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    commands = [("--help", ["--help"]), ("missing file", ["-i", os.path.join(output_dir, "missing.ods"), "-o", output_dir])]
+    if options.input:
+        commands.append((f"validate {os.path.basename(options.input)}", ["-i", os.path.realpath(options.input), "-o", output_dir]))
+
+    for label, cli_args in commands:
+        runs = [run_cli(cli_args) for _ in range(options.repeat)]
+        wall_times = [wall_time for wall_time, _, _ in runs]
+        _, import_times, top_level_total = runs[-1]
+        print(f"{label}")
+        print(f"    wall    median {statistics.median(wall_times)*1000:8.1f} ms   min {min(wall_times)*1000:8.1f} ms")
+        print(f"    imports {top_level_total/1000:8.1f} ms in total")
+        for name, cumulative in sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:options.top]:
+            print(f"        {cumulative/1000:8.1f} ms  {name}")
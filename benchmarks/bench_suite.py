@@ -0,0 +1,241 @@
+"""
+Benchmark suite of the validation phases on a synthetic workbook (see generate_workbook.py), or
+on the file given with -i. Times each phase on its own:
+
+    read                 streaming the rows of all sheets with iter_ods_rows
+    check_data_type      ODS_Validator._check_data_type on the cells of the type-only columns
+    column_result_codes  the vectorised checks of the columnar engine on the same cells, column by column
+    special_validators   the special validators of the sheet plans on their cells
+    validate_file        the whole validation with ODS_Validator.validate_file
+    validate_columnar    the same with the columnar engine (-e columnar)
+    log_csv, log_jsonl   writing the findings of validate_file with the log sinks
+
+The columnar phases are left out if numpy is not installed. Writes the results, with the git
+revision and the parameters, as JSON to -o. Given the results of another version with -b, the
+phases are compared with them and the exit code is 1 if one of them got slower by more than
+--tolerance percent.
+
+    python benchmarks/bench_suite.py -r 2000 -e 0.05 -o bench_results.json
+    python benchmarks/bench_suite.py -r 2000 -e 0.05 -b bench_results.json
+"""
+import datetime
+import json
+import optparse
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from generate_workbook import write_workbook
+from ODS_COMMON.ods_constants import ODS_Engine
+from ODS_COMMON.ods_file import ODS_File
+from ODS_COMMON.ods_reader import iter_ods_rows
+from ODS_COMMON.ods_sinks import ODS_CSV_Sink, ODS_JSONL_Sink
+from ODS_COMMON.ods_validator import ODS_Validator
+
+# Bump when the phases or the layout of the results change, results of another version are not compared
+SUITE_VERSION = 1
+
+
+def git_revision() -> dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"revision": None, "dirty": None}
+    return {"revision": revision, "dirty": len(status) > 0}
+
+def sheet_data_rows(validator: ODS_Validator, rows: list) -> dict:
+    """
+    The data rows of every required sheet that _validate_row would check: after the column titles
+    and with the number of columns of the sheet.
+    """
+    data_rows = {}
+    for sheet_name, row_index, row_data in rows:
+        if sheet_name in validator.required_columns and row_index > validator.column_title_index:
+            if len(row_data) == validator._get_sheet_plan(sheet_name).column_count:
+                data_rows.setdefault(sheet_name, []).append(row_data)
+    return data_rows
+
+def time_phase(function, repeat: int, items: int) -> dict:
+    run_times = timeit.repeat(function, number=1, repeat=repeat)
+    best = min(run_times)
+    return {
+        "best_s": best,
+        "median_s": statistics.median(run_times),
+        "runs_s": run_times,
+        "items": items,
+        "best_us_per_item": best * 1e6 / items if items else None,
+    }
+
+def run_suite(file_name: str, repeat: int, output_dir: str) -> tuple:
+    """
+    Time the phases on file_name, returns the phases and what the file held.
+    """
+    validator = ODS_Validator()
+    phases = {}
+
+    rows = list(iter_ods_rows(file_name))
+    phases["read"] = time_phase(lambda: sum(1 for _ in iter_ods_rows(file_name)), repeat, len(rows))
+
+    type_cells = []
+    special_cells = []
+    # (sheet_name, column_index) -> the type rule and the cells of the column
+    type_columns = {}
+    for sheet_name, data_rows in sheet_data_rows(validator, rows).items():
+        plan = validator._get_sheet_plan(sheet_name)
+        for row_data in data_rows:
+            for column_index, (column_data, type_rule) in enumerate(zip(row_data, plan.type_rules)):
+                if type_rule is None:
+                    special_cells.append((plan.checkers[column_index], column_index, column_data, row_data))
+                else:
+                    type_cells.append((column_data,) + type_rule)
+                    type_columns.setdefault((sheet_name, column_index), (type_rule, []))[1].append(column_data)
+
+    def check_data_type():
+        check = validator._check_data_type
+        for column_data, data_type, warn_if_blank, required in type_cells:
+            check(column_data, data_type, warn_if_blank, required)
+    phases["check_data_type"] = time_phase(check_data_type, repeat, len(type_cells))
+
+    try:
+        from ODS_COMMON.ods_columnar import column_result_codes
+        import numpy
+    except ImportError:
+        print("WARNING: numpy is not installed, the columnar phases are left out.")
+        column_result_codes = None
+    if column_result_codes is not None:
+        column_arrays = []
+        for type_rule, column_values in type_columns.values():
+            values = numpy.empty(len(column_values), dtype=object)
+            values[:] = column_values
+            column_arrays.append((values,) + type_rule)
+        def result_codes():
+            for values, data_type, warn_if_blank, required in column_arrays:
+                column_result_codes(values, data_type, warn_if_blank, required)
+        phases["column_result_codes"] = time_phase(result_codes, repeat, len(type_cells))
+
+    def special_validators():
+        for checker, column_index, column_data, row_data in special_cells:
+            checker(column_index, column_data, row_data)
+    phases["special_validators"] = time_phase(special_validators, repeat, len(special_cells))
+
+    ods_file = None
+    def validate_file():
+        nonlocal ods_file
+        ods_file = ODS_File(file_name)
+        validator.validate_file(ods_file)
+    phases["validate_file"] = time_phase(validate_file, repeat, len(rows))
+    findings = ods_file.error_strings + ods_file.warning_strings
+
+    if column_result_codes is not None:
+        columnar_validator = ODS_Validator(ODS_Engine.COLUMNAR)
+        phases["validate_columnar"] = time_phase(lambda: columnar_validator.validate_file(ODS_File(file_name)), repeat, len(rows))
+
+    for phase_name, sink_class, extension in (("log_csv", ODS_CSV_Sink, "csv"), ("log_jsonl", ODS_JSONL_Sink, "jsonl")):
+        log_file = os.path.join(output_dir, f"findings.{extension}")
+        def write_log():
+            with sink_class(log_file) as sink:
+                sink.extend(findings)
+        phases[phase_name] = time_phase(write_log, repeat, len(findings))
+
+    workbook = {
+        "rows": len(rows),
+        "type_cells": len(type_cells),
+        "special_cells": len(special_cells),
+        "errors": len(ods_file.error_strings),
+        "warnings": len(ods_file.warning_strings),
+    }
+    return phases, workbook
+
+def compare_results(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Print the change of every phase against baseline and return the names of the phases that
+    got slower by more than tolerance percent.
+    """
+    if baseline.get("suite_version") != results["suite_version"]:
+        raise ValueError(f"ERROR: The baseline was written by version {baseline.get('suite_version')} of the suite, expected {results['suite_version']}!")
+    if baseline.get("workbook") != results["workbook"]:
+        print("WARNING: The baseline was run on a different workbook, the times are not comparable.")
+    regressions = []
+    baseline_revision = (baseline["git"]["revision"] or "unknown")[:10]
+    print(f"{'phase':20} {baseline_revision:>12} {'current':>12} {'change':>8}")
+    for phase_name, phase in results["phases"].items():
+        baseline_phase = baseline["phases"].get(phase_name)
+        if baseline_phase is None:
+            print(f"{phase_name:20} {'-':>12} {phase['best_s']*1000:9.1f} ms")
+            continue
+        change = (phase["best_s"] / baseline_phase["best_s"] - 1) * 100
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(phase_name)
+        print(f"{phase_name:20} {baseline_phase['best_s']*1000:9.1f} ms {phase['best_s']*1000:9.1f} ms {change:+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-i", "--in", dest="input", type="string", help="*.ods file to run the suite on, else a synthetic workbook is generated", default="")
+    parser.add_option("-r", "--rows", dest="rows", type="int", help="Number of data rows per sheet of the synthetic workbook", default=2000)
+    parser.add_option("-e", "--error-density", dest="error_density", type="float", help="Share of the cells with a wrong value (0 to 1)", default=0.05)
+    parser.add_option("-s", "--seed", dest="seed", type="int", help="Seed of the synthetic workbook", default=1)
+    parser.add_option("-n", "--repeat", dest="repeat", type="int", help="Number of timing repeats of every phase", default=5)
+    parser.add_option("-o", "--out", dest="output", type="string", help="JSON file to write the results to", default="")
+    parser.add_option("-b", "--baseline", dest="baseline", type="string", help="JSON results of another version to compare with", default="")
+    parser.add_option("-t", "--tolerance", dest="tolerance", type="float", help="Slowdown in percent reported as a regression", default=10.0)
+    options, args = parser.parse_args()
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    output_dir = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        parameters = {"repeat": options.repeat}
+        if options.input:
+            file_name = os.path.realpath(options.input)
+            parameters["input"] = os.path.basename(file_name)
+        else:
+            file_name = os.path.join(output_dir, "synthetic_returns.ods")
+            try:
+                write_workbook(file_name, options.rows, options.error_density, options.seed)
+            except ValueError as e:
+                parser.error(str(e))
+            parameters.update({"rows": options.rows, "error_density": options.error_density, "seed": options.seed})
+        phases, workbook = run_suite(file_name, options.repeat, output_dir)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    results = {
+        "suite_version": SUITE_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec='seconds'),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "workbook": workbook,
+        "phases": phases,
+    }
+    for phase_name, phase in phases.items():
+        per_item = f"{phase['best_us_per_item']:8.2f} us/item" if phase["best_us_per_item"] is not None else ""
+        print(f"{phase_name:20} best {phase['best_s']*1000:9.1f} ms   median {phase['median_s']*1000:9.1f} ms   {per_item} ({phase['items']} items)")
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Wrote the results to {options.output}")
+    if baseline is not None:
+        try:
+            regressions = compare_results(results, baseline, options.tolerance)
+        except ValueError as e:
+            parser.error(str(e))
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,179 @@
+"""
+Writes a synthetic *.ods return with the sheets and columns of a schema (by default the one of
+ODS_Validator), for benchmarks and load tests. Every sheet gets the title rows, the column titles
+in the row of column_title_index and the given number of data rows. The cells are valid values of
+their column, the ones the special validators want blank for the answers of the row are left
+blank. A share of the cells (the error density) is then replaced with a wrong value: an empty
+cell, a value that is too long, of the wrong type or a date in the wrong format.
+The same seed gives the same file.
+
+    python benchmarks/generate_workbook.py -o returns.ods -r 5000 -e 0.05 -s 1
+"""
+import datetime
+import optparse
+import os
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from ODS_COMMON.ods_constants import ODS_Char_Data_Types, ODS_Data_Types, ODS_Float_Data_Types, ODS_Integer_Data_Types
+from ODS_COMMON.ods_schema import DEFAULT_SCHEMA_FILE, load_schema
+from ODS_COMMON.ods_validator import ODS_Validator
+
+MIMETYPE = "application/vnd.oasis.opendocument.spreadsheet"
+MANIFEST = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+            f'<manifest:file-entry manifest:full-path="/" manifest:media-type="{MIMETYPE}"/>'
+            '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+            '</manifest:manifest>')
+CONTENT_START = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+                 'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+                 'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+                 '<office:body><office:spreadsheet>')
+CONTENT_END = '</office:spreadsheet></office:body></office:document-content>'
+# The templates are saved with the formatted but empty rows up to the end of the sheet
+TRAILING_EMPTY_ROWS = 1048000
+
+# The data rows are written in blocks of this many rows
+WRITE_BLOCK_ROWS = 1000
+
+_NAMES = ("Smith", "Jones", "Williams", "Taylor", "Brown", "Davies", "Evans", "Wilson")
+_FIRST_DATE = datetime.datetime(2015, 4, 6)
+
+
+def ods_cell(value) -> str:
+    if value is None or value == '':
+        return '<table:table-cell/>'
+    if type(value) == int or type(value) == float:
+        return f'<table:table-cell office:value-type="float" office:value="{value!r}"><text:p>{value!r}</text:p></table:table-cell>'
+    if type(value) == datetime.datetime:
+        return f'<table:table-cell office:value-type="date" office:date-value="{value.isoformat()}"><text:p>{value:%Y-%m-%d}</text:p></table:table-cell>'
+    paragraphs = ''.join(f'<text:p>{escape(line)}</text:p>' for line in str(value).split('\n'))
+    return f'<table:table-cell office:value-type="string">{paragraphs}</table:table-cell>'
+
+def ods_row(values) -> str:
+    return '<table:table-row>' + ''.join(ods_cell(value) for value in values) + '</table:table-row>'
+
+def valid_value(column: tuple, rng: random.Random):
+    # column is (title, required, data_type, warn_if_blank, validator_name) of ODS_Compiled_Schema
+    _, _, data_type, _, validator_name = column
+    if validator_name == "validate_NINO":
+        return f"AB{rng.randrange(100000, 1000000)}C"
+    if validator_name == "validate_paye_ref":
+        return f"{rng.randrange(100, 1000)}/AB{rng.randrange(100, 1000)}"
+    if validator_name == "validate_some_or_all":
+        return rng.choice(("All", "Some"))
+    if data_type == ODS_Data_Types.DATE_TYPE:
+        return _FIRST_DATE + datetime.timedelta(days=rng.randrange(365))
+    if data_type == ODS_Data_Types.NUMBER_TYPE:
+        return rng.randrange(1, 4)
+    if data_type in ODS_Integer_Data_Types:
+        return rng.randrange(1, 10 ** min(ODS_Integer_Data_Types[data_type], 4))
+    if data_type in ODS_Float_Data_Types:
+        return rng.randrange(1, 10000) + rng.choice((0.25, 0.5, 0.75))
+    if data_type == ODS_Data_Types.CHAR3_TYPE:
+        # The CHAR3 columns are the yes/no answers
+        return rng.choice(("yes", "no"))
+    if data_type in ODS_Char_Data_Types:
+        return rng.choice(_NAMES)[:ODS_Char_Data_Types[data_type]]
+    return ''
+
+def invalid_value(column: tuple, rng: random.Random):
+    # Strings stay strings, the special validators expect them to be
+    _, _, data_type, _, validator_name = column
+    if rng.random() < 0.25 and data_type != ODS_Data_Types.NUMBER_TYPE:
+        return ''
+    if validator_name == "validate_NINO":
+        return rng.choice(("AB 123456C", "AB1234567890C"))
+    if validator_name == "validate_paye_ref":
+        return rng.choice(("AB/123", "1234AB"))
+    if data_type == ODS_Data_Types.DATE_TYPE:
+        return rng.choice(("31/12/2015", "2015.04.06", "not a date"))
+    if data_type == ODS_Data_Types.NUMBER_TYPE:
+        # Not empty, int() of it would fail in the special validators
+        return rng.randrange(4, 100)
+    if data_type in ODS_Integer_Data_Types:
+        return rng.choice((10 ** ODS_Integer_Data_Types[data_type], 12.5))
+    if data_type in ODS_Float_Data_Types:
+        return rng.choice((rng.randrange(1, 10000), 1.23456789, 10.0 ** ODS_Float_Data_Types[data_type]["before"] + 0.5))
+    if data_type == ODS_Data_Types.CHAR3_TYPE:
+        return rng.choice(("maybe", "y"))
+    if data_type in ODS_Char_Data_Types:
+        return "x" * (ODS_Char_Data_Types[data_type] + 1)
+    return ''
+
+def valid_row(plan, columns: tuple, rng: random.Random) -> list:
+    row_data = [valid_value(column, rng) for column in columns]
+    # Left to right, as the conditions look back at the answers before the column. The checkers
+    # get a copy, the answers they see of a row are cached for the same row list
+    for column_index, type_rule in enumerate(plan.type_rules):
+        if type_rule is not None or row_data[column_index] == '':
+            continue
+        if any(plan.checkers[column_index](column_index, row_data[column_index], list(row_data))):
+            value = row_data[column_index]
+            row_data[column_index] = ''
+            if any(plan.checkers[column_index](column_index, '', list(row_data))):
+                row_data[column_index] = value
+    return row_data
+
+def write_workbook(file_name: str, rows: int = 1000, error_density: float = 0.05, seed: int = 1, schema_file: str = DEFAULT_SCHEMA_FILE) -> dict:
+    """
+    Write the workbook and return what it holds: the sheets, the data rows and cells per sheet and
+    the number of cells with a wrong value.
+    """
+    if not 0 <= error_density <= 1:
+        raise ValueError(f"ERROR: The error density must be between 0 and 1, but is {error_density}!")
+    schema = load_schema(schema_file)
+    validator = ODS_Validator(schema_file=schema_file)
+    rng = random.Random(seed)
+    summary = {"sheets": [], "rows": 0, "cells": 0, "invalid_cells": 0}
+    with zipfile.ZipFile(file_name, 'w', zipfile.ZIP_DEFLATED) as ods_zip:
+        # The mimetype is the first entry and is not compressed
+        ods_zip.writestr("mimetype", MIMETYPE, compress_type=zipfile.ZIP_STORED)
+        ods_zip.writestr("META-INF/manifest.xml", MANIFEST)
+        with ods_zip.open("content.xml", 'w') as content:
+            content.write(CONTENT_START.encode('utf-8'))
+            for sheet_name, columns in schema.sheets:
+                summary["sheets"].append(sheet_name)
+                sheet_xml = [f'<table:table table:name={quoteattr(sheet_name)}>', ods_row([schema.template])]
+                if schema.column_title_index > 1:
+                    sheet_xml.append(f'<table:table-row table:number-rows-repeated="{schema.column_title_index-1}"><table:table-cell/></table:table-row>')
+                sheet_xml.append(ods_row([title for title, _, _, _, _ in columns]))
+                plan = validator._get_sheet_plan(sheet_name)
+                for row_index in range(rows):
+                    row_data = valid_row(plan, columns, rng)
+                    for column_index, column in enumerate(columns):
+                        if rng.random() < error_density:
+                            row_data[column_index] = invalid_value(column, rng)
+                            summary["invalid_cells"] += 1
+                    sheet_xml.append(ods_row(row_data))
+                    if len(sheet_xml) >= WRITE_BLOCK_ROWS:
+                        content.write(''.join(sheet_xml).encode('utf-8'))
+                        sheet_xml = []
+                sheet_xml.append(f'<table:table-row table:number-rows-repeated="{TRAILING_EMPTY_ROWS}"><table:table-cell table:number-columns-repeated="1024"/></table:table-row>')
+                sheet_xml.append('</table:table>')
+                content.write(''.join(sheet_xml).encode('utf-8'))
+                summary["rows"] += rows
+                summary["cells"] += rows * len(columns)
+            content.write(CONTENT_END.encode('utf-8'))
+    return summary
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-o", "--out", dest="output", type="string", help="*.ods file to write", default="synthetic_returns.ods")
+    parser.add_option("-r", "--rows", dest="rows", type="int", help="Number of data rows per sheet", default=1000)
+    parser.add_option("-e", "--error-density", dest="error_density", type="float", help="Share of the cells with a wrong value (0 to 1)", default=0.05)
+    parser.add_option("-s", "--seed", dest="seed", type="int", help="Seed of the random values", default=1)
+    parser.add_option("--schema", dest="schema_file", type="string", help="Schema of the sheets and columns", default=DEFAULT_SCHEMA_FILE)
+    options, args = parser.parse_args()
+
+    try:
+        summary = write_workbook(options.output, options.rows, options.error_density, options.seed, options.schema_file)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote {options.output}: {len(summary['sheets'])} sheets, {summary['rows']} rows, {summary['cells']} cells, {summary['invalid_cells']} with a wrong value")
@@ -0,0 +1,98 @@
+"""
+Local load test of ods_validator_service.py. Uploads the file -c clients at a time, -n times
+in total, and reports the p50/p99 latency from the upload until the errors were downloaded.
+Uploads refused with 503 are retried after Retry-After and counted separately.
+
+    python ods_validator_service.py -p 8080 -j 4 &
+    python benchmarks/load_test_service.py -i returns.ods -n 200 -c 16
+"""
+import json
+import optparse
+import os
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))]
+
+
+def validate_once(base_url, file_name, data, result_format):
+    rejected = 0
+    while True:
+        request = urllib.request.Request(f"{base_url}/jobs?name={urllib.parse.quote(file_name)}", data=data, method='POST',
+                                         headers={'Content-Type': 'application/vnd.oasis.opendocument.spreadsheet'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                job = json.loads(response.read())
+            break
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                raise
+            rejected += 1
+            time.sleep(float(e.headers.get('Retry-After', 1)))
+    with urllib.request.urlopen(f"{base_url}/jobs/{job['job_id']}/errors?wait=1&format={result_format}") as response:
+        response.read()
+    return rejected
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("-i", "--in", dest="input", type="string", help="The *.ods file to upload.")
+    parser.add_option("-u", "--url", dest="url", type="string", help="Base url of the service.", default="http://127.0.0.1:8080")
+    parser.add_option("-n", "--requests", dest="requests", type="int", help="Number of uploads in total.", default=100)
+    parser.add_option("-c", "--clients", dest="clients", type="int", help="Number of uploads at the same time.", default=8)
+    parser.add_option("-f", "--format", dest="format", type="choice", choices=["json", "csv"], help="Format of the downloaded errors.", default="json")
+    options, args = parser.parse_args()
+    if not options.input or not os.path.exists(options.input):
+        parser.error("--in must be an existing *.ods file")
+
+    with open(options.input, 'rb') as f:
+        data = f.read()
+    file_name = os.path.basename(options.input)
+    latencies = []
+    failures = []
+    rejected = [0]
+    remaining = [options.requests]
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            start_time = time.perf_counter()
+            try:
+                request_rejected = validate_once(options.url.rstrip('/'), file_name, data, options.format)
+            except Exception as e:
+                with lock:
+                    failures.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start_time)
+                rejected[0] += request_rejected
+
+    start_time = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(options.clients)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    total_seconds = time.perf_counter() - start_time
+
+    print(f"requests:   {len(latencies)} ok, {len(failures)} failed, {rejected[0]} rejected with 503 and retried")
+    if latencies:
+        print(f"latency:    p50 {percentile(latencies, 50)*1000:.1f} ms, p99 {percentile(latencies, 99)*1000:.1f} ms, mean {statistics.mean(latencies)*1000:.1f} ms")
+        print(f"throughput: {len(latencies) / total_seconds:.2f} files/s over {total_seconds:.2f}s")
+    for failure in sorted(set(failures)):
+        print(f"failure:    {failure}")
+
+
+if __name__ == '__main__':
+    main()
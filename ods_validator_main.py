@@ -1,49 +1,197 @@
 import optparse
 import os
+import sys
+import glob
+import time
 from ODS_COMMON.ods_file import ODS_File
-from ODS_COMMON.ods_validator import ODS_Validator
+from ODS_COMMON.ods_validator import ODS_Validation_Limits, ODS_Validator
+from ODS_COMMON.ods_parallel import create_validator_pool, validate_file_in_worker
+from ODS_COMMON.ods_constants import ODS_Engine
+from ODS_COMMON.ods_cache import ODS_Result_Cache
+from ODS_COMMON.ods_profile import ODS_Profiler
+from ODS_COMMON.ods_schema import DEFAULT_SCHEMA_FILE
+from ODS_COMMON.ods_sinks import AGGREGATED_LOG_FIELDNAMES, ODS_Aggregating_Sink, ODS_CSV_Sink, ODS_JSONL_Sink
 import csv
 
+SUMMARY_FIELDNAMES = ['file', 'status', 'errors', 'warnings', 'seconds']
+
+LOG_SINKS = {'csv': ODS_CSV_Sink, 'jsonl': ODS_JSONL_Sink}
+
+def create_output_dir(output_dir):
+    if output_dir is None or output_dir == "":
+        output_dir = os.path.dirname(os.path.realpath(__file__))
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+    return output_dir
+
+def open_log_sinks(input_file, output_dir, log_format='csv', aggregate=False, profiler=None):
+    """
+    The sinks of the error and the warning log of input_file, written while the file is validated.
+    With aggregate the repeated findings are grouped (see ODS_Aggregating_Sink) and the logs are
+    written when the sinks are closed. With a profiler the time of writing the logs is recorded.
+    """
+    output_dir = create_output_dir(output_dir)
+    sink_class = LOG_SINKS[log_format]
+    sink_options = {'fieldnames': AGGREGATED_LOG_FIELDNAMES} if aggregate and sink_class == ODS_CSV_Sink else {}
+    error_sink = sink_class(os.path.join(output_dir, f"{os.path.basename(input_file)}_error_log.{log_format}"), **sink_options)
+    warning_sink = sink_class(os.path.join(output_dir, f"{os.path.basename(input_file)}_warning_log.{log_format}"), **sink_options)
+    if aggregate:
+        error_sink, warning_sink = ODS_Aggregating_Sink(error_sink), ODS_Aggregating_Sink(warning_sink)
+    if profiler is not None:
+        error_sink, warning_sink = profiler.timed_sink(error_sink), profiler.timed_sink(warning_sink)
+    return error_sink, warning_sink
+
+def write_profile_report(input_file, output_dir, profiler):
+    # Next to the logs, with the cProfile stats in a *.prof file of the same name
+    report_path = os.path.join(create_output_dir(output_dir), f"{os.path.basename(input_file)}_profile.json")
+    profiler.write_report(report_path)
+    print(f"Wrote the profile to {report_path}")
+
+def write_log_files(input_file, output_dir, error_strings, warning_strings, log_format='csv', aggregate=False):
+    error_sink, warning_sink = open_log_sinks(input_file, output_dir, log_format, aggregate)
+    with error_sink, warning_sink:
+        error_sink.extend(error_strings)
+        warning_sink.extend(warning_strings)
+
+def find_batch_files(input_path, read_stdin):
+    """
+    The *.ods files of a directory, the matches of a glob pattern and/or the paths listed on stdin.
+    """
+    batch_files = []
+    if input_path:
+        if os.path.isdir(input_path):
+            batch_files += sorted(os.path.join(input_path, name) for name in os.listdir(input_path) if name.lower().endswith(".ods"))
+        else:
+            batch_files += sorted(glob.glob(input_path))
+    if read_stdin:
+        batch_files += [line.strip() for line in sys.stdin if len(line.strip()) > 0]
+    return batch_files
+
+def validate_batch(batch_files, output_dir, jobs, engine=ODS_Engine.SCALAR, cache=None, schema_file=DEFAULT_SCHEMA_FILE, log_format='csv', limits=None, aggregate=False,
+                   profile_options=None):
+    """
+    Validate all files in this process (or on a pool of jobs processes), write the logs of every file
+    and a batch_summary.csv with one row per file. profile_options are the arguments of ODS_Profiler,
+    given to profile every file validated in this process.
+    """
+    summary_rows = []
+    start_time = time.perf_counter()
+
+    def add_summary(input_file, error_count, warning_count, seconds):
+        summary_rows.append({'file': input_file, 'status': 'validated', 'errors': error_count, 'warnings': warning_count, 'seconds': f"{seconds:.3f}"})
+
+    def add_failure(input_file, e):
+        print(f"Unknown Error: Failed to validate the file {input_file}. Exception: {e}")
+        summary_rows.append({'file': input_file, 'status': f"failed: {e}", 'errors': 'N/A', 'warnings': 'N/A', 'seconds': 'N/A'})
+
+    if jobs is not None and jobs > 1:
+        if profile_options is not None:
+            print("WARNING: The files are validated in worker processes, which are not profiled.")
+        with create_validator_pool(jobs, ODS_Validator, engine, schema_file) as executor:
+            futures = [(input_file, executor.submit(validate_file_in_worker, input_file, cache, limits)) for input_file in batch_files]
+            for input_file, future in futures:
+                try:
+                    error_strings, warning_strings, seconds = future.result()
+                    write_log_files(input_file, output_dir, error_strings, warning_strings, log_format, aggregate)
+                    add_summary(input_file, len(error_strings), len(warning_strings), seconds)
+                except Exception as e:
+                    add_failure(input_file, e)
+    else:
+        validator = ODS_Validator(engine, schema_file)
+        for input_file in batch_files:
+            try:
+                file_start_time = time.perf_counter()
+                file = ODS_File(input_file)
+                profiler = ODS_Profiler(*profile_options) if profile_options is not None else None
+                error_sink, warning_sink = open_log_sinks(input_file, output_dir, log_format, aggregate, profiler)
+                with error_sink, warning_sink:
+                    validator.validate_file(file, cache=cache, error_sink=error_sink, warning_sink=warning_sink, limits=limits, profiler=profiler)
+                if profiler is not None:
+                    write_profile_report(input_file, output_dir, profiler)
+                add_summary(input_file, error_sink.count, warning_sink.count, time.perf_counter() - file_start_time)
+            except Exception as e:
+                add_failure(input_file, e)
+
+    total_seconds = time.perf_counter() - start_time
+
+    output_dir = create_output_dir(output_dir)
+    with open(os.path.join(output_dir, "batch_summary.csv"), 'w', encoding='utf-8', newline='') as f:
+        summary_csv_file = csv.DictWriter(f, fieldnames=SUMMARY_FIELDNAMES)
+        summary_csv_file.writeheader()
+        summary_csv_file.writerows(summary_rows)
+
+    files_per_second = len(batch_files) / total_seconds if total_seconds > 0 else 0.0
+    print(f"Validated {len(batch_files)} files in {total_seconds:.2f}s ({files_per_second:.2f} files/s)")
+
 if __name__ == '__main__':
     parser = optparse.OptionParser()
-    parser.add_option("-i", "--in", dest="input", type="string", help="The path to the file you would like to validate",
+    parser.add_option("-i", "--in", dest="input", type="string", help="The path to the file you would like to validate. In batch mode a directory or a glob pattern (e.g. \"returns/*.ods\").",
                       default="")
     parser.add_option("-o", "--out", dest="out", type="string", help="Directory to output the file to. This is just a path, the filename will be created automatically.",
                       default="")
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", help="Number of processes used to validate the sheets in parallel. In batch mode the files are spread over this many processes.",
+                      default=1)
+    parser.add_option("--chunk-rows", dest="chunk_rows", type="int", help="With --jobs, large sheets are split over the processes in chunks of this many rows. The chunks are sent while the file is read. By default they grow from 500 to 5000 rows, 0 sends whole sheets.",
+                      default=None)
+    parser.add_option("-b", "--batch", dest="batch", action="store_true", help="Validate every file matched by --in, writing the logs of each file and a batch_summary.csv.",
+                      default=False)
+    parser.add_option("--stdin", dest="stdin", action="store_true", help="Batch mode, also read the paths of the files to validate from stdin (one per line).",
+                      default=False)
+    parser.add_option("-e", "--engine", dest="engine", type="choice", choices=[engine.value for engine in ODS_Engine], help="How the cells are validated: \"scalar\" (row by row) or \"columnar\" (column wise with numpy, for very large sheets).",
+                      default=ODS_Engine.SCALAR.value)
+    parser.add_option("-s", "--schema", dest="schema", type="string", help="The schema file with the sheets and columns of the template (see ODS_COMMON/schemas).",
+                      default=DEFAULT_SCHEMA_FILE)
+    parser.add_option("-l", "--log-format", dest="log_format", type="choice", choices=list(LOG_SINKS), help="Format of the error and warning logs: \"csv\" or \"jsonl\" (one JSON object per line). The logs are written while the file is validated.",
+                      default="csv")
+    parser.add_option("-a", "--aggregate", dest="aggregate", action="store_true", help="Write one log row per sheet, column and message, with the number of findings and their rows (e.g. \"10-25, 31\").",
+                      default=False)
+    parser.add_option("-c", "--cache", dest="cache", type="string", help="Directory of the result cache. Files that were validated before with the same rules are not validated again.",
+                      default="")
+    parser.add_option("--cache-size", dest="cache_size", type="int", help="Size of the result cache in MB, the least recently used results are removed above it.",
+                      default=256)
+    parser.add_option("--max-sheet-errors", dest="max_sheet_errors", type="int", help="Stop validating a sheet after this many errors.",
+                      default=None)
+    parser.add_option("--max-file-errors", dest="max_file_errors", type="int", help="Stop validating a file after this many errors.",
+                      default=None)
+    parser.add_option("--fail-fast-header", dest="fail_fast_header", action="store_true", help="Do not validate the rows of a sheet whose column titles do not match the template.",
+                      default=False)
+    parser.add_option("--profile", dest="profile", action="store_true", help="Write the time taken per phase, sheet and validator to a *_profile.json next to the logs.",
+                      default=False)
+    parser.add_option("--profile-cprofile", dest="profile_cprofile", action="store_true", help="Profile with cProfile as well (implies --profile), the stats are also written to a *_profile.prof file.",
+                      default=False)
+    parser.add_option("--profile-memory", dest="profile_memory", action="store_true", help="Trace the memory with tracemalloc as well (implies --profile), slows the validation down a lot.",
+                      default=False)
     options, args = parser.parse_args()
 
     input_file = options.input.strip()
     output_dir = options.out.strip()
+    cache = ODS_Result_Cache(options.cache.strip(), options.cache_size * 1024 * 1024) if options.cache.strip() else None
+    try:
+        limits = ODS_Validation_Limits(options.max_sheet_errors, options.max_file_errors, options.fail_fast_header)
+    except ValueError as e:
+        parser.error(str(e))
+    profile_options = None
+    if options.profile or options.profile_cprofile or options.profile_memory:
+        profile_options = (options.profile_cprofile, options.profile_memory)
 
-    if os.path.exists(input_file):
+    if options.batch or options.stdin:
+        batch_files = find_batch_files(input_file, options.stdin)
+        if len(batch_files) == 0:
+            print("No files were found to validate!")
+        else:
+            validate_batch(batch_files, output_dir, options.jobs, ODS_Engine(options.engine), cache, options.schema, options.log_format, limits, options.aggregate, profile_options)
+    elif os.path.exists(input_file):
         file = ODS_File(input_file)
-        validator = ODS_Validator()
-        try:
-            validator.validate_file(file)
-        except Exception as e:
-            print(f"Unknown Error: Failed to validate the file {file}. Exception: {e}")
-
-        if output_dir is None or output_dir == "":
-            output_dir = os.path.dirname(os.path.realpath(__file__))
-
-        # Write the log files
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
-        error_log_path = os.path.join(output_dir, f"{os.path.basename(input_file)}_error_log.csv")
-        with open(error_log_path, 'w', encoding='utf-8',newline='') as f:
-            fieldnames = ['sheet_name', 'entry', 'row', 'column', 'message']
-            error_csv_file = csv.DictWriter(f, fieldnames=fieldnames)
-            error_csv_file.writeheader()
-            error_csv_file.writerows(file.error_strings)
-        # Warnings
-        warning_log_path = os.path.join(output_dir, f"{os.path.basename(input_file)}_warning_log.csv")
-        with open(warning_log_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['sheet_name', 'entry', 'row', 'column', 'message']
-            warn_csv_file = csv.DictWriter(f, fieldnames=fieldnames)
-            warn_csv_file.writeheader()
-            warn_csv_file.writerows(file.warning_strings)
+        validator = ODS_Validator(ODS_Engine(options.engine), options.schema)
+        profiler = ODS_Profiler(*profile_options) if profile_options is not None else None
+        error_sink, warning_sink = open_log_sinks(input_file, output_dir, options.log_format, options.aggregate, profiler)
+        with error_sink, warning_sink:
+            try:
+                validator.validate_file(file, workers=options.jobs, cache=cache, error_sink=error_sink, warning_sink=warning_sink, limits=limits, profiler=profiler,
+                                        chunk_rows=options.chunk_rows)
+            except Exception as e:
+                print(f"Unknown Error: Failed to validate the file {file}. Exception: {e}")
+        if profiler is not None:
+            write_profile_report(input_file, output_dir, profiler)
     else:
         print(f"The file {input_file} does not exist!")
-
-    
-        
@@ -0,0 +1,255 @@
+import contextlib
+import csv
+import io
+import json
+import optparse
+import os
+import time
+import typing
+import uuid
+from concurrent.futures import Future
+from urllib.parse import parse_qs
+from ODS_COMMON.ods_constants import ODS_Engine
+from ODS_COMMON.ods_parallel import create_validator_pool, validate_file_in_worker
+from ODS_COMMON.ods_schema import DEFAULT_SCHEMA_FILE
+from ODS_COMMON.ods_sinks import AGGREGATED_LOG_FIELDNAMES, LOG_FIELDNAMES, aggregate_findings
+from ODS_COMMON.ods_validator import ODS_Validator
+
+# Number of records sent per chunk when streaming the results
+STREAM_CHUNK_SIZE = 500
+# Seconds between the checks of a job that a request with wait=1 is held for
+WAIT_POLL_SECONDS = 0.05
+
+
+class ODS_Job():
+    def __init__(self, job_id: str, file_name: str, file_path: typing.Optional[str], future: Future):
+        self.job_id = job_id
+        self.file_name = file_name
+        self.file_path = file_path
+        self.future = future
+        self.created = time.time()
+        # 'errors' or 'warnings' -> the records of aggregate_findings, see ODS_Validation_Service._job_results
+        self.aggregated = {}
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def to_dict(self) -> dict:
+        job_dict = {'job_id': self.job_id, 'file_name': self.file_name, 'status': self.status}
+        if job_dict['status'] == "done":
+            error_strings, warning_strings, seconds = self.future.result()
+            job_dict.update({'errors': len(error_strings), 'warnings': len(warning_strings), 'seconds': round(seconds, 3)})
+        elif job_dict['status'] == "failed":
+            job_dict['message'] = str(self.future.exception())
+        return job_dict
+
+
+class ODS_Validation_Service():
+    """
+    WSGI application validating uploaded *.ods files as jobs on a pool of worker processes,
+    each of which keeps a warm ODS_Validator. The request handlers never wait on the validation,
+    results are polled (or streamed once done) by job id.
+
+        POST /jobs?name=<file.ods>          body is the file, returns 202 and the job id
+        GET  /jobs/<id>                     status of the job
+        GET  /jobs/<id>/errors?format=json  errors as a JSON array (or format=csv)
+        GET  /jobs/<id>/warnings            warnings, same formats
+        GET  /health
+    Add wait=1 to the results to hold the request until the job finished, at most max_wait_seconds
+    (then the status is returned with 202 as without wait), and aggregate=1 to get one
+    record per sheet, column and message with the count and the rows of the findings.
+    The uploads are sent to the workers as they were received, or written to files in upload_dir if
+    that is given (e.g. to keep large uploads out of memory).
+    """
+    def __init__(self, workers: int = 2, max_pending_jobs: int = 8, max_concurrent_uploads: int = 4, max_upload_bytes: int = 50 * 1024 * 1024,
+                 max_finished_jobs: int = 100, engine: ODS_Engine = ODS_Engine.SCALAR, schema_file: str = DEFAULT_SCHEMA_FILE, sleep=time.sleep,
+                 upload_dir: str = None, max_wait_seconds: float = 60, run_blocking=None):
+        self.max_pending_jobs = max_pending_jobs
+        self.max_concurrent_uploads = max_concurrent_uploads
+        self.max_upload_bytes = max_upload_bytes
+        self.max_finished_jobs = max_finished_jobs
+        # Waiting on a job must not block the server, e.g. eventlet.sleep under eventlet
+        self.sleep = sleep
+        # Runs run_blocking(function, *args) for the CPU bound work of a request (aggregating the
+        # findings) off the server, e.g. eventlet.tpool.execute under eventlet. Called in place if None
+        self.run_blocking = run_blocking
+        self.upload_dir = upload_dir
+        self.max_wait_seconds = max_wait_seconds
+        self.jobs = {}
+        self.active_uploads = 0
+        self.executor = create_validator_pool(workers, ODS_Validator, engine, schema_file, warm_up=True)
+        # Start the workers now, each builds the rules and the sheet plans of its validator when it
+        # starts, so the first upload does not pay for them
+        for start_worker in [self.executor.submit(int) for _ in range(workers)]:
+            start_worker.result()
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def pending_jobs(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.future.done())
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '/').rstrip('/')
+        method = environ.get('REQUEST_METHOD', 'GET')
+        query = {key: values[-1] for key, values in parse_qs(environ.get('QUERY_STRING', '')).items()}
+        parts = [part for part in path.split('/') if part]
+        try:
+            if parts == ['health'] and method == 'GET':
+                return self._json(start_response, '200 OK', {'status': 'ok', 'pending_jobs': self.pending_jobs, 'active_uploads': self.active_uploads})
+            if parts == ['jobs'] and method == 'POST':
+                return self._submit_job(environ, start_response, query)
+            if len(parts) >= 2 and parts[0] == 'jobs' and method == 'GET':
+                job = self.jobs.get(parts[1])
+                if job is None:
+                    return self._json(start_response, '404 Not Found', {'message': f"The job {parts[1]} does not exist!"})
+                if len(parts) == 2:
+                    return self._json(start_response, '200 OK', job.to_dict())
+                if len(parts) == 3 and parts[2] in ('errors', 'warnings'):
+                    return self._job_results(start_response, job, parts[2], query)
+            return self._json(start_response, '404 Not Found', {'message': f"Unknown request {method} {path}"})
+        except Exception as e:
+            print(f"Unknown Error: (ODS_Validation_Service) {e}")
+            return self._json(start_response, '500 Internal Server Error', {'message': str(e)})
+
+    def _json(self, start_response, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(data)))] + (headers or []))
+        return [data]
+
+    def _submit_job(self, environ, start_response, query):
+        try:
+            content_length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length <= 0:
+            return self._json(start_response, '411 Length Required', {'message': "The body must contain the *.ods file and have a Content-Length!"})
+        if content_length > self.max_upload_bytes:
+            return self._json(start_response, '413 Payload Too Large', {'message': f"The file is larger than {self.max_upload_bytes} bytes!"})
+        # Backpressure, refuse work instead of queueing without a bound
+        if self.pending_jobs >= self.max_pending_jobs or self.active_uploads >= self.max_concurrent_uploads:
+            return self._json(start_response, '503 Service Unavailable', {'message': "Too many files are being validated, try again later."}, [('Retry-After', '1')])
+
+        file_name = os.path.basename(query.get('name', 'upload.ods'))
+        if os.path.splitext(file_name)[1].lower() != ".ods":
+            return self._json(start_response, '400 Bad Request', {'message': f"Wrong file type ({file_name}), needs to be *.ods"})
+
+        job_id = uuid.uuid4().hex
+        file_path = os.path.join(self.upload_dir, f"{job_id}.ods") if self.upload_dir is not None else None
+        self.active_uploads += 1
+        try:
+            body = environ['wsgi.input']
+            remaining = content_length
+            content = bytearray()
+            with open(file_path, 'wb') if file_path is not None else contextlib.nullcontext() as f:
+                while remaining > 0:
+                    chunk = body.read(min(remaining, 64 * 1024))
+                    if not chunk:
+                        break
+                    if f is not None:
+                        f.write(chunk)
+                    else:
+                        content += chunk
+                    remaining -= len(chunk)
+        finally:
+            self.active_uploads -= 1
+        if remaining > 0:
+            if file_path is not None:
+                os.remove(file_path)
+            return self._json(start_response, '400 Bad Request', {'message': "The upload ended before Content-Length bytes were received!"})
+
+        if file_path is not None:
+            future = self.executor.submit(validate_file_in_worker, file_path)
+            future.add_done_callback(lambda _: os.remove(file_path) if os.path.exists(file_path) else None)
+        else:
+            # Read in place by the worker, see ODS_Archive, without a temporary file
+            future = self.executor.submit(validate_file_in_worker, file_name, content=content)
+        job = ODS_Job(job_id, file_name, file_path, future)
+        self.jobs[job_id] = job
+        self._evict_finished_jobs()
+        return self._json(start_response, '202 Accepted', job.to_dict(), [('Location', f"/jobs/{job_id}")])
+
+    def _evict_finished_jobs(self):
+        finished_jobs = [job for job in self.jobs.values() if job.future.done()]
+        for job in sorted(finished_jobs, key=lambda job: job.created)[:max(0, len(finished_jobs) - self.max_finished_jobs)]:
+            del self.jobs[job.job_id]
+
+    def _job_results(self, start_response, job, kind, query):
+        if query.get('wait') in ('1', 'true', 'yes'):
+            # Bounded, so a client can not hold a request (a green thread under eventlet) forever
+            deadline = time.monotonic() + self.max_wait_seconds
+            while not job.future.done() and time.monotonic() < deadline:
+                self.sleep(WAIT_POLL_SECONDS)
+        if not job.future.done():
+            return self._json(start_response, '202 Accepted', job.to_dict(), [('Retry-After', '1')])
+        if job.future.exception() is not None:
+            return self._json(start_response, '500 Internal Server Error', job.to_dict())
+
+        error_strings, warning_strings, _ = job.future.result()
+        records = error_strings if kind == 'errors' else warning_strings
+        fieldnames = LOG_FIELDNAMES
+        if query.get('aggregate') in ('1', 'true', 'yes'):
+            # Aggregated once per job and kind
+            if kind not in job.aggregated:
+                job.aggregated[kind] = aggregate_findings(records) if self.run_blocking is None else self.run_blocking(aggregate_findings, records)
+            records = job.aggregated[kind]
+            fieldnames = AGGREGATED_LOG_FIELDNAMES
+        if query.get('format', 'json') == 'csv':
+            start_response('200 OK', [('Content-Type', 'text/csv; charset=utf-8')])
+            return self._stream_csv(records, fieldnames)
+        start_response('200 OK', [('Content-Type', 'application/json')])
+        return self._stream_json(records)
+
+    def _stream_csv(self, records, fieldnames=LOG_FIELDNAMES):
+        buffer = io.StringIO()
+        csv_file = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator='\r\n')
+        csv_file.writeheader()
+        for start in range(0, max(len(records), 1), STREAM_CHUNK_SIZE):
+            csv_file.writerows(records[start:start+STREAM_CHUNK_SIZE])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            self.sleep(0)
+
+    def _stream_json(self, records):
+        yield b"["
+        for start in range(0, len(records), STREAM_CHUNK_SIZE):
+            chunk = ",".join(json.dumps(dict(record)) for record in records[start:start+STREAM_CHUNK_SIZE])
+            yield ((',' if start > 0 else '') + chunk).encode('utf-8')
+            self.sleep(0)
+        yield b"]"
+
+
+if __name__ == '__main__':
+    parser = optparse.OptionParser()
+    parser.add_option("-p", "--port", dest="port", type="int", help="Port to listen on, defaults to $PORT or 8080.",
+                      default=int(os.environ.get("PORT", 8080)))
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", help="Number of worker processes validating the files.",
+                      default=2)
+    parser.add_option("--max-pending", dest="max_pending", type="int", help="Number of queued or running jobs after which uploads are refused with 503.",
+                      default=8)
+    parser.add_option("--max-uploads", dest="max_uploads", type="int", help="Number of uploads that may be received at the same time.",
+                      default=4)
+    parser.add_option("--max-wait", dest="max_wait", type="float", help="Seconds a request for the results with wait=1 is held at most.",
+                      default=60)
+    parser.add_option("-e", "--engine", dest="engine", type="choice", choices=[engine.value for engine in ODS_Engine], help="How the cells are validated: \"scalar\" or \"columnar\".",
+                      default=ODS_Engine.SCALAR.value)
+    parser.add_option("-s", "--schema", dest="schema", type="string", help="The schema file with the sheets and columns of the template.",
+                      default=DEFAULT_SCHEMA_FILE)
+    options, args = parser.parse_args()
+
+    import eventlet
+    import eventlet.tpool
+    import eventlet.wsgi
+
+    service = ODS_Validation_Service(workers=options.jobs, max_pending_jobs=options.max_pending, max_concurrent_uploads=options.max_uploads,
+                                     engine=ODS_Engine(options.engine), schema_file=options.schema, sleep=eventlet.sleep,
+                                     max_wait_seconds=options.max_wait, run_blocking=eventlet.tpool.execute)
+    try:
+        eventlet.wsgi.server(eventlet.listen(('0.0.0.0', options.port)), service)
+    finally:
+        service.close()
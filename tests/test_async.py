@@ -0,0 +1,49 @@
+"""
+Cancelling or timing out ODS_Validator.validate_file_async must stop the validation, also while
+it waits for the worker processes.
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "benchmarks"))
+
+from generate_workbook import write_workbook
+from ODS_COMMON.ods_file import ODS_File
+from ODS_COMMON.ods_validator import ODS_Validator
+
+SHEET_SECONDS = 2.0
+TIMEOUT = 1.0
+
+
+class Slow_Validator(ODS_Validator):
+    # Takes SHEET_SECONDS for every sheet, in the worker processes as well
+    def _validate_sheet_columns(self, sheet_name, sheet_rows, *args, **kwargs):
+        time.sleep(SHEET_SECONDS)
+        return super()._validate_sheet_columns(sheet_name, sheet_rows, *args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory) -> str:
+    file_name = str(tmp_path_factory.mktemp("workbook") / "generated_returns.ods")
+    write_workbook(file_name, 20)
+    return file_name
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_timeout(workbook, workers):
+    async def validate():
+        async for _ in Slow_Validator().validate_file_async(ODS_File(workbook), workers=workers, timeout=TIMEOUT):
+            pass
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(validate())
+    # Not the SHEET_SECONDS of every sheet, only the sheet that was being validated in this process
+    assert time.monotonic() - start < TIMEOUT + SHEET_SECONDS
@@ -0,0 +1,115 @@
+"""
+Every engine and way of running ODS_Validator must give the findings of the row by row (scalar)
+validation, on a small workbook from benchmarks/generate_workbook.py.
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "benchmarks"))
+
+from generate_workbook import write_workbook
+from ODS_COMMON.ods_async import ERROR
+from ODS_COMMON.ods_cache import ODS_Result_Cache
+from ODS_COMMON.ods_constants import ODS_Engine
+from ODS_COMMON.ods_file import ODS_File
+from ODS_COMMON import ods_validator
+from ODS_COMMON.ods_validator import ODS_Validator
+
+WORKBOOK_ROWS = 300
+# Small enough that the sheets are sent in several chunks
+CHUNK_ROWS = 40
+
+
+class Counting_Validator(ODS_Validator):
+    # Counts the sheets validated in this process
+    validated_sheets = []
+
+    def _validate_sheet_columns(self, sheet_name, sheet_rows, *args, **kwargs):
+        self.validated_sheets.append(sheet_name)
+        return super()._validate_sheet_columns(sheet_name, sheet_rows, *args, **kwargs)
+
+
+class Sheet_Cache(ODS_Result_Cache):
+    # Never finds the whole file, so the sheets are looked up one by one
+    def key(self, source, fingerprint: str) -> str:
+        return os.urandom(16).hex()
+
+
+def findings_of(file_name: str, engine: ODS_Engine = ODS_Engine.SCALAR, **kwargs) -> tuple:
+    ods_file = ODS_File(file_name)
+    ODS_Validator(engine).validate_file(ods_file, **kwargs)
+    return [dict(finding) for finding in ods_file.error_strings], [dict(finding) for finding in ods_file.warning_strings]
+
+def async_findings_of(file_name: str, **kwargs) -> tuple:
+    async def validate():
+        errors, warnings = [], []
+        async for severity, finding in ODS_Validator().validate_file_async(ODS_File(file_name), **kwargs):
+            (errors if severity == ERROR else warnings).append(dict(finding))
+        return errors, warnings
+    return asyncio.run(validate())
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory) -> str:
+    file_name = str(tmp_path_factory.mktemp("workbook") / "generated_returns.ods")
+    write_workbook(file_name, WORKBOOK_ROWS, error_density=0.1)
+    return file_name
+
+@pytest.fixture(scope="module")
+def scalar_findings(workbook) -> tuple:
+    errors, warnings = findings_of(workbook)
+    # Else the comparisons below prove nothing
+    assert errors and warnings
+    return errors, warnings
+
+
+def test_columnar(workbook, scalar_findings):
+    assert findings_of(workbook, ODS_Engine.COLUMNAR) == scalar_findings
+
+@pytest.mark.parametrize("engine", list(ODS_Engine))
+def test_chunked_workers(workbook, scalar_findings, engine):
+    assert findings_of(workbook, engine, workers=2, chunk_rows=CHUNK_ROWS) == scalar_findings
+
+def test_whole_sheets_workers(workbook, scalar_findings):
+    assert findings_of(workbook, workers=2, chunk_rows=0) == scalar_findings
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cache(workbook, scalar_findings, tmp_path, workers):
+    cache = ODS_Result_Cache(str(tmp_path))
+    # Stored by the first run, read by the second
+    assert findings_of(workbook, workers=workers, cache=cache) == scalar_findings
+    assert findings_of(workbook, workers=workers, cache=cache) == scalar_findings
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_cache_of_long_sheets(workbook, scalar_findings, tmp_path, monkeypatch, workers):
+    # The sheets are longer than the rows held in memory, so they are spooled before the lookup
+    monkeypatch.setattr(ods_validator, "SHEET_HOLD_ROWS", WORKBOOK_ROWS // 4)
+    submitted_sheets, sent_sheet = [], ods_validator.submit_sheet
+    def submit_sheet(executor, sheet_name, *args, **kwargs):
+        submitted_sheets.append(sheet_name)
+        return sent_sheet(executor, sheet_name, *args, **kwargs)
+    monkeypatch.setattr(ods_validator, "submit_sheet", submit_sheet)
+    monkeypatch.setattr(Counting_Validator, "validated_sheets", [])
+    cache = Sheet_Cache(str(tmp_path))
+
+    def findings():
+        ods_file = ODS_File(workbook)
+        Counting_Validator().validate_file(ods_file, workers=workers, cache=cache)
+        return [dict(finding) for finding in ods_file.error_strings], [dict(finding) for finding in ods_file.warning_strings]
+
+    assert findings() == scalar_findings
+    assert Counting_Validator.validated_sheets or submitted_sheets
+    Counting_Validator.validated_sheets.clear()
+    submitted_sheets.clear()
+    assert findings() == scalar_findings
+    assert not Counting_Validator.validated_sheets and not submitted_sheets
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_async(workbook, scalar_findings, workers):
+    assert async_findings_of(workbook, workers=workers, chunk_rows=CHUNK_ROWS) == scalar_findings